@@ -127,6 +127,84 @@ def dl(branch, tag, path):
             )
 
 
+@main.command()
+@click.option("--config", help="Path to reporting configuration file.")
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of threads used to compute independent tasks.",
+)
+@click.argument("key")
+@click.pass_obj
+def report(context, config, workers, key):
+    """Run reporting for KEY."""
+    # Import here to avoid importing reporting dependencies when running other commands.
+    # Unlike the ixmp command that this replaces, use message_ix.Reporter
+    from message_ix.report import Reporter
+
+    if not context:
+        raise click.UsageError(
+            "give either --url, --platform or --dbprops before command report"
+        )
+
+    # Instantiate the Reporter with the Scenario loaded by main()
+    r = Reporter.from_scenario(context["scen"])
+
+    # Read the configuration file, if any
+    r.configure(config)
+
+    # Print the target
+    print(r.get(key, workers=workers).to_series().sort_index())
+
+
+@main.command("report-iamc")
+@click.option("--config", help="Path to reporting configuration file.")
+@click.option(
+    "--key", default="message::default", show_default=True, help="Key to report."
+)
+@click.option(
+    "--chunk-regions",
+    type=int,
+    help="Convert and write results for this many regions at a time.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of threads used to compute independent tasks.",
+)
+@click.option("--append", is_flag=True, help="Append to an existing .csv file.")
+@click.argument("path", type=click.Path(dir_okay=False))
+@click.pass_obj
+def report_iamc(context, config, key, chunk_regions, workers, append, path):
+    """Write reporting results in IAMC format to PATH.
+
+    PATH must end with .csv, .parquet, or .xlsx. The results are computed and written
+    piece by piece, so that all the data are never held in memory at once.
+    """
+    from message_ix.report import IAMCWriter, Reporter
+
+    if not context:
+        raise click.UsageError(
+            "give either --url, --platform or --dbprops before command report-iamc"
+        )
+
+    try:
+        writer = IAMCWriter(path, append=append)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="PATH")
+
+    r = Reporter.from_scenario(context["scen"])
+    r.configure(config)
+
+    with writer:
+        rows = r.write_iamc(writer, key, chunk_regions=chunk_regions, workers=workers)
+    print(f"Wrote {rows} rows to {path}")
+
+
 # Add subcommands
 main.add_command(message_ix.tools.add_year.cli.main)
 main.add_command(message_ix.tools.lp_diag.cli.main)
@@ -19,6 +19,8 @@ if TYPE_CHECKING:
     from genno import Key
     from ixmp.types import InitializeItemsKwargs
 
+    from message_ix.util.validate import Severity
+
 
 log = logging.getLogger(__name__)
 
@@ -173,6 +175,8 @@ class GAMSModel(ixmp.model.gams.GAMSModel):
             "use_temp_dir": False,
             # Record versions of message_ix and ixmp in GDX I/O files
             "record_version_packages": ("message_ix", "ixmp"),
+            # Do not validate scenario data before writing GDX
+            "validate": False,
         },
         ixmp.model.gams.GAMSModel.defaults,
     )
@@ -184,6 +188,8 @@ class GAMSModel(ixmp.model.gams.GAMSModel):
     # Make default model options known to the class
     model_dir: Path
 
+    validate: "bool | Severity"
+
     #: Optional minimum version of GAMS.
     GAMS_min_version: str | None = None
 
@@ -218,6 +224,29 @@ class GAMSModel(ixmp.model.gams.GAMSModel):
 
         self.solve_args.extend(solve_args)
 
+    def check(self, scenario: "ixmp.Scenario") -> None:
+        """Validate the data in `scenario`, if the "validate" option is set.
+
+        Issues with severity "warning" are logged. If there are any issues with
+        severity "error", :class:`ValueError` is raised *before* any GDX file is
+        written.
+
+        See also
+        --------
+        .util.validate.validate
+        """
+        from message_ix.util.validate import validate
+
+        level: "Severity" = (
+            "error" if isinstance(self.validate, bool) else self.validate
+        )
+        report = validate(scenario, level)
+        for issue in filter(lambda i: i.severity == "warning", report.issues):
+            log.warning(str(issue))
+
+        if not report.ok:
+            raise ValueError(f"{scenario.url} failed validation: {report}")
+
     def run(self, scenario: "ixmp.Scenario") -> None:
         """Execute the model.
 
@@ -231,6 +260,9 @@ class GAMSModel(ixmp.model.gams.GAMSModel):
         # Ensure the data in `scenario` is consistent with the MESSAGE formulation
         self.enforce(scenario)
 
+        if self.validate:
+            self.check(scenario)
+
         # If two runs are kicked off simultaneously  with the same self.model_dir, then
         # they will try to write the same optfile, and may write different contents.
         #
@@ -3,7 +3,7 @@ import os
 from collections.abc import Iterable, Mapping, Sequence
 from functools import lru_cache
 from itertools import chain, product, zip_longest
-from typing import TypeVar
+from typing import TYPE_CHECKING, TypeVar
 from warnings import warn
 
 import ixmp
@@ -14,6 +14,9 @@ from ixmp.backend.jdbc import JDBCBackend
 from ixmp.util import as_str_list, maybe_check_out, maybe_commit
 from ixmp.util.ixmp4 import is_ixmp4backend
 
+if TYPE_CHECKING:
+    from message_ix.util.validate import Severity, ValidationReport
+
 # from message_ix.util.scenario_data import PARAMETERS
 
 log = logging.getLogger(__name__)
@@ -739,6 +742,47 @@ class Scenario(ixmp.Scenario):
         # Call the parent method
         return super().clone(*args, **kwargs)
 
+    def estimate_size(self) -> pd.DataFrame:
+        """Estimate the numbers of variables, equations, and non-zeros of the LP.
+
+        The estimate is computed from the scenario data, without invoking GAMS. Use
+        this, for instance, to anticipate the memory needed to :meth:`solve`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            See :func:`.util.size.estimate_size`.
+        """
+        from message_ix.util.size import estimate_size
+
+        return estimate_size(self)
+
+    def validate(self, level: "Severity" = "warning") -> "ValidationReport":
+        """Check the data in the Scenario for problems that prevent a correct solution.
+
+        The checks include elements of parameters that are not members of the
+        corresponding sets; technologies with ``input`` or ``output`` but no
+        ``technical_lifetime``; resource commodities without ``resource_volume``; and
+        more. Each check handles entire parameters at once, so validation is much
+        faster than identifying the same problems via GAMS.
+
+        Parameters
+        ----------
+        level : "warning" or "error", optional
+            Minimum severity of checks to run.
+
+        Returns
+        -------
+        .ValidationReport
+
+        See also
+        --------
+        .util.validate.validate
+        """
+        from message_ix.util.validate import validate
+
+        return validate(self, level)
+
     def solve(self, model="MESSAGE", solve_options={}, **kwargs):
         """Solve MESSAGE or MESSAGE-MACRO for the Scenario.
 
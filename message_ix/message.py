@@ -1,9 +1,11 @@
 import logging
 from collections.abc import MutableMapping
 from functools import partial
+from typing import TYPE_CHECKING, cast
 from warnings import warn
 
 import ixmp.model.gams
+import numpy as np
 import pandas as pd
 from ixmp.backend import ItemType
 from ixmp.backend.jdbc import JDBCBackend
@@ -18,6 +20,9 @@ from .common import (
     _item_shorthand,
 )
 
+if TYPE_CHECKING:
+    from message_ix.core import Scenario
+
 log = logging.getLogger(__name__)
 
 
@@ -32,6 +37,10 @@ def _check_structure(scenario: "ixmp.Scenario"):
     4. A warning/error message, *if* the index names/sets do not match those in
        :attr:`.MESSAGE.items` and the item contains data. Otherwise, the message is an
        empty string.
+
+    See also
+    --------
+    .util.check_schema
     """
     if scenario.has_solution():
         return
@@ -60,6 +69,61 @@ def _check_structure(scenario: "ixmp.Scenario"):
             yield name, info.ix_type, N, message
 
 
+def _masks(scenario: "ixmp.Scenario"):
+    """Iterate over masks that are stored in `scenario`.
+
+    Yields a sequence of 3-tuples:
+
+    1. Name of a mask, i.e. a set like "is_bound_activity_up" that indicates which
+       elements of one or more parameters are populated.
+    2. Mapping from names of those parameters to the dimensions that form the mask, or
+       :any:`None` for all dimensions.
+    3. Optional mapping for renaming these dimensions.
+
+    Only "is_capacity_factor" and masks from :data:`.HELPER_TABLES` with names like
+    "is_*" are included. Of these, only "is_capacity_factor" is in
+    :attr:`.MESSAGE.items`, thus present in every scenario; the others are usually only
+    generated when the scenario is written to GDX. They are included if they have been
+    added to `scenario`, for instance with :meth:`~ixmp.Scenario.init_set`, and skipped
+    otherwise.
+    """
+    from message_ix.util.scenario_data import HELPER_TABLES, HelperTableInfo
+
+    seen = set()
+    for info in [
+        HelperTableInfo(name="is_capacity_factor", sources={"capacity_factor": None})
+    ] + HELPER_TABLES:
+        if (
+            not info.name.startswith("is_")
+            or info.name in seen
+            or not scenario.has_set(info.name)
+        ):
+            continue
+        seen.add(info.name)
+        yield info.name, info.sources, info.renames
+
+
+def _mask_diff(
+    existing: pd.DataFrame, expected: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return rows of `existing` not in `expected`, and of `expected` not in `existing`.
+
+    Rows are compared using hashes of their values (as :class:`str`), so that the cost
+    is linear in the total length of `existing` and `expected`. The columns of the
+    second return value are in the same order as those of `existing`.
+    """
+    expected = expected[list(existing.columns)]
+
+    def _hash(df: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+    h_existing, h_expected = _hash(existing), _hash(expected)
+    return (
+        existing[~np.isin(h_existing, h_expected)],
+        expected[~np.isin(h_expected, h_existing)].drop_duplicates(),
+    )
+
+
 class MESSAGE(GAMSModel):
     """Model class for MESSAGE."""
 
@@ -73,6 +137,8 @@ class MESSAGE(GAMSModel):
     @staticmethod
     def enforce(scenario: "ixmp.Scenario") -> None:
         """Enforce data consistency in `scenario`."""
+        from message_ix.util.gams_io import _compose_records
+
         # Raise an exception if any of the storage items have incorrect dimensions, i.e.
         # non-empty error messages
         messages: list[str] = list(
@@ -82,29 +148,38 @@ class MESSAGE(GAMSModel):
             raise ValueError("\n".join(messages))
 
         # Check masks ("mapping sets") that indicate which elements of corresponding
-        # parameters are active/non-zero. Note that there are other masks currently
-        # handled in JDBCBackend. For the moment, this code does not backstop that
-        # behaviour.
-        # TODO Extend to handle all masks, e.g. for new backends.
-        for par_name in ("capacity_factor",):
-            # Name of the corresponding set
-            set_name = f"is_{par_name}"
-
-            # Existing and expected contents
+        # parameters are active/non-zero. Collect the differences for all masks, then
+        # apply them in a single transaction—only if there are any.
+        changes = []
+        for set_name, sources, renames in _masks(scenario):
             existing = scenario.set(set_name)
-            par_data = scenario.par(par_name)
-            assert isinstance(par_data, pd.DataFrame) and isinstance(
-                existing, pd.DataFrame
+            expected = _compose_records(
+                cast("Scenario", scenario), sources, None, renames
             )
-            expected = par_data.drop(columns=["value", "unit"])
-
-            if existing.equals(expected):
-                continue  # Contents are as expected; do nothing
+            assert isinstance(existing, pd.DataFrame)
 
-            # Not consistent; empty and then re-populate the set
-            with scenario.transact(f"Enforce consistency of {set_name} and {par_name}"):
-                scenario.remove_set(set_name, existing)
-                scenario.add_set(set_name, expected)
+            if set(existing.columns) != set(expected.columns):
+                log.warning(
+                    f"Cannot enforce {set_name!r} with dimensions "
+                    f"{tuple(existing.columns)!r} != {tuple(expected.columns)!r}"
+                )
+                continue
+
+            to_remove, to_add = _mask_diff(existing, expected)
+            if len(to_remove) or len(to_add):
+                changes.append((set_name, to_remove, to_add))
+
+        if not changes:
+            return  # Contents are as expected; do nothing
+
+        with scenario.transact(
+            f"Enforce consistency of {', '.join(c[0] for c in changes)}"
+        ):
+            for set_name, to_remove, to_add in changes:
+                if len(to_remove):
+                    scenario.remove_set(set_name, to_remove)
+                if len(to_add):
+                    scenario.add_set(set_name, to_add)
 
     @classmethod
     def initialize(cls, scenario: "ixmp.Scenario") -> None:
@@ -1,40 +1,74 @@
 import logging
-from collections.abc import Mapping
+from collections.abc import Hashable, Mapping
+from copy import deepcopy
 from functools import lru_cache, partial
+from importlib.metadata import version
+from importlib.util import find_spec
 from itertools import product
 from operator import itemgetter
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Literal, cast
 
+import genno
+import pandas as pd
+from dask.core import istask, quote
 from genno import ComputationError, Key, KeyExistsError, Keys, MissingKeyError
-from genno.operator import broadcast_map
+from genno.compat.dask import cull
+from genno.compat.pyam.operator import as_pyam
+from genno.config import handles
+from genno.core.graph import Graph
+from genno.operator import broadcast_map, concat
 from ixmp.backend import ItemType
 from ixmp.model import get_model
 from ixmp.report import Quantity, configure
 from ixmp.report import Reporter as IXMPReporter
+from ixmp.report.common import RENAME_DIMS
 
 from message_ix.common import DIMS
 
-from .pyam import collapse_message_cols
+from .cache import ResultCache, is_data
+from .pyam import IAMCWriter, collapse_message_cols
 
 if TYPE_CHECKING:
+    import os
+
+    from genno import Computer
+
     from message_ix.common import GAMSModel
 
     from .pyam import CollapseMessageColsKw
 
 __all__ = [
     "ComputationError",
+    "IAMCWriter",
     "Key",
     "Keys",
     "KeyExistsError",
     "MissingKeyError",
     "Quantity",
     "Reporter",
+    "ResultCache",
     "configure",
     "collapse_message_cols",
 ]
 
 log = logging.getLogger(__name__)
 
+
+@handles("quantity_class", iterate=False, discard=False)
+def _quantity_class(
+    c: "Computer", info: Literal["AttrSeries", "SparseDataArray"]
+) -> None:
+    """Handle the ``quantity_class:`` config section.
+
+    This calls :func:`genno.set_class`, thus affects every :class:`.Reporter` in the
+    current process.
+    """
+    if info == "SparseDataArray" and find_spec("sparse") is None:
+        raise ImportError(f"quantity_class {info!r} requires the package 'sparse'")
+
+    genno.set_class(info)
+
+
 # Configure genno for message_ix.
 configure(
     # Units appearing in MESSAGEix test data
@@ -227,6 +261,66 @@ def get_tasks() -> list[tuple[tuple, Mapping]]:
     return to_add
 
 
+def _concat_args(graph: Graph, key: "Key | str") -> list["Key | str"]:
+    """Return the keys concatenated, perhaps recursively, by the task at `key`."""
+    task = graph[key]
+    if isinstance(task, tuple) and task and task[0] is concat:
+        return [k for arg in task[1:] for k in _concat_args(graph, arg)]
+    return [key]
+
+
+def _is_as_pyam(task) -> bool:
+    """Return :any:`True` if `task` applies :func:`.as_pyam` to (scenario, quantity)."""
+    return (
+        isinstance(task, tuple)
+        and len(task) == 3
+        and isinstance(task[0], partial)
+        and task[0].func is as_pyam
+    )
+
+
+#: Reporters prepared by :meth:`.Reporter.from_scenario` with
+#: :py:`cache_graph=True`, and the names of missing parameters, keyed by
+#: :func:`_signature`.
+_GRAPHS: dict[Hashable, tuple["Reporter", set[str]]] = {}
+
+#: Maximum number of entries in :data:`_GRAPHS`.
+_GRAPHS_MAX = 8
+
+
+def _signature(scenario) -> Hashable:
+    """Return a key for the reporting tasks of `scenario`."""
+    items = tuple(
+        (ix_type, name, tuple(scenario.idx_names(name)))
+        for ix_type in ("par", "equ", "var", "set")
+        for name in sorted(getattr(scenario, f"{ix_type}_list")())
+    )
+    return version("message_ix"), scenario.scheme, scenario.has_solution(), items
+
+
+def _copy_graph(graph: Graph) -> Graph:
+    """Return a copy of `graph`.
+
+    The indices of `graph` are copied, which is much faster than :meth:`.Graph.update`
+    for graphs with many keys.
+    """
+    result = Graph()
+    dict.update(result, graph)
+    result._unsorted = graph._unsorted.copy()
+    result._full = graph._full.copy()
+    return result
+
+
+def _warn_missing(scenario, missing: set[str]) -> None:
+    if missing:
+        log.warning(
+            f"Scenario {scenario.url!r} is missing {len(missing)} parameter(s):"
+            + "\n- ".join(sorted({""} | missing))
+            + "\n…possibly added by a newer version of message_ix. These keys will "
+            "return empty Quantity()."
+        )
+
+
 class Reporter(IXMPReporter):
     """MESSAGEix Reporter."""
 
@@ -238,7 +332,9 @@ class Reporter(IXMPReporter):
         self.require_compat("message_ix.report.operator")
 
     @classmethod
-    def from_scenario(cls, scenario, **kwargs) -> "Reporter":
+    def from_scenario(
+        cls, scenario, *, cache_graph: bool = False, **kwargs
+    ) -> "Reporter":
         """Create a Reporter by introspecting `scenario`.
 
         Warnings are logged if `scenario` does not have a solution. In this case, any
@@ -246,13 +342,27 @@ class Reporter(IXMPReporter):
         return an empty Quantity, fail, or behave unpredictably. Keys/computations
         based only on model input (ixmp sets and parameters) should function normally.
 
+        Parameters
+        ----------
+        cache_graph : bool, optional
+            If :obj:`True`, the tasks are prepared once for each combination of the
+            :mod:`message_ix` version; the :attr:`~ixmp.TimeSeries.scheme` of
+            `scenario`; whether it has a solution; and the names and dimensions of its
+            items. Later calls for a scenario with the same combination copy these
+            tasks, which is much faster when reporting many similar scenarios. Only the
+            ``scenario`` key and the contents of sets are specific to each scenario.
+            `kwargs` are applied after the tasks are added.
+        fail_action : "raise" or int, optional
+            Passed to :meth:`add_tasks`. Default "raise" if `scenario` has a solution,
+            otherwise :data:`logging.DEBUG`.
+        kwargs :
+            Passed to :meth:`genno.Computer.configure`.
+
         Returns
         -------
         .Reporter
             A reporter for `scenario`.
         """
-        import genno
-
         if not scenario.has_solution():
             log.warning(
                 f'Scenario "{scenario.model}/{scenario.scenario}" has no solution'
@@ -261,7 +371,46 @@ class Reporter(IXMPReporter):
             fail_action: int | str = logging.DEBUG
         else:
             fail_action = "raise"
+        fail_action = kwargs.pop("fail_action", fail_action)
+
+        if not cache_graph:
+            rep, missing = cls._from_scenario(scenario, fail_action, **kwargs)
+            _warn_missing(scenario, missing)
+            return rep
+
+        key = (_signature(scenario), fail_action)
+        if key not in _GRAPHS:
+            template, missing = cls._from_scenario(scenario, fail_action)
+            # Do not keep a reference to `scenario`
+            template.finalize(None)  # type: ignore [arg-type]
+            _GRAPHS[key] = (template, missing)
+            while len(_GRAPHS) > _GRAPHS_MAX:
+                _GRAPHS.pop(next(iter(_GRAPHS)))
+
+        template, missing = _GRAPHS[key]
+        _warn_missing(scenario, missing)
+
+        rep = cls()
+        rep.modules = list(template.modules)
+        rep.graph = _copy_graph(template.graph)
+        rep.graph["config"] = deepcopy(template.graph["config"])
+
+        # Bind the data-loading tasks to `scenario`, and add the contents of sets
+        rep.finalize(scenario)
+        for name in scenario.set_list():
+            elements = scenario.set(name)
+            if isinstance(elements, pd.Series):
+                elements = quote(elements.tolist())
+            rep.add(RENAME_DIMS.get(name, name), elements)
+
+        rep.configure(**kwargs)
+        return rep
 
+    @classmethod
+    def _from_scenario(
+        cls, scenario, fail_action: int | str, **kwargs
+    ) -> tuple["Reporter", set[str]]:
+        """Create a Reporter for `scenario`, and return the names of missing items."""
         # Invoke the ixmp method
         rep = cast("Reporter", super().from_scenario(scenario, **kwargs))
 
@@ -273,18 +422,137 @@ class Reporter(IXMPReporter):
             rep.add(item.key, lambda: genno.Quantity())
             missing.add(item.name)
 
-        if missing:
-            log.warning(
-                f"Scenario {scenario.url!r} is missing {len(missing)} parameter(s):"
-                + "\n- ".join(sorted({""} | missing))
-                + "\n…possibly added by a newer version of message_ix. These keys will "
-                "return empty Quantity()."
-            )
-
         # Add the MESSAGEix calculations
         rep.add_tasks(fail_action)
 
-        return rep
+        return rep, missing
+
+    def get(self, key=None, *, workers: int = 1):
+        """Execute and return the result of the computation `key`.
+
+        If the ``result_cache`` configuration section is set and `key` is computed by
+        a task, the result is read from or stored in a :class:`.ResultCache`. Only
+        results that are data, per :func:`.cache.is_data`, are stored. Otherwise, this
+        is the same as :meth:`genno.Computer.get`.
+
+        Parameters
+        ----------
+        workers : int, optional
+            If greater than 1, compute independent tasks concurrently in a pool of this
+            many threads, using :func:`dask.threaded.get`. Each task—including those
+            that load data from the Scenario and are shared by several others—is
+            computed only once. The result, and any :class:`.ComputationError` raised,
+            are the same as with the default, serial execution.
+        """
+        info = self.graph["config"].get("result_cache")
+        if key is None:
+            key = self.default_key
+        if not info or key is None or "scenario" not in self.graph:
+            return self._get(key, workers)
+
+        key = self.check_keys(key)[0]
+        if not istask(self.graph[key]):
+            # "scenario" or another object stored in the graph as-is
+            return self._get(key, workers)
+
+        cache = ResultCache.from_config(info)
+        name = cache.name(self, key)
+        try:
+            return cache.read(name)
+        except KeyError:
+            result = self._get(key, workers)
+        # Only store data; not, for instance, Scenario or Platform objects
+        return cache.write(name, result) if is_data(result) else result
+
+    def _get(self, key, workers: int):
+        """Compute `key` serially or, if `workers` > 1, with :mod:`dask.threaded`."""
+        if workers <= 1 or key is None:
+            return super().get(key)
+
+        # Threads are used instead of processes: Scenario and Platform objects, for
+        # instance with JDBCBackend, cannot be transferred between processes
+        from dask.threaded import get
+
+        key = self.check_keys(key)[0]
+
+        # Same as genno.Computer.get(), except for the scheduler
+        self.graph["config"] = quote(self.graph.get("config", dict()))
+        dsk, _ = cull(self.graph, key)
+        log.debug(f"Cull {len(self.graph)} -> {len(dsk)} keys; {workers} workers")
+
+        try:
+            return get(dsk, str(key), num_workers=workers)
+        except Exception as exc:
+            raise ComputationError(exc) from None
+        finally:
+            self.graph["config"] = self.graph["config"][0].data
+
+    def write_iamc(
+        self,
+        path: "os.PathLike | str | IAMCWriter",
+        key: "Key | str" = "message::default",
+        *,
+        chunk_regions: int | None = None,
+        workers: int = 1,
+    ) -> int:
+        """Compute `key` and write it to `path` in IAMC format, piece by piece.
+
+        Unlike :py:`write(key, path)`, the full result of `key` is never held in
+        memory. If `key` concatenates other keys—as ``message::default`` concatenates
+        the ``*::pyam`` keys for each quantity in :data:`PYAM_CONVERT`—these are
+        computed and written one at a time.
+
+        Parameters
+        ----------
+        path : os.PathLike or str or IAMCWriter
+            File to write. See :class:`.IAMCWriter` for the supported formats. Give
+            an :class:`.IAMCWriter` instance to write results for several scenarios to
+            the same file.
+        chunk_regions : int, optional
+            If given, each quantity converted to IAMC format by
+            :func:`~genno.compat.pyam.operator.as_pyam` is computed once, then
+            converted and written for this many regions at a time. The IAMC-format
+            data, which uses more memory than the quantity, is then never held for all
+            regions at once.
+        workers : int, optional
+            Passed to :meth:`get`.
+
+        Returns
+        -------
+        int
+            Number of rows written.
+        """
+        if not isinstance(path, IAMCWriter):
+            with IAMCWriter(path) as writer:
+                return self.write_iamc(
+                    writer, key, chunk_regions=chunk_regions, workers=workers
+                )
+
+        writer, rows = path, path.rows
+
+        for k in _concat_args(self.graph, key):
+            task = self.graph[k]
+            if chunk_regions is None or not _is_as_pyam(task):
+                writer.write(self.get(k, workers=workers))
+                continue
+
+            # Compute the quantity, then convert chunks of regions to IAMC format
+            func: partial = task[0]
+            scenario, qty = self.get(task[1]), self.get(task[2], workers=workers)
+            rename = func.keywords.get("rename", {})
+            dims = [d for d in qty.dims if rename.get(d) == "region"]
+            if not dims:
+                writer.write(func(scenario, qty))
+                continue
+            nodes = list(dict.fromkeys(qty.coords[dims[0]].values))
+            for i in range(0, len(nodes), chunk_regions):
+                writer.write(
+                    func(scenario, qty.sel({dims[0]: nodes[i : i + chunk_regions]}))
+                )
+            del qty
+
+        log.info(f"Wrote {writer.rows - rows} rows to {writer.path}")
+        return writer.rows - rows
 
     def add_sankey(
         self,
@@ -323,7 +591,8 @@ class Reporter(IXMPReporter):
         from pyam import IamDataFrame
         from pyam.figures import sankey
 
-        from message_ix.tools.sankey import map_for_sankey
+        from message_ix.tools.sankey import _map_for_sankey
+        from message_ix.util.flow import FlowGraph
 
         # Silence a warning raised by pyam-iamc 3.0.0 with pandas 2.2.3
         filterwarnings("ignore", "Downcasting behavior", FutureWarning, "pyam.figures")
@@ -337,8 +606,15 @@ class Reporter(IXMPReporter):
         self.add(k[0], "concat", "out::pyam", "in::pyam", strict=True)
         # `df` argument to pyam.figures.sankey()
         self.add(k[1], partial(IamDataFrame.filter, year=year), k[0])
+        # Graph of flows in the scenario
+        self.add(k[3], FlowGraph.from_scenario, "scenario")
         # `mapping` argument to pyam.figures.sankey()
-        self.add(k[2], map_for_sankey, k[1], node=node, exclude=exclude)
+        self.add(
+            k[2],
+            partial(_map_for_sankey, node=node, exclude=exclude),
+            k[1],
+            k[3],
+        )
         # Generate the plotly.Figure object; return the key
         return str(self.add(f"sankey figure {unique}", sankey, k[1], k[2]))
 
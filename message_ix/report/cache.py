@@ -0,0 +1,229 @@
+"""Persistent cache for :meth:`.Reporter.get` results.
+
+Reporting the same solved scenarios repeatedly—for instance, for a dashboard—repeats
+the same computations. If the ``result_cache`` configuration section is given, for
+instance:
+
+.. code-block:: python
+
+   rep = Reporter.from_scenario(
+       scenario, result_cache=dict(path="~/.cache/message-ix", max_size=2**30)
+   )
+
+…then :meth:`.Reporter.get` stores each result on disk, and returns the stored result
+if the same key is requested again for the same scenario, solution, and tasks. The
+configuration section may also be given in a reporting configuration file, or as a
+single path.
+"""
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from functools import partial
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import genno
+import pandas as pd
+from dask.core import literal, quote
+from genno.caching import hash_args
+from genno.compat.dask import cull
+from genno.config import handles
+from ixmp import TimeSeries
+
+if TYPE_CHECKING:
+    from genno import Computer, Key
+
+log = logging.getLogger(__name__)
+
+#: Packages whose versions are part of every cache key.
+PACKAGES = ("genno", "ixmp", "message_ix", "pandas", "pyam-iamc")
+
+
+@handles("result_cache", iterate=False, discard=False)
+def _configure(c: "Computer", info: Any) -> None:
+    """Handle the ``result_cache:`` config section; stored as-is."""
+    ResultCache.from_config(info)
+
+
+@dataclass
+class ResultCache:
+    """Persistent on-disk cache of :meth:`.Reporter.get` results.
+
+    Each result is stored in a file in `path`, named with a hash of:
+
+    - The :attr:`.Platform.name`, model name, scenario name, and version of the
+      scenario being reported. The value of the objective function, if the scenario
+      has a solution, to detect a solution that has been removed or replaced.
+    - The requested key.
+    - All the tasks needed to compute the key, including the reporting configuration,
+      for instance filters set with :meth:`.Reporter.set_filters`. Functions are
+      identified by their names; for this reason the versions of :data:`PACKAGES` are
+      also included.
+
+    :class:`genno.Quantity` and :class:`pandas.DataFrame` results, and
+    :class:`pyam.IamDataFrame` results without meta indicators, are stored in Parquet
+    format; other results using :mod:`pickle`.
+
+    When the files in `path` exceed `max_size` bytes, the least-recently used files are
+    deleted.
+    """
+
+    #: Directory for cache files.
+    path: Path
+
+    #: Maximum total size of cache files, in bytes.
+    max_size: int = 2**30
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, info: Any) -> "ResultCache":
+        """Create from the ``result_cache`` config section: a path or a mapping."""
+        return cls(**info) if isinstance(info, dict) else cls(info)
+
+    def name(self, computer: "Computer", key: "Key | str") -> str:
+        """Return the cache file name for `key` in `computer`, without suffix."""
+        s = computer.graph["scenario"]
+        obj = s.var("OBJ")["lvl"] if s.has_solution() else None
+
+        # Protect the config dict, as in genno.Computer.get()
+        graph = computer.graph | dict(config=quote(computer.graph["config"]))
+        dsk, _ = cull(graph, key)
+        tasks = {str(k): _token(v) for k, v in dsk.items()}
+
+        versions = {p: version(p) for p in PACKAGES}
+        info = (s.platform.name, s.model, s.scenario, s.version, obj)
+        return hash_args(*info, str(key), tasks, versions)
+
+    def read(self, name: str) -> Any:
+        """Return the result stored as `name`.
+
+        Raises
+        ------
+        KeyError
+            if there is no such result.
+        """
+        for suffix in (".parquet", ".pickle"):
+            path = self.path.joinpath(name + suffix)
+            try:
+                result = _read(path)
+            except FileNotFoundError:
+                continue
+            # Mark as recently used
+            os.utime(path)
+            log.info(f"Cache hit for {name[:8]}…")
+            return result
+        raise KeyError(name)
+
+    def write(self, name: str, data: Any) -> Any:
+        """Store `data` as `name`, evict old results, and return `data`."""
+        # Write to a temporary file, then rename, so that other processes reading the
+        # same cache never see a partial file
+        tmp = self.path.joinpath(f".{name}.{os.getpid()}.tmp")
+        suffix = _write(tmp, data)
+        tmp.replace(self.path.joinpath(name + suffix))
+        log.info(f"Cache {name[:8]}…")
+
+        self.evict()
+        return data
+
+    def evict(self) -> None:
+        """Delete the least-recently used files until their size is `max_size`."""
+        files = []
+        for path in self.path.iterdir():
+            if path.suffix in (".parquet", ".pickle"):
+                try:
+                    files.append((path.stat(), path))
+                except FileNotFoundError:  # Deleted by another process
+                    pass
+
+        size = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda f: f[0].st_mtime):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+
+
+def is_data(obj: Any) -> bool:
+    """Return :any:`True` if `obj` is a result that :class:`ResultCache` may store.
+
+    These are :class:`genno.Quantity`, :class:`pandas.DataFrame`, and
+    :class:`pyam.IamDataFrame`. Other objects, for instance the :class:`.Scenario`
+    at the key "scenario", may not survive a round trip through :mod:`pickle`.
+    """
+    return isinstance(obj, (genno.Quantity, pd.DataFrame)) or (
+        type(obj).__name__ == "IamDataFrame"
+    )
+
+
+def _token(obj: Any) -> Any:
+    """Return a JSON-serializable representation of `obj`, part of a task."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    elif isinstance(obj, (list, tuple)):
+        return [_token(o) for o in obj]
+    elif isinstance(obj, dict):
+        return {str(k): _token(v) for k, v in obj.items()}
+    elif isinstance(obj, literal):
+        return _token(obj.data)
+    elif isinstance(obj, partial):
+        return [_token(obj.func), _token(obj.args), _token(obj.keywords)]
+    elif isinstance(obj, TimeSeries):
+        return obj.url
+    elif isinstance(obj, genno.Quantity):
+        return _token(obj.to_series())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        return str(pd.util.hash_pandas_object(obj).sum())
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    # Other objects, including genno.Key; the repr() may include a memory address, in
+    # which case there are no cache hits
+    return repr(obj)
+
+
+def _read(path: Path) -> Any:
+    if path.suffix == ".pickle":
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    df = pd.read_parquet(path)
+    attrs, df.attrs = df.attrs, {}
+    kind = attrs.get("kind")
+    if kind == "Quantity":
+        return genno.Quantity(df["value"].rename(attrs["name"]), units=attrs["units"])
+    elif kind == "IamDataFrame":
+        from pyam import IamDataFrame
+
+        return IamDataFrame(df)
+    return df
+
+
+def _write(path: Path, data: Any) -> str:
+    """Write `data` to `path` and return the suffix for the resulting file."""
+    df = None
+    if isinstance(data, genno.Quantity) and len(data.dims):
+        df = data.to_series().rename("value").to_frame()
+        df.attrs = dict(kind="Quantity", units=str(data.units), name=data.name)
+    elif isinstance(data, pd.DataFrame) and not data.attrs:
+        df = data
+    elif type(data).__name__ == "IamDataFrame" and data.meta.columns.empty:
+        df = data.data
+        df.attrs = dict(kind="IamDataFrame")
+
+    if df is not None and not df.empty:
+        try:
+            df.to_parquet(path)
+        except ImportError:  # Neither pyarrow nor fastparquet
+            pass
+        else:
+            return ".parquet"
+
+    with open(path, "wb") as f:
+        pickle.dump(data, f)
+    return ".pickle"
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, TypedDict
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypedDict
 
 if TYPE_CHECKING:
     import pandas
@@ -53,3 +55,117 @@ def collapse_message_cols(
         columns["variable"].extend(["t"] + var_cols)
 
     return util.collapse(df, columns=columns, sep="|")
+
+
+class IAMCWriter:
+    """Write data in IAMC format to a file, incrementally.
+
+    Each call to :meth:`write` appends data to the file at `path`, so that only the
+    data passed in that call must be held in memory. Data are written in "long"
+    format, with one row per observation and columns "model", "scenario", "region",
+    "variable", "unit", "year", and "value"; these files can be read with
+    :class:`pyam.IamDataFrame`. The format is chosen from the suffix of `path`:
+
+    - :file:`.csv`: if `append` is :any:`True` and `path` exists, rows are appended to
+      the existing file.
+    - :file:`.parquet`: requires :mod:`pyarrow`.
+    - :file:`.xlsx`: requires :mod:`openpyxl`. Rows are written to a sheet named
+      "data"; if this exceeds the maximum number of rows in a sheet, further rows are
+      written to sheets named "data 2", "data 3", etc.
+
+    Use as a context manager, or call :meth:`close` after the last :meth:`write`.
+
+    Example
+    -------
+    >>> with IAMCWriter("all.parquet") as writer:
+    ...     for scenario in scenarios:
+    ...         Reporter.from_scenario(scenario).write_iamc(writer)
+    """
+
+    #: Maximum number of rows in a sheet of a :file:`.xlsx` file.
+    max_rows_xlsx = 1_048_576
+
+    def __init__(self, path: os.PathLike | str, append: bool = False) -> None:
+        self.path = Path(path)
+        self.kind = self.path.suffix.lstrip(".")
+        if self.kind not in ("csv", "parquet", "xlsx"):
+            raise ValueError(
+                f"Cannot write IAMC data to {self.path}; use .csv, .parquet, or .xlsx"
+            )
+        elif append and self.kind != "csv":
+            raise ValueError(f"Cannot append to {self.path}; only to .csv")
+
+        #: Number of rows written.
+        self.rows = 0
+
+        self._append = append and self.path.exists()
+        self._columns: list[str] | None = None
+        self._writer: Any = None
+        self._sheet: Any = None
+        self._sheet_rows = 0
+
+    def __enter__(self) -> "IAMCWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, data: Any) -> None:
+        """Write `data`: a :class:`pyam.IamDataFrame` or :class:`pandas.DataFrame`."""
+        # IamDataFrame → pd.DataFrame in long format
+        df = getattr(data, "data", data)
+        if df.empty:
+            return
+
+        # Use the same columns, in the same order, as the first data written
+        if self._columns is None:
+            self._columns = list(df.columns)
+        df = df[self._columns]
+
+        getattr(self, f"_write_{self.kind}")(df)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """Finish writing the file."""
+        if self.kind == "parquet" and self._writer:
+            self._writer.close()
+        elif self.kind == "xlsx" and self._writer:
+            self._writer.save(self.path)
+        self._writer = None
+
+    def _write_csv(self, df: "pandas.DataFrame") -> None:
+        df.to_csv(
+            self.path,
+            mode="a" if self._append else "w",
+            header=not self._append,
+            index=False,
+        )
+        self._append = True
+
+    def _write_parquet(self, df: "pandas.DataFrame") -> None:
+        import pyarrow
+        import pyarrow.parquet
+
+        schema = self._writer.schema if self._writer else None
+        table = pyarrow.Table.from_pandas(df, schema=schema, preserve_index=False)
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def _write_xlsx(self, df: "pandas.DataFrame") -> None:
+        from openpyxl import Workbook
+
+        if self._writer is None:
+            # Write-only mode: rows are stored in temporary files, not in memory
+            self._writer = Workbook(write_only=True)
+
+        for row in df.itertuples(index=False):
+            if self._sheet_rows in (0, self.max_rows_xlsx):
+                n = len(self._writer.sheetnames)
+                self._sheet = self._writer.create_sheet(
+                    f"data {n + 1}" if n else "data"
+                )
+                self._sheet.append(self._columns)
+                self._sheet_rows = 1
+            self._sheet.append(list(row))
+            self._sheet_rows += 1
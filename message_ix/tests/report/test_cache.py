@@ -0,0 +1,118 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyam
+import pytest
+from genno.testing import assert_qty_equal
+
+try:
+    from genno.operator import random_qty
+except ImportError:  # pragma: no cover — genno v1.27.1 and earlier
+    from genno.testing import random_qty  # type: ignore [no-redef]
+
+from message_ix.report import Reporter, ResultCache
+
+
+@pytest.mark.parametrize(
+    "data, suffix",
+    (
+        (random_qty(dict(c=3, h=2)), ".parquet"),
+        (pd.DataFrame([[1, 2.0]], columns=["a", "value"]), ".parquet"),
+        (
+            pyam.IamDataFrame(
+                pd.DataFrame(
+                    [["m", "s", "r", "v", "u", 2020, 1.0]],
+                    columns="model scenario region variable unit year value".split(),
+                )
+            ),
+            ".parquet",
+        ),
+        ({"foo": 1}, ".pickle"),
+    ),
+)
+def test_result_cache(tmp_path: Path, data, suffix: str) -> None:
+    cache = ResultCache(tmp_path)
+
+    with pytest.raises(KeyError):
+        cache.read("foo")
+
+    assert data is cache.write("foo", data)
+    assert [tmp_path.joinpath("foo" + suffix)] == list(tmp_path.iterdir())
+
+    result = cache.read("foo")
+    if isinstance(data, pyam.IamDataFrame):
+        assert data.equals(result)
+    elif isinstance(data, pd.DataFrame):
+        pd.testing.assert_frame_equal(data, result)
+    elif isinstance(data, dict):
+        assert data == result
+    else:
+        assert_qty_equal(data, result)
+
+
+def test_result_cache_evict(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, max_size=0)
+    for i, name in enumerate("abc"):
+        cache.max_size += 100
+        cache.write(name, bytes(100 - 20))
+        os.utime(tmp_path.joinpath(f"{name}.pickle"), (i, i))
+
+    # Reading "a" marks it as recently used; "b" is then the least recently used
+    cache.read("a")
+    cache.max_size = 200
+    cache.evict()
+
+    assert {"a.pickle", "c.pickle"} == {p.name for p in tmp_path.iterdir()}
+
+
+def test_reporter_cache(tmp_path: Path, dantzig_reporter: Reporter) -> None:
+    rep = dantzig_reporter
+    rep.configure(result_cache=tmp_path)
+    scen = rep.graph["scenario"]
+
+    # Result is stored on first use and read on later uses
+    key = "out:nl-t-ya-m-nd-c-l"
+    result0 = rep.get(key)
+    assert 1 == len(list(tmp_path.iterdir()))
+    assert_qty_equal(result0, rep.get(key))
+    assert 1 == len(list(tmp_path.iterdir()))
+
+    # Other keys and filters lead to new entries
+    rep.get("ACT:nl-t-ya")
+    rep.set_filters(t=["canning_plant"])
+    assert rep.get(key).size < result0.size
+    assert 3 == len(list(tmp_path.iterdir()))
+
+    # A different solution leads to a new entry
+    rep.set_filters()
+    scen.remove_solution()
+    scen.check_out()
+    scen.add_par("demand", scen.par("demand").assign(value=lambda df: df.value * 1.1))
+    scen.commit("")
+    scen.solve(quiet=True)
+    rep.get(key)
+    assert 4 == len(list(tmp_path.iterdir()))
+
+
+def test_reporter_cache_scenario(tmp_path: Path, dantzig_reporter: Reporter) -> None:
+    rep = dantzig_reporter
+    rep.configure(result_cache=tmp_path)
+    scen = rep.graph["scenario"]
+
+    # The Scenario itself is returned, and not stored
+    assert scen is rep.get("scenario")
+    assert scen is rep.get("scenario")
+    assert not list(tmp_path.iterdir())
+
+
+def test_reporter_cache_write_iamc(tmp_path: Path, dantzig_reporter: Reporter) -> None:
+    rep = dantzig_reporter
+    rep.configure(result_cache=tmp_path.joinpath("cache"))
+
+    # Results are the same when computed, and when read from the cache
+    expected = rep.get("message::default")
+    for i in range(2):
+        path = tmp_path.joinpath(f"data{i}.csv")
+        assert len(expected.data) == rep.write_iamc(path, chunk_regions=1)
+        assert expected.equals(pyam.IamDataFrame(path))
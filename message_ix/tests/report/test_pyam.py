@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pandas as pd
+import pyam
+import pytest
+
+from message_ix.report import IAMCWriter, Reporter
+
+
+@pytest.fixture
+def iamc_data() -> pyam.IamDataFrame:
+    return pyam.IamDataFrame(
+        pd.DataFrame(
+            [["m", "s", r, "v", "u", y, 1.0] for r in "abc" for y in (2020, 2030)],
+            columns="model scenario region variable unit year value".split(),
+        )
+    )
+
+
+@pytest.mark.parametrize("suffix", (".csv", ".parquet", ".xlsx"))
+def test_iamc_writer(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    iamc_data: pyam.IamDataFrame,
+    suffix: str,
+) -> None:
+    # Use a small number of rows per sheet, to test writing to further sheets
+    monkeypatch.setattr(IAMCWriter, "max_rows_xlsx", 4)
+    path = tmp_path.joinpath("data" + suffix)
+
+    with IAMCWriter(path) as writer:
+        for region in "abc":
+            writer.write(iamc_data.filter(region=region))
+        # Empty data and pd.DataFrame are supported
+        writer.write(iamc_data.filter(region="x"))
+        writer.write(iamc_data.data.iloc[:0])
+
+    assert 6 == writer.rows
+
+    if suffix == ".parquet":
+        result = pyam.IamDataFrame(pd.read_parquet(path))
+    elif suffix == ".xlsx":
+        sheets = pd.read_excel(path, sheet_name=None)
+        assert ["data", "data 2"] == list(sheets)
+        result = pyam.IamDataFrame(pd.concat(sheets.values()))
+    else:
+        result = pyam.IamDataFrame(path)
+    assert iamc_data.equals(result)
+
+
+def test_iamc_writer_append(tmp_path: Path, iamc_data: pyam.IamDataFrame) -> None:
+    path = tmp_path.joinpath("data.csv")
+    for region in "abc":
+        with IAMCWriter(path, append=True) as writer:
+            writer.write(iamc_data.filter(region=region))
+
+    assert iamc_data.equals(pyam.IamDataFrame(path))
+
+    with pytest.raises(ValueError, match="Cannot append"):
+        IAMCWriter(tmp_path.joinpath("data.parquet"), append=True)
+    with pytest.raises(ValueError, match="use .csv, .parquet, or .xlsx"):
+        IAMCWriter(tmp_path.joinpath("data.txt"))
+
+
+@pytest.mark.parametrize("chunk_regions", (None, 1))
+def test_write_iamc(
+    tmp_path: Path, dantzig_reporter: Reporter, chunk_regions: int | None
+) -> None:
+    rep = dantzig_reporter
+    expected = rep.get("message::default")
+
+    path = tmp_path.joinpath("data.csv")
+    assert len(expected.data) == rep.write_iamc(path, chunk_regions=chunk_regions)
+    assert expected.equals(pyam.IamDataFrame(path))
+
+    # Results for several scenarios can be written to the same file
+    with IAMCWriter(tmp_path.joinpath("data.parquet")) as writer:
+        rep.write_iamc(writer, "message::system")
+        rep.write_iamc(writer, "message::costs", chunk_regions=chunk_regions)
+
+    result = pyam.IamDataFrame(pd.read_parquet(writer.path))
+    assert rep.get("message::system").append(rep.get("message::costs")).equals(result)
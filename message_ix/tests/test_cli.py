@@ -4,11 +4,13 @@ from collections.abc import Callable
 from pathlib import Path
 
 import click
+import pyam
 import pytest
 from click.testing import Result
 
 import message_ix
 from message_ix import config
+from message_ix.report import Reporter
 
 
 def test_copy_model(
@@ -56,6 +58,40 @@ def test_copy_model(
     assert not Path(f"{tmp_path}-dest/225c").exists()
 
 
+@pytest.mark.jdbc
+def test_report(
+    message_ix_cli: Callable[..., Result], dantzig_reporter: Reporter
+) -> None:
+    s = dantzig_reporter.graph["scenario"]
+    url = f"ixmp://{s.platform.name}/{s.model}/{s.scenario}#{s.version}"
+    key = "out:nl-t-ya-m-nd-c-l"
+
+    # Same output with and without --workers
+    r0 = message_ix_cli("--url", url, "report", key)
+    assert r0.exit_code == 0, (r0.exception, r0.output)
+    r1 = message_ix_cli("--url", url, "report", "--workers=2", key)
+    assert r1.exit_code == 0, (r1.exception, r1.output)
+    assert r0.output == r1.output
+    assert "canning_plant" in r1.output
+
+
+@pytest.mark.jdbc
+def test_report_iamc(
+    message_ix_cli: Callable[..., Result], dantzig_reporter: Reporter, tmp_path: Path
+) -> None:
+    s = dantzig_reporter.graph["scenario"]
+    url = f"ixmp://{s.platform.name}/{s.model}/{s.scenario}#{s.version}"
+    path = tmp_path.joinpath("data.csv")
+
+    r = message_ix_cli("--url", url, "report-iamc", "--chunk-regions=1", str(path))
+    assert r.exit_code == 0, (r.exception, r.output)
+    assert dantzig_reporter.get("message::default").equals(pyam.IamDataFrame(path))
+
+    # Invalid path
+    r = message_ix_cli("--url", url, "report-iamc", str(path.with_suffix(".txt")))
+    assert r.exit_code == 2 and "use .csv, .parquet, or .xlsx" in r.output
+
+
 @pytest.mark.parametrize(
     "opts, exit_code",
     [
@@ -3,21 +3,115 @@ from collections import defaultdict
 from typing import TYPE_CHECKING
 
 import ixmp
+import pandas as pd
 import pytest
 from ixmp.backend.jdbc import JDBCBackend
 
-from message_ix.message import MESSAGE
+from message_ix import make_df
+from message_ix.message import MESSAGE, _mask_diff
+from message_ix.testing import make_dantzig
 
 if TYPE_CHECKING:
     from ixmp import Platform
 
+    from message_ix import Scenario
+
 
 pytestmark = pytest.mark.ixmp4_209
 
 
+def test_mask_diff() -> None:
+    existing = pd.DataFrame(
+        [["a", 2020, "x"], ["b", 2020, "x"], ["c", 2030, "y"]],
+        columns=["node", "year", "technology"],
+    )
+    # Different column order, a duplicate, and str vs. int years
+    expected = pd.DataFrame(
+        [["x", "a", "2020"], ["y", "c", 2030], ["z", "d", 2030], ["z", "d", 2030]],
+        columns=["technology", "node", "year"],
+    )
+
+    to_remove, to_add = _mask_diff(existing, expected)
+
+    assert [("b", 2020, "x")] == list(to_remove.itertuples(index=False, name=None))
+    assert ["node", "year", "technology"] == list(to_add.columns)
+    assert [("d", 2030, "z")] == list(to_add.itertuples(index=False, name=None))
+
+    # Identical contents → nothing to do
+    to_remove, to_add = _mask_diff(existing, existing.iloc[::-1])
+    assert 0 == len(to_remove) == len(to_add)
+
+
 class TestMESSAGE:
     """Tests of :class:`.MESSAGE`."""
 
+    @pytest.mark.parametrize(
+        "name, par",
+        (
+            ("is_capacity_factor", "capacity_factor"),
+            ("is_bound_activity_up", "bound_activity_up"),
+        ),
+    )
+    def test_enforce(
+        self,
+        monkeypatch,
+        test_mp: "Platform",
+        request: pytest.FixtureRequest,
+        name: str,
+        par: str,
+    ) -> None:
+        scen: "Scenario" = make_dantzig(test_mp, request=request)
+
+        common = dict(
+            year_vtg=1963,
+            year_act=1963,
+            mode="production",
+            time="year",
+            value=1.0,
+            unit="-",
+        )
+        with scen.transact():
+            if not scen.has_set(name):
+                # Masks other than is_capacity_factor are only enforced if they are
+                # stored in the scenario
+                info = MESSAGE.items[par]
+                scen.init_set(name, list(info.coords), list(info.dims or info.coords))
+            scen.add_par(
+                par,
+                make_df(
+                    par,
+                    node_loc=["seattle", "san-diego"],
+                    technology="canning_plant",
+                    **common,
+                ),
+            )
+        exp = scen.par(par).drop(columns=["value", "unit"])
+
+        # Make the mask inconsistent with the parameter: remove one element and add
+        # one that has no corresponding parameter data
+        with scen.transact():
+            if len(scen.set(name)):
+                scen.remove_set(name, scen.set(name).iloc[:1])
+            extra = exp.iloc[:1].assign(technology="transport_from_seattle")
+            scen.add_set(name, extra)
+
+        MESSAGE.enforce(scen)
+
+        # Contents of the mask match the parameter
+        obs = scen.set(name)
+        key = list(exp.columns)
+        pd.testing.assert_frame_equal(
+            exp.astype(str).sort_values(key).reset_index(drop=True),
+            obs[key].astype(str).sort_values(key).reset_index(drop=True),
+        )
+
+        # A second call does not modify the scenario
+        def transact(*args, **kwargs):
+            raise AssertionError("enforce() modified a consistent scenario")
+
+        monkeypatch.setattr(scen, "transact", transact)
+        MESSAGE.enforce(scen)
+
     def test_initialize(self, caplog, test_mp: "Platform") -> None:
         # Expected numbers of items by type
         exp = defaultdict(list)
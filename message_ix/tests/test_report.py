@@ -265,6 +265,87 @@ class TestReporter:
         result = rep.get(demand)
         assert 3 == len(result)
 
+    def test_from_scenario_cache_graph(
+        self, request: pytest.FixtureRequest, test_mp: Platform
+    ) -> None:
+        scen0 = make_dantzig(test_mp, solve=True, quiet=True, request=request)
+        scen1 = scen0.clone(scenario=f"{scen0.scenario} 1", keep_solution=False)
+        with scen1.transact():
+            scen1.add_set("technology", "foo")
+        scen1.solve(quiet=True)
+
+        rep0 = Reporter.from_scenario(scen0)
+        rep1 = Reporter.from_scenario(scen0, cache_graph=True)
+        rep2 = Reporter.from_scenario(scen1, cache_graph=True)
+
+        # Reporters have the same keys
+        assert set(rep0.graph) == set(rep1.graph) == set(rep2.graph)
+
+        # Each Reporter is bound to its own scenario and set contents
+        assert rep1.graph["scenario"] is scen0 and rep2.graph["scenario"] is scen1
+        assert "foo" not in rep1.get("t") and "foo" in rep2.get("t")
+
+        # Results are the same as without cache_graph=True
+        key = rep0.full_key("out")
+        assert_qty_equal(rep0.get(key), rep1.get(key))
+
+        # Changes to one Reporter do not affect others
+        rep1.add("bar", "mul", key, key)
+        assert "bar" in rep1 and "bar" not in rep2
+
+    def test_quantity_class(
+        self, request: pytest.FixtureRequest, test_mp: Platform
+    ) -> None:
+        # Invalid values raise
+        with pytest.raises(ValueError, match="no Quantity implementation foo"):
+            Reporter(quantity_class="foo")
+
+        pytest.importorskip("sparse")
+        scen = make_dantzig(test_mp, solve=True, quiet=True, request=request)
+        expected = Reporter.from_scenario(scen).get("message::system")
+
+        try:
+            rep = Reporter.from_scenario(scen, quantity_class="SparseDataArray")
+
+            # Quantities, and products like `out`, are stored as sparse data
+            key = rep.full_key("out")
+            assert isinstance(rep.get(key), genno.core.sparsedataarray.SparseDataArray)
+
+            # Results after sums and conversion to IAMC format are the same
+            assert_frame_equal(expected.data, rep.get("message::system").data)
+        finally:
+            genno.set_class("AttrSeries")
+
+    def test_get_workers(self) -> None:
+        rep = Reporter()
+        calls: list[str] = []
+
+        def a() -> float:
+            calls.append("a")
+            return 1.0
+
+        rep.add("a", a)
+        rep.add("b", lambda x: x + 1, "a")
+        rep.add("c", lambda x: x * 2, "a")
+        rep.add("d", lambda x, y: x + y, "b", "c")
+        rep.add("e", lambda x, y: x / 0, "a", "d")
+
+        # Same results with and without workers; the shared task is computed once
+        for workers in (1, 4):
+            calls.clear()
+            assert 4.0 == rep.get("d", workers=workers)
+            assert ["a"] == calls
+
+        # Same errors with and without workers
+        for workers in (1, 4):
+            with pytest.raises(ComputationError, match="ZeroDivisionError"):
+                rep.get("e", workers=workers)
+            with pytest.raises(genno.MissingKeyError):
+                rep.get("f", workers=workers)
+
+        # Config is restored after computation
+        assert isinstance(rep.graph["config"], dict)
+
     def test_from_dantzig(
         self, request: pytest.FixtureRequest, test_mp: Platform, exp_len_all: int
     ) -> None:
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy.testing as npt
 import pandas as pd
@@ -6,6 +6,11 @@ import pandas.testing as pdt
 import pytest
 
 from message_ix import make_df
+from message_ix.testing import make_dantzig
+from message_ix.util import check_schema, fix_schema
+
+if TYPE_CHECKING:
+    from ixmp import Platform
 
 
 def test_make_df() -> None:
@@ -45,3 +50,40 @@ def test_make_df_deprecated() -> None:
     # Equivalent
     base.update(baz=[42, 43])
     pdt.assert_frame_equal(pd.DataFrame.from_dict(base), exp)
+
+
+def test_check_fix_schema(test_mp: "Platform", request: pytest.FixtureRequest) -> None:
+    scen = make_dantzig(test_mp, request=request)
+
+    # Freshly-created scenario conforms
+    assert check_schema(scen).empty
+
+    # Mock a scenario created with an older version of message_ix: storage_initial
+    # without the "mode" dimension, and one parameter not present at all
+    name = "storage_initial"
+    dims = ["node", "technology", "level", "commodity", "year", "time"]
+    data = pd.DataFrame(
+        [["topeka", "canning_plant", "supply", "cases", 1963, "year", 1.0, "kg"]],
+        columns=dims + ["value", "unit"],
+    )
+    with scen.transact():
+        scen.remove_par(name)
+        scen.init_par(name, idx_sets=dims)
+        scen.add_par(name, data)
+        scen.remove_par("storage_self_discharge")
+
+    result = check_schema(scen).set_index("item")
+    assert {name, "storage_self_discharge"} == set(result.index)
+    assert ("dims", ("mode",), (), 1) == tuple(
+        result.loc[name, ["status", "added", "removed", "N"]]
+    )
+    assert "missing" == result.loc["storage_self_discharge", "status"]
+
+    # Without a value for the added dimension, only the missing item is fixed
+    result = fix_schema(scen)
+    assert [name] == result["item"].tolist()
+
+    # With a value for "mode", the data are expanded
+    assert fix_schema(scen, mode="production").empty
+    exp = make_df(name, **data, mode="production")
+    pdt.assert_frame_equal(exp, scen.par(name), check_dtype=False)
@@ -1,12 +1,14 @@
 from collections.abc import Callable, Generator
 from typing import Any
 
+import numpy as np
+import pandas as pd
 import pytest
 from click.testing import Result
 from ixmp import Platform
 
 from message_ix import Scenario
-from message_ix.tools.add_year import add_year
+from message_ix.tools.add_year import add_year, interpolate_1d, interpolate_2d
 
 
 @pytest.fixture
@@ -94,25 +96,89 @@ def assert_function(
 YEARS_NEW = [2025, 2035]
 
 
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    (
+        # Values missing after interpolation are extrapolated from the next years, or
+        # else copied from the previous year
+        (dict(), [1.5, -0.5, np.inf, 1.0]),
+        # Negative values are replaced
+        (dict(extrapol_neg=0.5), [1.5, 0.5, np.inf, 1.0]),
+        (dict(bound_extend=False), [1.5, -0.5, np.inf, np.nan]),
+    ),
+)
+def test_interpolate_1d(kwargs, expected) -> None:
+    horizon = [2020, 2030, 2040]
+    df = pd.DataFrame(
+        [
+            ["a", 2020, 1.0],
+            ["a", 2030, 2.0],
+            ["a", 2040, 3.0],
+            ["b", 2030, 1.0],
+            ["b", 2040, 4.0],
+            ["c", 2020, np.inf],
+            ["d", 2020, 1.0],
+        ],
+        columns=["technology", "year_vtg", "value"],
+    )
+
+    result = interpolate_1d(df, [2025, 2035, 2045], horizon, "year_vtg", **kwargs)
+
+    obs = result.set_index(["technology", "year_vtg"])["value"]
+    for tec, value in zip("abcd", expected):
+        if np.isnan(value):
+            assert (tec, 2025) not in obs.index
+        else:
+            assert value == pytest.approx(obs[tec, 2025])
+
+    # Interpolated between 2030 and 2040, or extrapolated from them to 2045
+    assert [2.5, 2.5, 3.5, 5.5] == obs[
+        [("a", 2035), ("b", 2035), ("a", 2045), ("b", 2045)]
+    ].tolist()
+    assert not obs.index.isin([("c", 2035), ("d", 2035), ("d", 2045)]).any()
+
+    # Existing values are unchanged
+    assert 7 == len(result.query("year_vtg in [2020, 2030, 2040]"))
+
+
 # NOTE This should work on IXMP4Backend already, but somehow, add_year() does not seem
 # to add years to scen_new. In assert_function(), this means that the filtered
 # `var_cost` is empty and .at[] fails.
 # TODO Experiment in a notebook why add_year() doesn't work.
 @pytest.mark.jdbc
-def test_add_year(base_scen_mp: tuple[Scenario, Platform]) -> None:
+@pytest.mark.parametrize("kwargs", [dict(), dict(workers=2), dict(chunk_rows=1)])
+def test_add_year(base_scen_mp: tuple[Scenario, Platform], kwargs: dict) -> None:
     scen_ref, test_mp = base_scen_mp
 
     # Adding new years
     scen_new = Scenario(
         test_mp, model="add_year", scenario="standard", version="new", annotation=" "
     )
-    add_year(scen_ref, scen_new, YEARS_NEW)
+    add_year(scen_ref, scen_new, YEARS_NEW, **kwargs)
     scen_new.solve(case="new_years", quiet=True)
 
     # Running the tests
     assert_function(scen_ref, scen_new, YEARS_NEW, yr_test=2025)
 
 
+@pytest.mark.jdbc
+def test_add_year_dry_run(base_scen_mp: tuple[Scenario, Platform]) -> None:
+    scen_ref, test_mp = base_scen_mp
+    scen_new = Scenario(
+        test_mp, model="add_year", scenario="standard", version="new", annotation=" "
+    )
+
+    result = add_year(scen_ref, scen_new, YEARS_NEW, dry_run=True)
+    assert result is not None
+
+    # Rows are estimated for each parameter, but nothing is added to `scen_new`
+    obs = result.set_index("parameter")
+    assert 3 == obs.at["technical_lifetime", "rows"]
+    assert 2 == obs.at["technical_lifetime", "rows_added"]
+    assert (obs["peak_memory"] > 0).all()
+    assert 0 == len(scen_new.set("year"))
+
+
 # NOTE This should work on IXMP4Backend already, but with version=None, we can't find a
 # default Run for scen_ref. Not sure if JDBC sets this as default before deletion
 # (if so, how?) or if it doesn't need a default to load a scen (in contrast to ixmp4).
@@ -162,6 +228,94 @@ def test_add_year_cli(
     r = message_ix_cli(*cmd, "--dry-run")
     assert r.exit_code == 0
 
+    # Same, except with --estimate
+    r = message_ix_cli(*cmd, "--estimate")
+    assert r.exit_code == 0, (r.output, r.exception)
+    assert "rows_added" in r.output
+
     # Bad usage: not giving the base scenario info
     r = message_ix_cli(*cmd[6:], "--dry-run")
     assert r.exit_code == 2
+
+
+def test_interpolate_2d() -> None:
+    horizon = [2020, 2030, 2040]
+    lifetime = {"tec": 10, "long": 20}
+    df = pd.DataFrame(
+        [
+            ["n", t, v, a, v / 10 + (a - v) / 100]
+            for t, lt in lifetime.items()
+            for v in horizon
+            for a in horizon
+            if v <= a < v + lt
+        ],
+        columns=["node_loc", "technology", "year_vtg", "year_act", "value"],
+    )
+    # technical_lifetime, as already extended to the new years by add_year()
+    par_tec = pd.DataFrame(
+        [["n", "long", v, 20.0, "y"] for v in horizon + [2025, 2035]],
+        columns=["node_loc", "technology", "year_vtg", "value", "unit"],
+    )
+
+    result = interpolate_2d(
+        df, [2025, 2035], horizon, "year_vtg", "year_act", ["long"], par_tec
+    )
+
+    obs = result.groupby(["technology", "year_vtg"])["year_act"].apply(sorted)
+    # Technologies without lifetime are only active in the vintage period
+    assert all([v] == obs["tec", v] for v in (2020, 2025, 2030, 2035, 2040))
+    # Values for new vintages are interpolated
+    value = result.set_index(["technology", "year_vtg", "year_act"])["value"]
+    assert 202.5 == pytest.approx(value["tec", 2025, 2025])
+    # Other technologies are active within their technical lifetime
+    assert [2020, 2025, 2030, 2035] == obs["long", 2020]
+    assert [2025, 2030, 2035, 2040] == obs["long", 2025]
+    assert [2035, 2040] == obs["long", 2035]
+
+
+@pytest.mark.parametrize("yrs_new", ([2025, 2035], [2035], [2050]))
+@pytest.mark.parametrize("extrapolate", (False, True))
+@pytest.mark.parametrize("by", (["technology"], ["technology", "mode"]))
+def test_interpolate_2d_partition(
+    yrs_new: list[int], extrapolate: bool, by: list[str]
+) -> None:
+    """Results are the same when technologies or modes are interpolated separately."""
+    horizon = [2020, 2030, 2040]
+    year_act = {
+        ("a", 2020): [2020, 2030, 2040],
+        ("a", 2030): [2030],
+        ("b", 2020): [2020, 2030, 2040],
+        ("b", 2030): [2030, 2040],
+        ("b", 2040): [2040],
+    }
+    # Other dimensions precede "year_vtg", as arranged by add_year()
+    df = pd.DataFrame(
+        [
+            ["n", t, m, v, a, i + v / 10 + (a - v) / 100]
+            for (t, v), years in year_act.items()
+            for i, m in enumerate(("m1", "m2"))
+            for a in years
+        ],
+        columns=["node_loc", "technology", "mode", "year_vtg", "year_act", "value"],
+    )
+    par_tec = pd.DataFrame(
+        [["n", t, v, 20.0, "y"] for t in "ab" for v in horizon + yrs_new],
+        columns=["node_loc", "technology", "year_vtg", "value", "unit"],
+    )
+
+    def func(data: pd.DataFrame) -> pd.DataFrame:
+        return interpolate_2d(
+            data,
+            yrs_new,
+            horizon,
+            "year_vtg",
+            "year_act",
+            ["a", "b"],
+            par_tec,
+            extrapolate=extrapolate,
+        )
+
+    dims = ["technology", "mode", "year_vtg", "year_act"]
+    exp = func(df).sort_values(dims).reset_index(drop=True)
+    obs = pd.concat([func(group) for _, group in df.groupby(by)])
+    pd.testing.assert_frame_equal(exp, obs.sort_values(dims).reset_index(drop=True))
@@ -0,0 +1,115 @@
+"""Tests of :mod:`message_ix.tools.aggregate`."""
+
+import pytest
+from ixmp import Platform
+
+from message_ix.testing import make_dantzig, make_subannual, make_westeros
+from message_ix.tools.aggregate import aggregate_nodes, aggregate_time, coarsen_horizon
+
+
+def test_coarsen_horizon(request: pytest.FixtureRequest, test_mp: Platform) -> None:
+    base = make_westeros(test_mp, request=request)
+
+    with pytest.raises(ValueError, match=r"Target year\(s\) \[715\] not in set"):
+        coarsen_horizon(base, [715, 720])
+
+    s = coarsen_horizon(base, [720])
+    assert f"{base.scenario} coarsened" == s.scenario
+
+    # Periods up to the first model year are kept; 710 and 720 are merged
+    assert [680, 690, 700, 720] == list(map(int, s.set("year")))
+    assert 700 == s.firstmodelyear
+    dp = s.par("duration_period").set_index("year")["value"]
+    assert 20 == dp[720]
+    assert dp.sum() == base.par("duration_period")["value"].sum()
+
+    # Parameters are averaged over the merged periods
+    def _demand(scenario):
+        return scenario.par("demand").set_index("year")["value"]
+
+    assert _demand(base)[[710, 720]].mean() == pytest.approx(_demand(s)[720])
+    assert _demand(base)[700] == _demand(s)[700]
+
+    # Vintages are mapped consistently with periods of activity
+    vc = s.par("var_cost")
+    assert set(vc["year_vtg"]) <= {680, 690, 700, 720}
+    assert (vc["year_act"] >= vc["year_vtg"]).all()
+
+    # The new scenario solves
+    s.solve(quiet=True)
+    assert s.has_solution()
+
+
+def test_aggregate_time(request: pytest.FixtureRequest, test_mp: Platform) -> None:
+    times = ["spring", "summer", "autumn", "winter"]
+    base = make_subannual(
+        test_mp,
+        {"gas_ppl": {"time_origin": [], "time": times, "time_dest": times}},
+        time_steps=[
+            (h, d, "season", "year") for h, d in zip(times, [0.2, 0.3, 0.2, 0.3])
+        ],
+        demand=dict(zip(times, [1.0, 2.0, 1.0, 3.0])),
+        capacity_factor={"gas_ppl": dict(zip(times, [0.5, 1.0, 0.5, 1.0]))},
+        request=request,
+    )
+
+    with pytest.raises(ValueError, match="exactly one"):
+        aggregate_time(base)
+    with pytest.raises(ValueError, match=r"Time slice\(s\) \['foo'\] not in"):
+        aggregate_time(base, {"foo": "bar"})
+
+    mapping = {"spring": "warm", "summer": "warm", "autumn": "cold", "winter": "cold"}
+    s = aggregate_time(base, mapping)
+
+    assert {"year", "warm", "cold"} == set(s.set("time"))
+    assert {("season", "warm", "year"), ("season", "cold", "year")} <= set(
+        s.set("map_temporal_hierarchy").itertuples(index=False, name=None)
+    )
+
+    # Durations and demand are summed; capacity factors are weighted averages
+    def _values(name):
+        return s.par(name).set_index("time")["value"]
+
+    assert 0.5 == pytest.approx(_values("duration_time")["warm"])
+    assert {"warm": 3.0, "cold": 4.0} == _values("demand").to_dict()
+    assert (0.5 * 0.2 + 1.0 * 0.3) / 0.5 == pytest.approx(
+        _values("capacity_factor")["warm"]
+    )
+    assert {"warm", "cold"} == set(s.par("output")["time_dest"])
+
+    s.solve(quiet=True)
+    assert s.has_solution()
+
+    # Merge all time slices into "year"
+    s = aggregate_time(base, level="year", name=f"{base.scenario} annual")
+    assert {"year"} == set(s.set("time"))
+    assert 7.0 == s.par("demand")["value"].sum()
+
+
+def test_aggregate_nodes(request: pytest.FixtureRequest, test_mp: Platform) -> None:
+    base = make_dantzig(test_mp, request=request)
+
+    with pytest.raises(ValueError, match=r"Node\(s\) \['foo'\] not in"):
+        aggregate_nodes(base, {"foo": "bar"})
+
+    mapping = {"seattle": "west", "san-diego": "west"}
+    s = aggregate_nodes(base, mapping, weights={"seattle": 1.0, "san-diego": 3.0})
+    assert f"{base.scenario} aggregated" == s.scenario
+
+    assert {"west", "new-york", "chicago", "topeka"} <= set(s.set("node"))
+    assert not {"seattle", "san-diego"} & set(s.set("node"))
+
+    # Upper bounds given for all merged nodes are summed
+    bau = s.par("bound_activity_up").set_index("node_loc")["value"]
+    assert {"west": 950.0} == bau.to_dict()
+
+    # Other parameters are weighted averages
+    vc = s.par("var_cost").set_index(["technology", "mode"])["value"]
+    assert 0.225 == pytest.approx(vc["transport_from_seattle", "to_new-york"])
+    assert {"west"} == set(s.par("input")["node_origin"])
+
+    # Demand is unchanged
+    assert 900 == s.par("demand")["value"].sum()
+
+    s.solve(quiet=True)
+    assert s.has_solution()
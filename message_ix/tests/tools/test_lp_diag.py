@@ -1,10 +1,18 @@
+import json
+import sys
 from collections.abc import Callable
 from pathlib import Path
 
+import click
+import numpy as np
+import pandas as pd
 import pytest
 from click.testing import Result
+from scipy import sparse
 
+import message_ix.tools.lp_diag
 from message_ix.tools.lp_diag import LPdiag
+from message_ix.tools.lp_diag.cli import main
 
 
 def test_cli(
@@ -26,11 +34,55 @@ def test_cli(
     assert outp.exists()
     assert "Reading MPS-format file" in outp.read_text()
 
+    # Structured output
+    args = ("lp-diag", "--wdir", p, "--mps", "diet.mps")
+    outp = tmp_path.joinpath("diet_output.json")
+    result = message_ix_cli(*args, "--format=json", "--outp", str(outp))
+    assert 0 == result.exit_code, result.output
+    assert {"info", "magnitudes", "outliers"} < set(json.loads(outp.read_text()))
+
+    # --format=parquet without --outp
+    result = message_ix_cli("lp-diag", "--wdir", p, "--format=parquet")
+    assert 2 == result.exit_code
+
     # Invalid --wdir
     result = message_ix_cli("lp-diag", "--wdir", "/surely this dir cannot/exist/")
     assert 2 == result.exit_code
     assert "Path '/surely this dir cannot/exist/' does not exist" in result.output
 
+    # Comparison of two files
+    result = message_ix_cli("lp-diag", "--wdir", p, "--diff", "diet.mps", "lotfi.mps")
+    assert 0 == result.exit_code, result.output
+    assert "rows added: " in result.output
+
+    outp = tmp_path.joinpath("diff.json")
+    result = message_ix_cli(
+        "lp-diag",
+        "--wdir",
+        p,
+        "--diff",
+        "diet.mps",
+        "diet.mps",
+        "--format=json",
+        "--outp",
+        str(outp),
+    )
+    assert 0 == result.exit_code, result.output
+    assert 0 == json.loads(outp.read_text())["info"]["n_coeffs_changed"]
+
+    # stdout and the working directory are restored after an error
+    stdout, cwd = sys.stdout, Path.cwd()
+    for extra in (("--mps", "missing.mps"), ("--diff", "diet.mps", "missing.mps")):
+        with pytest.raises(click.ClickException, match="missing.mps not accessible"):
+            main.main(["--wdir", p, "--format=json", *extra], standalone_mode=False)
+        assert stdout is sys.stdout and cwd == Path.cwd()
+
+    pytest.importorskip("pyarrow")
+    outp = tmp_path.joinpath("diet_output")
+    result = message_ix_cli(*args, "--format=parquet", "--outp", str(outp))
+    assert 0 == result.exit_code, result.output
+    assert outp.joinpath("rows.parquet").exists()
+
 
 def test_aez(test_data_path: Path) -> None:
     """Test reading of aez.mps file
@@ -253,3 +305,273 @@ def test_lpdiag_locate_outliers(test_data_path: Path) -> None:
     # The function doesn't return anything, so we can only ...
     # Check that the matrix has the correct shape
     assert lp.mat.shape == (1086, 5)
+
+
+def test_lpdiag_sparse(test_data_path: Path) -> None:
+    """Test the sparse representation and per-row/col statistics."""
+    lp = LPdiag()
+    lp.read_mps(test_data_path.joinpath("lp_diag", "jg_korh.mps"))
+
+    # Sparse matrices have the same shape and number of non-zeros as the LP
+    assert (4, 3) == lp.csr.shape == lp.csc.shape
+    assert 10 == lp.csr.nnz == lp.csc.nnz
+
+    # Statistics agree with the coefficients in the data frame
+    for seq_id, stats in (("row", lp.row_stats), ("col", lp.col_stats)):
+        expected = lp.mat.groupby(seq_id)["abs_val"].agg(["count", "min", "max"])
+        assert (expected["count"] == stats["nnz"]).all()
+        assert np.allclose(expected["min"], stats["min_abs"])
+        assert np.allclose(expected["max"], stats["max_abs"])
+
+    # Bounds are stored as arrays, with infinite bounds represented by ±inf
+    assert len(lp.row_names) == len(lp.row_lo) == len(lp.row_up) == 4
+    assert len(lp.col_names) == len(lp.col_lo) == len(lp.col_up) == 3
+    assert np.isneginf(lp.row_lo[lp.gf_seq]) and np.isposinf(lp.row_up[lp.gf_seq])
+
+    # Number of coefficients by magnitude
+    assert 10 == lp.magnitudes().sum()
+
+
+@pytest.mark.parametrize("method", ("geometric", "equilibration"))
+def test_lpdiag_scaling(test_data_path: Path, method: str) -> None:
+    """Test scale factors and their aggregation by family."""
+    lp = LPdiag()
+    lp.read_mps(test_data_path.joinpath("lp_diag", "aez.mps"))
+
+    r, c = lp.scale_factors(method)
+    assert (lp.csr.shape[0],) == r.shape and (lp.csr.shape[1],) == c.shape
+
+    # Scaling reduces the range of magnitudes of the coefficients
+    scaled = abs(sparse.diags_array(r) @ lp.csr @ sparse.diags_array(c)).data
+    abs_val = lp.mat["abs_val"]
+    assert scaled.max() / scaled.min() < abs_val.max() / abs_val.min()
+    if method == "equilibration":
+        assert np.isclose(1.0, scaled.max())
+
+    # Factors are aggregated by family; the rows of aez.mps are named CRV…, OBJ…, ROW…
+    df = lp.scaling_by_family(r)
+    assert {"CRV", "OBJ", "ROW"} == set(df.index)
+    assert len(r) == df["count"].sum()
+
+    # Function runs
+    lp.print_scaling(method)
+
+    # …also without nonzero coefficients
+    lp.csr = sparse.csr_array(lp.csr.shape)
+    r, c = lp.scale_factors(method)
+    assert np.all(r == 1) and np.all(c == 1)
+    lp.print_scaling(method)
+
+    with pytest.raises(ValueError, match="Unknown scaling method"):
+        lp.scale_factors("foo")
+
+
+def test_lpdiag_entity_names() -> None:
+    lp = LPdiag()
+    lp.row_names = np.array(
+        ["COMMODITY_BALANCE_GT(World,coal,secondary,700,year)", "R0001", "e12"]
+    )
+
+    result = lp.entity_names()
+    assert ["COMMODITY_BALANCE_GT", "R", "e"] == result["family"].tolist()
+    assert ("World", "coal", "secondary", "700", "year") == result["index"][0]
+    assert () == result["index"][1]
+
+    # Aggregation by family and the second index element
+    df = lp.scaling_by_family(np.array([10.0, 1.0, 0.01]), idx=(1,))
+    assert 1 == df.loc[("COMMODITY_BALANCE_GT", "coal"), "suggested"]
+    assert -2 == df.loc[("e", ""), "suggested"]
+
+
+MPS_CONVERT = """NAME          convert
+ROWS
+ N  obj
+ E  e1
+ L  e2
+ G  e3
+COLUMNS
+    x1        obj       1.0          e1        1.0
+    x2        e1        -1.0         e2        1e-08
+    x3        e2        1.0          e3        2.0
+    x4        e3        1e7
+RHS
+    rhs       e2        10.0         e3        1.0
+BOUNDS
+ UP bnd       x2        100.0
+ENDATA
+"""
+
+DICT_CONVERT = """Dictionary written by CONVERT
+
+Equations 1 to 3
+  e1  COST_ACCOUNTING_NODAL(World,700)
+  e2  CAPACITY_CONSTRAINT(World,coal_ppl,690,700,year)
+  e3  CAPACITY_CONSTRAINT(World,wind_ppl,700,700,year)
+
+Variables 1 to 4
+  x1  OBJ
+  x2  COST_NODAL(World,700)
+  x3  ACT(World,coal_ppl,690,700,standard,year)
+  x4  ACT(World,wind_ppl,700,700,standard,year)
+"""
+
+
+def test_lpdiag_families(tmp_path: Path) -> None:
+    """Test decoding of names and statistics by MESSAGE equation/variable family."""
+    tmp_path.joinpath("convert.mps").write_text(MPS_CONVERT)
+    tmp_path.joinpath("dict.txt").write_text(DICT_CONVERT)
+
+    lp = LPdiag()
+    lp.read_mps(tmp_path.joinpath("convert.mps"))
+    lp.read_dict(tmp_path.joinpath("dict.txt"))
+    assert 7 == len(lp.names_map)
+
+    # Names are decoded and labelled with MESSAGE dimensions
+    rows = lp.entity_dims()
+    assert ["obj", "COST_ACCOUNTING_NODAL", "CAPACITY_CONSTRAINT"] == list(
+        rows["family"].unique()
+    )
+    assert ["coal_ppl", "wind_ppl"] == rows["inv_tec"].dropna().tolist()
+    cols = lp.entity_dims(by_row=False)
+    assert ["690", "700"] == cols["year_vtg"].dropna().tolist()
+
+    # Statistics by family
+    df = lp.family_stats(by_row=False, lo_tail=-7, up_tail=6)
+    assert 2 == df.loc["ACT", "count"]
+    assert 1 == df.loc["COST_NODAL", "n_lo"] == df.loc["ACT", "n_up"]
+    assert 100.0 == df.loc["COST_NODAL", "up_max"]
+
+    # …and by family and dimension
+    df = lp.family_stats(dims=("inv_tec",))
+    assert 2 == len(df.loc["CAPACITY_CONSTRAINT"])
+    assert 1 == df.loc[("CAPACITY_CONSTRAINT", "coal_ppl"), "n_lo"]
+
+    # Outliers with the families of their rows and columns
+    df = lp.outliers(small=False, thresh=6)
+    assert [("CAPACITY_CONSTRAINT", "ACT")] == list(
+        zip(df["row_family"], df["col_family"])
+    )
+
+
+def test_lpdiag_result(tmp_path: Path, test_data_path: Path) -> None:
+    """Test structured output."""
+    lp = LPdiag()
+    lp.read_mps(test_data_path.joinpath("lp_diag", "lotfi.mps"))
+
+    result = lp.result(lo_tail=-1, up_tail=2)
+    assert 1086 == result.info["nnz"] == result.magnitudes["count"].sum()
+    assert {"lo", "up"} == set(result.outliers["tail"])
+    assert (154, 308) == (len(result.rows), len(result.cols))
+    assert 8 == len(result.objective)
+
+    # JSON output; infinite bounds are represented by null
+    data = json.loads(result.to_json())
+    assert data["rows"][lp.gf_seq]["lo"] is None
+    result.to_json(tmp_path.joinpath("lotfi.json"))
+    assert tmp_path.joinpath("lotfi.json").exists()
+
+    # Parquet output
+    pytest.importorskip("pyarrow")
+    result.to_parquet(tmp_path.joinpath("lotfi"))
+    df = pd.read_parquet(tmp_path.joinpath("lotfi", "outliers.parquet"))
+    assert len(result.outliers) == len(df)
+
+
+MPS_DUPLICATES = """NAME          duplicates
+ROWS
+ N  obj
+ L  r1
+ L  r2
+ L  r3
+ G  r4
+COLUMNS
+    c1        obj       1.0          r1        1.0
+    c1        r2        2.0          r3        0.1
+    c2        obj       1.0          r1        1.0
+    c2        r2        2.0          r3        0.1
+    c3        r1        3.0          r2        6.0
+    c3        r3        0.3          r4        1.0
+    c4        r1        -2.0         r2        1.0
+RHS
+    rhs       r1        10.0         r2        20.0
+ENDATA
+"""
+
+
+@pytest.mark.parametrize("collide", (False, True))
+def test_lpdiag_duplicates(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, collide: bool
+) -> None:
+    """Test detection of identical and proportional rows and columns."""
+    tmp_path.joinpath("duplicates.mps").write_text(MPS_DUPLICATES)
+    lp = LPdiag()
+    lp.read_mps(tmp_path.joinpath("duplicates.mps"))
+
+    if collide:
+        # All entities with the same number of non-zeros have the same hashes; results
+        # are unchanged
+        monkeypatch.setattr(message_ix.tools.lp_diag, "_mix", np.zeros_like)
+
+    # c1 and c2 are identical; c3 is not proportional to either, because of r4
+    df = lp.duplicates(by_row=False)
+    assert ["c1", "c2"] == df["name"].tolist()
+    assert [1.0, 1.0] == df["factor"].tolist()
+
+    # r1, r2, and r3 are proportional except for the coefficients of c4
+    assert lp.duplicates().empty
+
+    lp.print_duplicates(by_row=False)
+
+    # Remove c4 and r4 from the matrix
+    lp.csr = lp.csr[:4, :3]
+    lp.csc = lp.csr.tocsc()
+    df = lp.duplicates()
+    assert {"r1", "r2", "r3"} == set(df["name"])
+    assert np.allclose([1.0, 2.0, 0.1], df["factor"])
+    assert lp.duplicates(proportional=False).empty
+
+
+def test_lpdiag_compare(tmp_path: Path) -> None:
+    """Test comparison of two LPs."""
+    a = tmp_path.joinpath("a.mps")
+    a.write_text(MPS_DUPLICATES)
+    # Add row r5 and column c5; move c4 from r2 to r5; change a coefficient and a RHS
+    b = tmp_path.joinpath("b.mps")
+    b.write_text(
+        MPS_DUPLICATES.replace(" G  r4\n", " G  r4\n E  r5\n")
+        .replace("r2        1.0\n", "r5        1.0\n    c5        r1        1.0\n")
+        .replace("c1        r2        2.0", "c1        r2        20.0")
+        .replace("r1        10.0", "r1        11.0")
+    )
+    lp_a, lp_b = LPdiag(), LPdiag()
+    lp_a.read_mps(a)
+    lp_b.read_mps(b)
+
+    diff = lp_a.compare(lp_b)
+    assert dict(
+        n_rows_added=1,
+        n_rows_removed=0,
+        n_rows_bounds_changed=1,
+        n_cols_added=1,
+        n_cols_removed=0,
+        n_cols_bounds_changed=0,
+        n_coeffs_added=2,
+        n_coeffs_removed=1,
+        n_coeffs_changed=1,
+    ) == {k: v for k, v in diff.info.items() if k.startswith("n_")}
+    assert {("row", "r5"), ("col", "c5")} == set(
+        zip(diff.entities["kind"], diff.entities["name"])
+    )
+    changed = diff.coefficients.query("status == 'changed'").iloc[0]
+    assert ("r2", "c1", 1.0) == tuple(changed[["row_name", "col_name", "log_delta"]])
+    assert 11.0 == diff.bounds.loc[0, "up_b"]
+
+    # Removed entities are reported in the opposite direction
+    diff = lp_b.compare(lp_a)
+    assert {"removed"} == set(diff.entities["status"])
+
+    # Identical LPs have no differences
+    diff = lp_a.compare(lp_a)
+    assert 0 == sum(v for k, v in diff.info.items() if k.startswith("n_"))
+
+    lp_a.print_compare(lp_b)
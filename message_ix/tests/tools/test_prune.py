@@ -0,0 +1,86 @@
+"""Tests of :mod:`message_ix.tools.prune`."""
+
+import pytest
+from ixmp import Platform
+
+from message_ix import make_df
+from message_ix.testing import make_dantzig
+from message_ix.tools.prune import COLUMNS, find_unreachable, prune
+
+
+def test_prune(request: pytest.FixtureRequest, test_mp: Platform) -> None:
+    s = make_dantzig(test_mp, request=request)
+
+    # No unreachable technologies in the base scenario
+    assert find_unreachable(s).empty
+
+    common = dict(
+        node_loc="seattle",
+        year_vtg=1963,
+        year_act=1963,
+        mode="production",
+        time="year",
+        unit="case",
+    )
+    with s.transact():
+        s.add_set("commodity", ["junk", "unobtainium"])
+        s.add_set("technology", ["waste", "magic"])
+        # Output of a commodity that is never demanded
+        s.add_par(
+            "output",
+            make_df(
+                "output",
+                **common,
+                technology=["waste", "magic"],
+                node_dest="seattle",
+                commodity=["junk", "cases"],
+                level="supply",
+                time_dest="year",
+                value=1.0,
+            ),
+        )
+        # Input of a commodity that is never produced
+        s.add_par(
+            "input",
+            make_df(
+                "input",
+                **common,
+                technology="magic",
+                node_origin="seattle",
+                commodity="unobtainium",
+                level="supply",
+                time_origin="year",
+                value=1.0,
+            ),
+        )
+        s.add_par(
+            "var_cost", make_df("var_cost", **common, technology="waste", value=1.0)
+        )
+
+    obs = find_unreachable(s)
+    assert COLUMNS == list(obs.columns)
+    assert {
+        ("seattle", "magic", "no supply"),
+        ("seattle", "waste", "no demand"),
+    } == set(obs.itertuples(index=False, name=None))
+
+    # Technologies with a lower bound on activity are not pruned
+    with s.transact():
+        s.add_par(
+            "bound_activity_lo",
+            make_df("bound_activity_lo", **common, technology="waste", value=1.0),
+        )
+    assert ["magic"] == find_unreachable(s)["technology"].tolist()
+
+    # Data for pruned technologies are removed
+    result = prune(s)
+    assert ["magic"] == result["technology"].tolist()
+    for name in "input", "output":
+        assert "magic" not in set(s.par(name)["technology"])
+    assert "waste" in set(s.par("var_cost")["technology"])
+    assert find_unreachable(s).empty
+
+    # Scenario with a solution cannot be pruned
+    s.solve(quiet=True)
+    with pytest.raises(ValueError, match="has a solution"):
+        prune(s)
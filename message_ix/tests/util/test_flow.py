@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from message_ix import make_df
+from message_ix.util.flow import EDGE_COLUMNS, FlowGraph
+
+
+@pytest.fixture(scope="module")
+def graph() -> FlowGraph:
+    """Graph with resource → coal_ppl → electricity → bulb → light, and wind_ppl."""
+    common = dict(node_loc="R1", node_origin="R1", node_dest="R1", mode="M", value=1.0)
+    input = make_df(
+        "input",
+        **common,
+        technology=["coal_ppl", "bulb", "export"],
+        commodity=["coal", "electricity", "electricity"],
+        level=["resource", "secondary", "secondary"],
+    )
+    output = make_df(
+        "output",
+        **common,
+        technology=["coal_ppl", "wind_ppl", "bulb", "export"],
+        commodity=["electricity", "electricity", "light", "electricity"],
+        level=["secondary", "secondary", "useful", "secondary"],
+    )
+    # Export to another node
+    output.loc[3, "node_dest"] = "R2"
+    # Negative input of a technology that is not connected to others
+    input_cap = make_df(
+        "input_cap",
+        node_loc="R1",
+        node_origin="R1",
+        technology="recycle",
+        commodity="steel",
+        level="final",
+        value=-1.0,
+    )
+    return FlowGraph.from_data(
+        dict(input=input, output=output, input_cap=input_cap, other=pd.DataFrame())
+    )
+
+
+def test_flow_graph(graph: FlowGraph) -> None:
+    assert EDGE_COLUMNS == list(graph.edges.columns)
+    assert (5, 5, 8) == (len(graph.flows), len(graph.technologies), len(graph.edges))
+    assert "<FlowGraph: 5 flows, 5 technologies, 8 edges>" == repr(graph)
+    assert (10, 10) == graph.matrix.shape
+
+    # Negative value reverses the direction of the edge
+    assert "output" == graph.edges.query("technology == 'recycle'")["direction"].item()
+
+    # Upstream and downstream technologies
+    obs = graph.upstream(commodity="electricity", level="secondary", node="R1")
+    assert {"coal_ppl", "wind_ppl"} == set(obs["technology"])
+    obs = graph.upstream(commodity="electricity", level="secondary")
+    assert {"coal_ppl", "wind_ppl", "export"} == set(obs["technology"])
+    obs = graph.downstream(commodity="electricity", level="secondary")
+    assert {"bulb", "export"} == set(obs["technology"])
+    assert ["node", "commodity", "level", "node_loc", "technology"] == list(obs.columns)
+
+    # Vectorized over multiple flows
+    obs = graph.downstream(level=["resource", "secondary"])
+    assert {"coal_ppl", "bulb", "export"} == set(obs["technology"])
+
+    with pytest.raises(ValueError, match="Invalid filter"):
+        graph.upstream(technology="bulb")
+
+    # Reachability
+    i = graph.flow_index(level="resource")
+    reached = graph.vertices(np.flatnonzero(graph.reachable(i)))
+    assert {"coal_ppl", "bulb", "export"} == set(reached["technology"].dropna())
+    assert "wind_ppl" not in set(reached["technology"].dropna())
+
+    # Paths from resource to demand
+    demand = pd.DataFrame(
+        [["R1", "light", "useful"]], columns=["node", "commodity", "level"]
+    )
+    sub = graph.paths(i, graph.flow_index(demand))
+    assert {("R1", "coal_ppl"), ("R1", "bulb")} == set(sub.technologies)
+    assert 4 == len(sub.edges)
+
+    # Per-node subgraph
+    assert 0 == len(graph.subgraph("R2").technologies)
+    assert 5 == len(graph.subgraph(["R1"]).technologies)
+    assert ("R2", "electricity", "secondary") in graph.subgraph("R1").flows
+
+    # Technology index
+    assert [len(graph.flows)] == graph.technology_index(technology="coal_ppl").tolist()
+
+
+def test_sankey_mapping(graph: FlowGraph) -> None:
+    obs = graph.sankey_mapping("R1")
+    assert ("resource|coal", "coal_ppl|M") == obs["in|resource|coal|coal_ppl|M"]
+    assert ("bulb|M", "useful|light") == obs["out|useful|light|bulb|M"]
+    # Flows of input_cap etc. are not included
+    assert 7 == len(obs)
+    assert {} == graph.sankey_mapping("R2")
@@ -0,0 +1,29 @@
+import pytest
+from ixmp import Platform
+
+from message_ix.testing import make_dantzig
+from message_ix.util.size import COLUMNS
+
+
+def test_estimate_size(test_mp: Platform, request: pytest.FixtureRequest) -> None:
+    scen = make_dantzig(test_mp, request=request)
+
+    result = scen.estimate_size()
+
+    assert COLUMNS == list(result.columns)
+    obs = result.set_index("name")
+
+    # 2 production + 6 transport modes, each in the single model period
+    assert 8 == obs.loc["ACT", "count"]
+    # No technologies with investment costs
+    assert 0 == obs.loc["CAP", "count"] == obs.loc["CAP_NEW", "count"]
+    # Balances at 2 supply and 3 consumption nodes
+    assert 5 == obs.loc["COMMODITY_BALANCE_AUX", "count"]
+    # …with 1 coefficient each for 6 inputs and 8 outputs
+    assert 5 + 6 + 8 == obs.loc["COMMODITY_BALANCE_AUX", "nnz"]
+    # Upper bounds on production at 2 nodes
+    assert 2 == obs.loc["ACTIVITY_BOUND_UP", "count"]
+
+    # Non-zeros are only given for equations
+    assert result.query("type == 'var'")["nnz"].isna().all()
+    assert result.query("type == 'equ'")["nnz"].notna().all()
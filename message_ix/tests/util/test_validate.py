@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from ixmp import Platform
+
+from message_ix import Scenario, make_df
+from message_ix.testing import make_dantzig
+from message_ix.util.validate import CHECKS, validate
+
+
+@pytest.fixture
+def scen(test_mp: Platform, request: pytest.FixtureRequest) -> Scenario:
+    return make_dantzig(test_mp, request=request)
+
+
+def test_validate(scen: Scenario) -> None:
+    # Unmodified scenario has no issues
+    result = scen.validate()
+    assert result.ok and 0 == len(result.issues)
+    assert list(CHECKS) == result.checks
+
+    with scen.transact():
+        # Investment costs for a technology with no technical_lifetime
+        scen.add_par(
+            "inv_cost",
+            make_df(
+                "inv_cost",
+                node_loc="seattle",
+                technology="canning_plant",
+                year_vtg=1963,
+                value=1.0,
+                unit="USD",
+            ),
+        )
+        # Output in a period before the vintage
+        output = scen.par("output", filters={"technology": "canning_plant"})
+        scen.add_par("output", output.assign(year_act=1962))
+        # Historical activity in the first model year
+        scen.add_par(
+            "historical_activity",
+            make_df(
+                "historical_activity",
+                node_loc="seattle",
+                technology="canning_plant",
+                year_act=[1962, 1963],
+                mode="production",
+                time="year",
+                value=1.0,
+                unit="case",
+            ),
+        )
+
+    result = validate(scen)
+
+    # Only warnings
+    assert result.ok
+    assert {"horizon", "technical_lifetime", "year_order"} == {
+        i.check for i in result.issues
+    }
+    obs = result.to_frame().set_index("check")["count"]
+    assert 1 == obs["horizon"]
+    # canning_plant has output but no input: one issue, for one (node_loc, technology,
+    # year_vtg)
+    assert 1 == obs["technical_lifetime"]
+    assert 2 == obs["year_order"]
+
+    # Checks for warnings are skipped with level="error"
+    result = scen.validate(level="error")
+    assert result.ok and 0 == len(result.issues)
+    assert "year_order" not in result.checks
+
+    with pytest.raises(ValueError, match="level='info'"):
+        scen.validate(level="info")  # type: ignore [arg-type]
+
+
+def test_validate_resource_volume(scen: Scenario) -> None:
+    # Treat the "supply" level as a resource, without any resource_volume
+    with scen.transact():
+        scen.add_set("level_resource", "supply")
+
+    result = scen.validate(level="error")
+
+    assert not result.ok
+    (issue,) = result.issues
+    assert ("resource_volume", "error", "input") == (
+        issue.check,
+        issue.severity,
+        issue.item,
+    )
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(
+            [["san-diego", "cases"], ["seattle", "cases"]],
+            columns=["node_loc", "commodity"],
+        ),
+        issue.data.sort_values("node_loc").reset_index(drop=True),
+    )
+    assert "without resource_volume for any grade: 'cases'" in str(result)
+
+    # Solving with validation raises an exception before GAMS is run
+    with pytest.raises(ValueError, match="failed validation"):
+        scen.solve(validate=True)
@@ -12,15 +12,25 @@
 
 # %% I) Importing required packages
 import logging
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import get_context
 from typing import Literal
 
 import numpy as np
 import pandas as pd
+from ixmp.util import maybe_check_out, maybe_commit
 
 from message_ix import Scenario
 
 log = logging.getLogger(__name__)
 
+#: Number of tables with 1 column per period held at once while interpolating, used by
+#: :func:`estimate`.
+_COPIES = 4
+
 
 # %% II) Utility functions for dataframe manupulation
 def intpol(
@@ -76,17 +86,6 @@ def slice_df(
     return df.set_index(idx)
 
 
-def mask_df(df: pd.DataFrame, index: tuple[int | str, ...], count: int, value) -> None:
-    """Create a mask for removing extra values from *df*."""
-    df.loc[
-        index,
-        df.columns
-        > (df.loc[[index], :].notnull().cumsum(axis=1) == count)
-        .idxmax(axis=1)
-        .values[0],
-    ] = value
-
-
 def unit_uniform(df: pd.DataFrame) -> pd.DataFrame:
     """Make units in *df* uniform."""
     column = [x for x in df.columns if x in ["commodity", "emission"]]
@@ -118,7 +117,10 @@ def add_year(
     unit_check: bool = True,
     extrapol_neg: float | None = None,
     bound_extend: bool = True,
-) -> None:
+    workers: int = 1,
+    chunk_rows: int | None = None,
+    dry_run: bool = False,
+) -> pd.DataFrame | None:
     """Add years to *sc_ref* to produce *sc_new*.
 
     :meth:`add_year` does the following:
@@ -155,10 +157,33 @@ def add_year(
         Duplicate data from the previous timestep when there is only one data
         point for interpolation (e.g., permitting the extension of a bound to
         2025, when there is only one value in 2020).
+    workers: int
+        Number of processes used to add years to parameters. If more than 1, data
+        are read from *sc_ref* and written to *sc_new* in this process, in the same
+        order as with 1 worker; interpolation runs in a pool of `workers` processes.
+    chunk_rows: int, optional
+        Streaming mode for large scenarios. Parameters with both a node and a
+        "technology" dimension are read from *sc_ref* for one node at a time, split
+        into partitions of whole technologies with at most about `chunk_rows` rows,
+        and the data for each partition is written to *sc_new* as soon as it is
+        ready. Memory use then depends on `chunk_rows` and `workers` rather than on
+        the size of the largest parameter: at most `workers` partitions are read and
+        not yet written at any time. The result is the same as without `chunk_rows`.
+    dry_run: bool
+        If :obj:`True`, do not modify *sc_new*; only read *sc_ref* and return an
+        estimate of the work to be done. See :func:`estimate`.
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        If `dry_run` is :obj:`True`, the result of :func:`estimate`.
     """
-    # III.A) Adding sets and required modifications
     years_new = sorted([x for x in years_new if str(x) not in set(sc_ref.set("year"))])
-    add_year_set(sc_ref, sc_new, years_new, firstyear_new, lastyear_new, baseyear_macro)
+    if not dry_run:
+        # III.A) Adding sets and required modifications
+        add_year_set(
+            sc_ref, sc_new, years_new, firstyear_new, lastyear_new, baseyear_macro
+        )
     # -------------------------------------------------------------------------
     # III.B)  Adding parameters and calculating the missing values for the
     # additonal years
@@ -217,6 +242,16 @@ def add_year(
         ]
         par_list = [x for x in par_list if x not in par_macro]
 
+    if dry_run:
+        return estimate(
+            sc_ref,
+            years_new,
+            par_list,
+            reg_list,
+            firstyear_new or sc_ref.firstmodelyear,
+            chunk_rows,
+        )
+
     cat_year_new: pd.DataFrame = sc_new.set("cat_year")
     firstmodelyear_new = cat_year_new.query("type_year == 'firstmodelyear'")
     firstyr_new: int = (
@@ -232,55 +267,65 @@ def add_year(
         min(cat_year_ref["year"]) if firstmodelyear_ref.empty else firstyr_new
     )
 
-    for parname in par_list:
-        # For historical parameters extrapolation permitted (e.g., from
-        # 2010 to 2015)
-        extrapol = (
-            True if "historical" in parname or firstyr_ref > firstyr_new else False
-        )
-        yrs_new = (
-            [x for x in years_new if x < firstyr_new]
-            if "historical" in parname
-            else years_new
-        )
+    info = _info(sc_ref, sc_new, firstyr_new)
+
+    # All parameters are written in a single transaction
+    pending: deque[tuple[str, list[Future]]] = deque()
+    with (
+        _pool(workers) as pool,
+        sc_new.transact(f"Add years {years_new} to parameters"),
+    ):
+        for i, parname in enumerate(par_list, start=1):
+            log.info(f"Parameter {i}/{len(par_list)}: {parname}")
+
+            # For historical parameters extrapolation permitted (e.g., from
+            # 2010 to 2015)
+            extrapol = (
+                True if "historical" in parname or firstyr_ref > firstyr_new else False
+            )
+            yrs_new = (
+                [x for x in years_new if x < firstyr_new]
+                if "historical" in parname
+                else years_new
+            )
 
-        bound_ext = bound_extend if "bound" in parname else True
-
-        year_list = [x for x in sc_ref.idx_sets(parname) if "year" in x]
-
-        if len(year_list) == 2 or parname in ["land_output"]:
-            # The loop over "node" is only for reducing the size of tables
-            for node in reg_list:
-                add_year_par(
-                    sc_ref,
-                    sc_new,
-                    yrs_new,
-                    parname,
-                    [node],
-                    firstyr_new,
-                    extrapol,
-                    rewrite,
-                    unit_check,
-                    extrapol_neg,
-                    bound_ext,
-                )
-        else:
-            add_year_par(
+            bound_ext = bound_extend if "bound" in parname else True
+
+            tasks = _prepare_par(
                 sc_ref,
                 sc_new,
                 yrs_new,
                 parname,
                 reg_list,
-                firstyr_new,
                 extrapol,
                 rewrite,
                 unit_check,
                 extrapol_neg,
                 bound_ext,
+                info,
+                chunk_rows,
             )
 
+            if pool is None or parname == "technical_lifetime":
+                # Other parameters read technical_lifetime from `sc_new`
+                _flush(sc_new, pending, 0)
+                # Write the data for each chunk as soon as it is ready
+                for t in tasks:
+                    _write_par(sc_new, parname, [_add_year_data(**t)])
+            else:
+                futures = (pool.submit(_add_year_data, **_detach(t)) for t in tasks)
+                # Limit the number of parameters held in memory; with `chunk_rows`,
+                # the number of partitions
+                groups = ([f] for f in futures) if chunk_rows else [list(futures)]
+                for group in groups:
+                    pending.append((parname, group))
+                    _flush(sc_new, pending, workers)
+
+        _flush(sc_new, pending, 0)
+
     sc_new.set_as_default()
     log.info("All required parameters were successfully added to the new scenario")
+    return None
 
 
 # %% Submodules needed for running the main function
@@ -354,7 +399,9 @@ def add_year_set(  # noqa: C901
 
     # A.6. Changing the cumulative years based on the new first model year
     if "firstmodelyear" in set(yr_cat["type_year"]):
-        firstyear_new = int(yr_cat.loc[yr_cat["type_year"] == "firstmodelyear", "year"])
+        firstyear_new = int(
+            yr_cat.loc[yr_cat["type_year"] == "firstmodelyear", "year"].item()
+        )
         yr_cat = yr_cat.drop(
             yr_cat.loc[
                 (yr_cat["type_year"] == "cumulative") & (yr_cat["year"] < firstyear_new)
@@ -392,6 +439,25 @@ def next_step_bigger_than_previous(x: list[int], i: int) -> bool:
 
 
 # %% V) Adding new years to parameters
+def _info(sc_ref: Scenario, sc_new: Scenario, firstyear_new: int) -> dict:
+    """Information about the horizons of `sc_ref` and `sc_new` used by add_year_par.
+
+    This is computed once, rather than for each parameter.
+    """
+    horizon = sorted([int(x) for x in list(set(sc_ref.set("year")))])
+    yr_list = [int(x) for x in set(sc_new.set("year")) if int(x) > firstyear_new]
+    return dict(
+        horizon=horizon,
+        # Model years with different time intervals before and after them
+        year_diff=[
+            x
+            for x in horizon[1:-1]
+            if next_step_bigger_than_previous(horizon, horizon.index(x))
+        ],
+        min_step=min(np.diff(sorted(yr_list))),
+    )
+
+
 def add_year_par(
     sc_ref: Scenario,
     sc_new: Scenario,
@@ -411,29 +477,309 @@ def add_year_par(
     parameter for additional years is calculated mainly by interpolating and
     extrapolating data from existing years.
 
+    Data for all nodes in `reg_list` are read from *sc_ref* at once, and written to
+    *sc_new* for each chunk of data. If *sc_new* is not already checked out, it is
+    checked out and the changes are committed.
+
     See :meth:`add_year` for parameter descriptions.
 
+    """
+    commit = maybe_check_out(sc_new)
+    tasks = _prepare_par(
+        sc_ref,
+        sc_new,
+        yrs_new,
+        parname,
+        reg_list,
+        extrapolate,
+        rewrite,
+        unit_check,
+        extrapol_neg,
+        bound_extend,
+        _info(sc_ref, sc_new, firstyear_new),
+    )
+    for t in tasks:
+        _write_par(sc_new, parname, [_add_year_data(**t)])
+    maybe_commit(sc_new, commit, parname)
+
+
+def _prepare_par(
+    sc_ref: Scenario,
+    sc_new: Scenario,
+    yrs_new: list[int],
+    parname: str,
+    reg_list: list[str],
+    extrapolate: bool,
+    rewrite: bool,
+    unit_check: bool,
+    extrapol_neg: float | None,
+    bound_extend: bool,
+    info: dict,
+    chunk_rows: int | None = None,
+) -> Iterator[dict]:
+    """Read data for `parname` and prepare `sc_new`; `sc_new` must be checked out.
+
+    Yields keyword arguments to :func:`_add_year_data`, one for each chunk of data.
+    Nothing is yielded if nothing is to be added. Data are read lazily, so the
+    results for each chunk should be written before the next is requested. See
+    :func:`add_year` for `chunk_rows`.
     """
     #  V.A) Initialization and checks
-    par_list_new = sc_new.par_list()
     idx_names = sc_ref.idx_names(parname)
-    horizon = sorted([int(x) for x in list(set(sc_ref.set("year")))])
     node_col = [x for x in idx_names if x in ["node", "node_loc", "node_rel"]]
     year_list = [
         x for x in idx_names if x in ["year", "year_vtg", "year_act", "year_rel"]
     ]
 
-    if parname not in par_list_new:
-        sc_new.check_out()
+    if not sc_new.has_par(parname):
         sc_new.init_par(
             parname,
             idx_sets=sc_ref.idx_sets(parname),
             idx_names=sc_ref.idx_names(parname),
         )
-        sc_new.commit("New parameter initiated!")
 
-    par_old = sc_ref.par(parname, filters={node_col[0]: reg_list} if node_col else None)
-    par_new = sc_new.par(parname, filters={node_col[0]: reg_list} if node_col else None)
+    filters = {node_col[0]: reg_list} if node_col else None
+    par_new = sc_new.par(parname, filters=filters)
+
+    # Parameters with two year dimensions are processed for one node at a time, to
+    # reduce the size of tables
+    chunk = bool(node_col) and (len(year_list) == 2 or parname in ["land_output"])
+    stream = chunk_rows is not None and bool(node_col) and "technology" in idx_names
+
+    existing: set[str] = set()
+    if not par_new.empty and not rewrite:
+        if not (chunk or stream):
+            log.info(
+                f"Parameter {parname} already has data in new scenario and left "
+                f"unchanged for node(s): {reg_list}"
+            )
+            return
+        # Only add data for nodes without data in the new scenario
+        existing = set(par_new[node_col[0]])
+
+    par_tec = None
+    if len(year_list) == 2:
+        # Flagging technologies that have lifetime for adding new timesteps
+        par_tec = sc_new.par("technical_lifetime", {"node_loc": reg_list})
+        # Technologies with lifetime bigger than minimum time interval
+        par_tec = par_tec.loc[par_tec["value"] > info["min_step"]]
+
+    remove = rewrite and not par_new.empty
+    N = 0
+    for df in _read_par(sc_ref, parname, reg_list, node_col, stream):
+        if existing:
+            df = df[~df[node_col[0]].isin(existing)]
+        for df in _partitions(df, node_col, chunk, chunk_rows if stream else None):
+            if remove:
+                log.info(
+                    f"Parameter {parname} is being removed from new scenario to be "
+                    f"updated for node(s) in {reg_list}"
+                )
+                sc_new.remove_par(parname, par_new)
+                remove = False
+
+            chunk_info = dict(horizon=info["horizon"], year_diff=info["year_diff"])
+            if par_tec is not None:
+                # technical_lifetime for the node(s) in this chunk
+                chunk_nodes = df[node_col[0]].unique()
+                chunk_info["par_tec"] = par_tec.loc[
+                    par_tec["node_loc"].isin(chunk_nodes)
+                ]
+            N += 1
+            yield dict(
+                par_old=df.reset_index(drop=True),
+                parname=parname,
+                yrs_new=yrs_new,
+                idx_names=idx_names,
+                node_col=node_col,
+                year_list=year_list,
+                extrapolate=extrapolate,
+                unit_check=unit_check,
+                extrapol_neg=extrapol_neg,
+                bound_extend=bound_extend,
+                info=chunk_info,
+            )
+
+    if N == 0 and existing:
+        log.info(
+            f"Parameter {parname} already has data in new scenario and left "
+            f"unchanged for node(s): {reg_list}"
+        )
+    elif N == 0:
+        log.info(
+            f"Parameter {parname} is empty in reference scenario for node(s): "
+            + repr(reg_list)
+        )
+
+
+def _read_par(
+    sc_ref: Scenario,
+    parname: str,
+    reg_list: list[str],
+    node_col: list[str],
+    stream: bool,
+) -> Iterator[pd.DataFrame]:
+    """Read data for `parname` from `sc_ref`, at once or (`stream`) node by node."""
+    if stream:
+        for node in reg_list:
+            yield sc_ref.par(parname, filters={node_col[0]: [node]})
+    else:
+        yield sc_ref.par(parname, filters={node_col[0]: reg_list} if node_col else None)
+
+
+def _partitions(
+    df: pd.DataFrame, node_col: list[str], chunk: bool, chunk_rows: int | None
+) -> Iterator[pd.DataFrame]:
+    """Split `df` into chunks to be processed separately.
+
+    If `chunk_rows` is given, each chunk contains whole technologies of one node, and
+    has `chunk_rows` or fewer rows unless a single technology has more. Otherwise,
+    `df` is split by node if `chunk` is :obj:`True`, and yielded whole if not.
+    """
+    if df.empty:
+        return
+    elif not (chunk or chunk_rows):
+        yield df
+        return
+
+    for _, df_node in df.groupby(node_col[0], sort=False):
+        if chunk_rows is None:
+            yield df_node
+            continue
+
+        # Assign consecutive technologies to partitions
+        partition: dict[str, int] = {}
+        i = rows = 0
+        for tec, size in df_node.groupby("technology").size().items():
+            if rows and rows + size > chunk_rows:
+                i, rows = i + 1, 0
+            partition[str(tec)] = i
+            rows += size
+
+        for _, df_part in df_node.groupby(df_node["technology"].map(partition)):
+            yield df_part
+
+
+def estimate(
+    sc_ref: Scenario,
+    years_new: list[int],
+    par_list: list[str],
+    reg_list: list[str],
+    firstyear_new: int,
+    chunk_rows: int | None = None,
+) -> pd.DataFrame:
+    """Estimate the rows added to each parameter and peak memory used by add_year.
+
+    Data are read from `sc_ref` in the same way as by :func:`add_year`, but no
+    interpolation is done. The estimates assume that the number of rows grows in
+    proportion to the number of periods, in each year dimension of a parameter; and
+    that interpolation holds a few copies of a table with one column per period for
+    the largest chunk of data. They are intended to choose `chunk_rows` or `workers`
+    for large scenarios, not as exact values.
+
+    See :func:`add_year` for the arguments.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns "parameter", "rows", "rows_added", and "peak_memory" (in bytes).
+    """
+    horizon = sorted(int(x) for x in set(sc_ref.set("year")))
+    data = []
+    for parname in par_list:
+        idx_names = sc_ref.idx_names(parname)
+        node_col = [x for x in idx_names if x in ["node", "node_loc", "node_rel"]]
+        year_list = [
+            x for x in idx_names if x in ["year", "year_vtg", "year_act", "year_rel"]
+        ]
+        chunk = bool(node_col) and (len(year_list) == 2 or parname in ["land_output"])
+        stream = chunk_rows is not None and bool(node_col) and "technology" in idx_names
+
+        yrs_new = (
+            [x for x in years_new if x < firstyear_new]
+            if "historical" in parname
+            else years_new
+        )
+        # Ratio of the number of periods after and before adding `yrs_new`
+        ratio = (len(horizon) + len(yrs_new)) / len(horizon)
+
+        rows = added = peak = 0
+        for df in _read_par(sc_ref, parname, reg_list, node_col, stream):
+            for df in _partitions(df, node_col, chunk, chunk_rows if stream else None):
+                rows += len(df)
+                n = round(len(df) * (ratio ** len(year_list) - 1))
+                added += n
+                size = df.memory_usage(deep=True).sum() * (len(df) + n) / len(df)
+                if year_list:
+                    # Interpolation uses tables with 1 row per index, excluding the
+                    # last year dimension, and 1 column per period
+                    index = df.columns.difference([year_list[-1], "value", "unit"])
+                    cells = len(df.drop_duplicates(list(index))) * len(horizon) * ratio
+                    size += _COPIES * 8 * cells
+                peak = max(peak, int(size))
+        data.append((parname, rows, added, peak))
+
+    columns = ["parameter", "rows", "rows_added", "peak_memory"]
+    return pd.DataFrame(data, columns=columns)
+
+
+def _write_par(sc_new: Scenario, parname: str, data: list[pd.DataFrame]) -> None:
+    """Write `data` for `parname` to `sc_new`, which must be checked out."""
+    if not data:
+        return
+    df = pd.concat(data, ignore_index=True)
+    sc_new.add_par(parname, df)
+    log.debug(f"Parameter {parname}: {len(df)} rows copied and new years added")
+
+
+def _pool(workers: int) -> "ProcessPoolExecutor | nullcontext[None]":
+    """Return a process pool with `workers`, or a null context if `workers` is 1."""
+    if workers > 1:
+        # "spawn" avoids forking a process in which a JVM may be running
+        return ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+    return nullcontext()
+
+
+def _detach(task: dict) -> dict:
+    """Prepare `task` to run in another process.
+
+    :func:`interpolate_1d` may reorder its `yrs_new` argument, and the order is used
+    for subsequent parameters. The reordering is applied here, in the parent process,
+    while the task receives a copy of `yrs_new` as it would be in the same process.
+    """
+    yrs_new = task["yrs_new"]
+    result = task | dict(yrs_new=list(yrs_new))
+    df = task["par_old"]
+    if len(task["year_list"]) == 1 and task["extrapolate"]:
+        years = df.loc[df["value"].notna(), task["year_list"][0]].astype(int)
+        if len(years):
+            _move_years_before(yrs_new, years.min())
+    return result
+
+
+def _flush(
+    sc_new: Scenario, pending: "deque[tuple[str, list[Future]]]", n: int
+) -> None:
+    """Write `pending` results, oldest first, until `n` or fewer remain."""
+    while len(pending) > n:
+        parname, futures = pending.popleft()
+        _write_par(sc_new, parname, [f.result() for f in futures])
+
+
+def _add_year_data(
+    par_old: pd.DataFrame,
+    parname: str,
+    yrs_new: list[int],
+    idx_names: list[str],
+    node_col: list[str],
+    year_list: list[str],
+    extrapolate: bool,
+    unit_check: bool,
+    extrapol_neg: float | None,
+    bound_extend: bool,
+    info: dict,
+) -> pd.DataFrame:
+    """Return data for parameter `parname` from `par_old` with new years added."""
     sort_order = (
         [
             node_col[0],
@@ -446,20 +792,6 @@ def add_year_par(
         if node_col
         else ["technology", "commodity"] + year_list
     )
-    nodes = par_old[node_col[0]].unique().tolist() if node_col else ["N/A"]
-
-    if not par_new.empty and not rewrite:
-        log.info(
-            f"Parameter {parname} already has data in new scenario and left "
-            f"unchanged for node(s): {reg_list}"
-        )
-        return
-    if par_old.empty:
-        log.info(
-            f"Parameter {parname} is empty in reference scenario for node(s): "
-            + repr(reg_list)
-        )
-        return
 
     # Sorting the data to make it ready for dataframe manipulation
     sort_order = [x for x in sort_order if x in idx_names]
@@ -468,14 +800,6 @@ def add_year_par(
         rem_idx = [x for x in par_old.columns if x not in sort_order]
         par_old = par_old.reindex(columns=sort_order + rem_idx)
 
-    sc_new.check_out()
-    if not par_new.empty and rewrite:
-        log.info(
-            f"Parameter {parname} is being removed from new scenario to be updated for "
-            f"node(s) in {nodes}"
-        )
-        sc_new.remove_par(parname, par_new)
-
     # A uniform "unit" for values in different years
     if "unit" in par_old.columns and unit_check:
         par_old = unit_uniform(par_old)
@@ -483,85 +807,120 @@ def add_year_par(
     #   V.B) Adding new years to a parameter based on time-related indexes
     #   V.B.1) Parameters with no time index
     if len(year_list) == 0:
-        sc_new.add_par(parname, par_old)
-        sc_new.commit(parname)
-        log.info(
+        log.debug(
             f"Parameter {parname} just copied to new scenario since has no time-related"
-            "entries"
+            " entries"
         )
+        return par_old
 
     #   V.B.2) Parameters with one index related to time
     elif len(year_list) == 1:
-        year_col = year_list[0]
-        df = par_old.copy()
-        df_y = interpolate_1d(
-            df,
+        return interpolate_1d(
+            par_old,
             yrs_new,
-            horizon,
-            year_col,
+            info["horizon"],
+            year_list[0],
             "value",
             extrapolate,
             extrapol_neg,
             bound_extend,
         )
-        sc_new.add_par(parname, df_y)
-        sc_new.commit(" ")
-        log.info(f"Parameter {parname} copied and new years added for node(s): {nodes}")
 
     #   V.B.3) Parameters with two indexes related to time (such as 'input')
-    elif len(year_list) == 2:
-        year_col = "year_act"
-        year_ref = [x for x in year_list if x != year_col][0]
-
-        year_diff = [
-            x
-            for x in horizon[1:-1]
-            if next_step_bigger_than_previous(horizon, horizon.index(x))
+    year_col = "year_act"
+    year_ref = [x for x in year_list if x != year_col][0]
+
+    par_tec = info["par_tec"]
+    tec_list = (
+        []
+        if parname == "relation_activity"
+        else [
+            t
+            for t in (set(par_old["technology"]))
+            if t in list(set(par_tec["technology"]))
         ]
-        log.info(f"Parameter {parname} is being added for node(s): {nodes}")
-
-        # Flagging technologies that have lifetime for adding new timesteps
-        yr_list = [int(x) for x in set(sc_new.set("year")) if int(x) > firstyear_new]
-        min_step = min(np.diff(sorted(yr_list)))
-        par_tec = sc_new.par("technical_lifetime", {"node_loc": nodes})
-        # Technologies with lifetime bigger than minimum time interval
-        par_tec = par_tec.loc[par_tec["value"] > min_step]
-        df = par_old.copy()
-
-        tec_list = (
-            []
-            if parname == "relation_activity"
-            else [
-                t
-                for t in (set(df["technology"]))
-                if t in list(set(par_tec["technology"]))
-            ]
-        )
+    )
 
-        df_y = interpolate_2d(
-            df,
-            yrs_new,
-            horizon,
-            year_ref,
-            year_col,
-            tec_list,
-            par_tec,
-            "value",
-            extrapolate,
-            extrapol_neg,
-            year_diff,
-            bound_extend,
-        )
-        sc_new.add_par(parname, df_y)
-        sc_new.commit(parname)
-        log.info(f"Parameter {parname} copied and new years added for node(s): {nodes}")
+    return interpolate_2d(
+        par_old,
+        yrs_new,
+        info["horizon"],
+        year_ref,
+        year_col,
+        tec_list,
+        par_tec,
+        "value",
+        extrapolate,
+        extrapol_neg,
+        info["year_diff"],
+        bound_extend,
+    )
 
 
 # %% VI) Required functions
 
 
-# FIXME reduce complexity 18 → ≤13
-def interpolate_1d(  # noqa: C901
+def _move_years_before(yrs_new: list[int], first: int) -> None:
+    """Move elements of `yrs_new` before `first` to its end, in descending order."""
+    for y in sorted([x for x in yrs_new if x < first], reverse=True):
+        yrs_new.insert(len(yrs_new), yrs_new.pop(yrs_new.index(y)))
+
+
+def _sources_1d(
+    years: np.ndarray,
+    yrs_new: list[int],
+    horizon: list[int],
+    horizon_new: list[int],
+    extrapolate: bool,
+    bound_extend: bool,
+) -> pd.DataFrame:
+    """Locate the existing years used to compute values for each of `yrs_new`.
+
+    Returns a data frame indexed by the new years for which values are computed, with
+    positions in `years` of:
+
+    - "a", "b": the two years between which a value is interpolated or from which it
+      is extrapolated. These are equal if the value is copied from "a".
+    - "c": if not -1, a third year; values missing after interpolation between "a"
+      and "b" are extrapolated from "b" and "c".
+    - "neg": if not -1, the year compared for `extrapol_neg`.
+
+    …and the boolean column "fill": whether missing values are filled from "a".
+    """
+    n = len(years)
+    h_new = np.array(horizon_new)
+    rows = {}
+    for yr in yrs_new:
+        extrapol = yr > max(horizon) or extrapolate
+        lo = int(np.searchsorted(years, yr, side="left"))  # First year ≥ yr
+        hi = int(np.searchsorted(years, yr, side="right"))  # First year > yr
+        if yr > years[-1] and extrapol:
+            # a) Extrapolate forward from the last year(s), only one step ahead
+            if yr != h_new[np.searchsorted(h_new, years[-1], side="right")]:
+                continue
+            elif n >= 2:
+                rows[yr] = (n - 1, n - 2, -1, n - 1, bound_extend)
+            else:
+                rows[yr] = (n - 1, n - 1, -1, -1, False)
+        elif yr < years[0] and extrapol:
+            # b) Extrapolate backward from the first year(s), only one step behind
+            if years[0] != horizon_new[horizon_new.index(yr) + 1]:
+                continue
+            elif n >= 2:
+                rows[yr] = (0, 1, -1, 0, False)
+            elif bound_extend:
+                rows[yr] = (0, 0, -1, -1, False)
+        elif years[0] < yr < years[-1]:
+            # c) Interpolate between the adjacent years
+            c = hi + 1 if hi + 1 < n else -1
+            rows[yr] = (lo - 1, hi, c, hi if c >= 0 else -1, bound_extend)
+
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["a", "b", "c", "neg", "fill"]
+    )
+
+
+def interpolate_1d(
     df: pd.DataFrame,
     yrs_new: list[int],
     horizon: list[int],
@@ -576,6 +935,9 @@ def interpolate_1d(  # noqa: C901
     This function receives a parameter data as a dataframe, and adds new data
     for the additonal years by interpolation and extrapolation.
 
+    Values for all new years are computed at once from a 2-D array of the values of
+    the parameter in the existing years.
+
     Parameters
     ----------
     df : pandas.DataFrame
@@ -598,125 +960,174 @@ def interpolate_1d(  # noqa: C901
     """
     horizon_new = sorted(horizon + yrs_new)
     idx = [x for x in df.columns if x not in [year_col, value_col]]
-    if not df.empty:
-        df2 = df.pivot_table(index=idx, columns=year_col, values=value_col)
-        df2_int_column_list = [int(column) for column in df2.columns]
-
-        # To sort the new years smaller than the first year for
-        # extrapolation (e.g. 2025 values are calculated first; then
-        # values of 2015 based on 2020 and 2025)
-        year_before = sorted(
-            [x for x in yrs_new if x < min(df2_int_column_list)], reverse=True
+    if df.empty:
+        log.warning("The submitted dataframe is empty, so returned empty results")
+        return df
+
+    df2 = df.pivot_table(index=idx, columns=year_col, values=value_col)
+    years = np.array([int(column) for column in df2.columns])
+    order = np.argsort(years, kind="stable")
+    years, values = years[order], df2.to_numpy(dtype=float)[:, order]
+
+    # To sort the new years smaller than the first year for extrapolation. The
+    # order of `yrs_new` is used by callers, e.g. interpolate_2d(), so is kept.
+    if extrapolate:
+        _move_years_before(yrs_new, years[0])
+
+    src = _sources_1d(years, yrs_new, horizon, horizon_new, extrapolate, bound_extend)
+    if len(src):
+        x, yr = years.astype(float), src.index.to_numpy(dtype=float)
+        a, b, c = (src[k].to_numpy() for k in "abc")
+        copy, has_c = a == b, c >= 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Interpolate or extrapolate between years a and b
+            t = np.where(copy, 0.0, (yr - x[a]) / (x[b] - x[a]))
+            result = values[:, a] + (values[:, b] - values[:, a]) * t
+            result[:, copy] = values[:, a[copy]]
+
+            # Extrapolate from years b and c where values are missing
+            t = (yr - x[b]) / (x[c] - x[b])
+            alt = values[:, b] + (values[:, c] - values[:, b]) * t
+            result = np.where(np.isnan(result) & has_c, alt, result)
+
+        # Replace negative values with a multiple of the value for year "neg"
+        neg = src["neg"].to_numpy()
+        if extrapol_neg:
+            ref = values[:, neg]
+            mask = (result < 0) & (ref >= 0) & (neg >= 0)
+            result[mask] = ref[mask] * extrapol_neg
+
+        # Fill missing values from year a; keep infinite values
+        ref = values[:, a]
+        result = np.where(np.isnan(result) & src["fill"].to_numpy(), ref, result)
+        result = np.where(np.isinf(ref), ref, result)
+
+        df2 = pd.concat(
+            [df2, pd.DataFrame(result, index=df2.index, columns=src.index)], axis=1
         )
-        if year_before and extrapolate:
-            for y in year_before:
-                yrs_new.insert(len(yrs_new), yrs_new.pop(yrs_new.index(y)))
-
-        for yr in yrs_new:
-            extrapol = True if yr > max(horizon) else extrapolate
-
-            # a) If this new year greater than modeled years, do extrapolation
-            if yr > max(df2_int_column_list) and extrapol:
-                if yr == horizon_new[horizon_new.index(max(df2_int_column_list)) + 1]:
-                    year_pre = max([x for x in df2_int_column_list if x < yr])
-
-                    if len([x for x in df2_int_column_list if x < yr]) >= 2:
-                        year_pp = max([x for x in df2_int_column_list if x < year_pre])
-                        df2[yr] = intpol(
-                            df2[year_pre], df2[year_pp], year_pre, year_pp, yr
-                        )
-
-                        if bound_extend:
-                            df2[yr] = df2[yr].fillna(df2[year_pre])
-
-                        df2[yr][np.isinf(df2[year_pre])] = df2[year_pre]
-                        if (
-                            not df2[yr].loc[(df2[yr] < 0) & (df2[year_pre] >= 0)].empty
-                            and extrapol_neg
-                        ):
-                            df2.loc[(df2[yr] < 0) & (df2[year_pre] >= 0), yr] = (
-                                df2.loc[(df2[yr] < 0) & (df2[year_pre] >= 0), year_pre]
-                                * extrapol_neg
-                            )
-                    else:
-                        df2[yr] = df2[year_pre]
-
-            # b) If the new year is smaller than modeled years, extrapolate
-            elif yr < min(df2_int_column_list) and extrapol:
-                year_next = min([x for x in df2_int_column_list if x > yr])
-
-                # To make sure the new year is not two steps smaller
-                cond = year_next == horizon_new[horizon_new.index(yr) + 1]
-
-                if len([x for x in df2_int_column_list if x > yr]) >= 2 and cond:
-                    year_nn = min([x for x in df2_int_column_list if x > year_next])
-                    df2[yr] = intpol(
-                        df2[year_next], df2[year_nn], year_next, year_nn, yr
-                    )
-                    df2[yr][np.isinf(df2[year_next])] = df2[year_next]
-                    if (
-                        not df2[yr].loc[(df2[yr] < 0) & (df2[year_next] >= 0)].empty
-                        and extrapol_neg
-                    ):
-                        df2.loc[(df2[yr] < 0) & (df2[year_next] >= 0), yr] = (
-                            df2.loc[(df2[yr] < 0) & (df2[year_next] >= 0), year_next]
-                            * extrapol_neg
-                        )
-
-                elif bound_extend and cond:
-                    df2[yr] = df2[year_next]
-
-            # c) Otherise, do intrapolation
-            elif yr > min(df2_int_column_list) and yr < max(df2_int_column_list):
-                year_pre = max([x for x in df2_int_column_list if x < yr])
-                year_next = min([x for x in df2_int_column_list if x > yr])
-                df2[yr] = intpol(df2[year_pre], df2[year_next], year_pre, year_next, yr)
-
-                # Extrapolate for new years if the value exists for the
-                # previous year but not for the next years
-                # TODO: here is the place that should be changed if the
-                # new year should go to the time step before the existing one
-                if [x for x in df2_int_column_list if x > year_next]:
-                    year_nn = min([x for x in df2_int_column_list if x > year_next])
-                    df2[yr] = df2[yr].fillna(
-                        intpol(df2[year_next], df2[year_nn], year_next, year_nn, yr)
-                    )
-                    if (
-                        not df2[yr].loc[(df2[yr] < 0) & (df2[year_next] >= 0)].empty
-                        and extrapol_neg
-                    ):
-                        df2.loc[(df2[yr] < 0) & (df2[year_next] >= 0), yr] = (
-                            df2.loc[(df2[yr] < 0) & (df2[year_next] >= 0), year_next]
-                            * extrapol_neg
-                        )
-
-                if bound_extend:
-                    df2[yr] = df2[yr].fillna(df2[year_pre])
-                mask = np.isinf(df2[year_pre])
-                df2.loc[mask, str(yr)] = df2[year_pre]
-
-        df2 = (
-            pd.melt(
-                df2.reset_index(),
-                id_vars=idx,
-                value_vars=[x for x in df2.columns if x not in idx],
-                var_name=year_col,
-                value_name=value_col,
-            )
-            .dropna(subset=[value_col])
-            .reset_index(drop=True)
+
+    df2 = (
+        pd.melt(
+            df2.reset_index(),
+            id_vars=idx,
+            value_vars=[x for x in df2.columns if x not in idx],
+            var_name=year_col,
+            value_name=value_col,
         )
-        df2 = df2.sort_values(idx).reset_index(drop=True)
-    else:
-        log.warning("The submitted dataframe is empty, so returned empty results")
-        df2 = df
-    return df2
+        .dropna(subset=[value_col])
+        .reset_index(drop=True)
+    )
+    return df2.sort_values(idx).reset_index(drop=True)
 
 
 # %% VI.B) Interpolating parameters with two dimensions related to time
 
 
-# FIXME reduce complexity 38 → ≤13
+def _mask_count(df: pd.DataFrame, count: np.ndarray) -> np.ndarray:
+    """Mask the values in each row of `df` after its `count`-th non-null value."""
+    cumsum = df.notnull().to_numpy().cumsum(axis=1)
+    labels = df.columns.to_numpy()
+    position = (cumsum == np.asarray(count, dtype=float)[:, None]).argmax(axis=1)
+    return labels[None, :] > labels[position][:, None]
+
+
+def _mask_vintage(
+    df_yr: pd.DataFrame,
+    df_pre: pd.DataFrame,
+    df_next: pd.DataFrame,
+    year_pre: int,
+    tec: bool,
+) -> pd.DataFrame:
+    """Remove extra values from data for a new vintage interpolated in `df_yr`.
+
+    - Rows with data in the next vintage (`df_next`): values for `year_pre` are
+      removed, and then values after the number of values in `df_pre`.
+    - Rows without (i.e. technologies phasing out): values are those of the previous
+      vintage (`df_pre`) shifted by one period, up to the number of values in
+      `df_pre` (plus one, if `tec`).
+    """
+    c_pre = df_pre.count(axis=1).reindex(df_yr.index).to_numpy(dtype=float)
+    c_next = (
+        df_next.loc[df_next.index.isin(df_pre.index)]
+        .count(axis=1)
+        .reindex(df_yr.index)
+        .to_numpy(dtype=float)
+    )
+    has_next = ~np.isnan(c_next)
+    if has_next.any():
+        df_yr = df_yr.copy()
+        df_yr[year_pre] = np.nan
+
+    # Technologies phasing out before the end of horizon
+    shifted = df_pre.shift(+1, axis=1).reindex(
+        index=df_yr.index[~has_next], columns=df_yr.columns
+    )
+    values = df_yr.to_numpy(dtype=float, copy=True)
+    values[~has_next] = shifted.to_numpy(dtype=float)
+
+    count = np.where(has_next, c_pre, c_pre + (1 if tec else 0))
+    mask = _mask_count(pd.DataFrame(values, columns=df_yr.columns), count)
+    mask &= (~has_next | (c_pre < c_next + 2))[:, None]
+    values[mask] = np.nan
+
+    if has_next.any():
+        # Values for `year_pre` are only kept for rows after the last with next values
+        before = np.arange(len(values)) < np.flatnonzero(has_next)[-1]
+        values[before, df_yr.columns.get_loc(year_pre)] = np.nan
+
+    return pd.DataFrame(values, index=df_yr.index, columns=df_yr.columns)
+
+
+def _mask_lifetime(
+    df2: pd.DataFrame,
+    idx: list[str],
+    year_ref: str,
+    tec_list: list[str],
+    par_tec: pd.DataFrame,
+    transition: tuple[int, int, int] | None,
+) -> pd.DataFrame:
+    """Remove values of `df2` beyond the technical lifetime of each vintage.
+
+    For rows of technologies in `tec_list` with a lifetime in `par_tec`, values are
+    removed where the duration from `year_ref` to the column year is at least the
+    lifetime. `transition` (year, next year, duration) shortens durations across a
+    change in period length. For other rows, values after `year_ref` are removed.
+    """
+    vtg = df2.index.get_level_values(year_ref).astype(int).to_numpy()
+    act = df2.columns.astype(int).to_numpy()
+    duration = (act[None, :] - vtg[:, None]).astype(float)
+    if transition:
+        year, year_next, subt = transition
+        duration[np.ix_(vtg <= year, act >= year_next)] -= subt
+
+    # Lifetime of each row
+    node_column = [x for x in idx if any(y in x for y in ["node", "node_loc"])][0]
+    keys = [node_column, "technology", year_ref]
+    lt = par_tec.rename(columns={"node_loc": node_column, "value": "_lt"})
+    lt = lt.drop_duplicates(subset=keys, keep="last")
+    lifetime = (
+        df2.index.to_frame(index=False)[keys]
+        .merge(lt[keys + ["_lt"]], how="left", on=keys)["_lt"]
+        .to_numpy(dtype=float)
+    )
+    lifetime = np.trunc(lifetime)
+    values = df2.to_numpy(dtype=float, copy=True)
+    has_lt = (
+        df2.index.get_level_values("technology").isin(tec_list)
+        & ~np.isnan(values).all(axis=1)
+        & ~np.isnan(lifetime)
+    )
+
+    mask = np.where(
+        has_lt[:, None],
+        duration >= lifetime[:, None],
+        act[None, :] > vtg[:, None],
+    )
+    values[mask] = np.nan
+    return pd.DataFrame(values, index=df2.index, columns=df2.columns)
+
+
+# FIXME reduce complexity 25 → ≤13
 def interpolate_2d(  # noqa: C901
     df: pd.DataFrame,
     yrs_new: list[int],
@@ -780,6 +1191,16 @@ def interpolate_2d(  # noqa: C901
     df2_tec = df_tec.pivot_table(index=idx, columns=year_col, values="value")
     df2_int_column_list = [int(column) for column in df2.columns]
 
+    # Groups of rows that differ only in `year_ref`. Values are shifted to the
+    # preceding or following `year_ref` only within a group, so that results are the
+    # same when technologies are processed separately, e.g. with `chunk_rows`.
+    group_levels = [name for name in idx if name != year_ref]
+
+    def shift(s: pd.Series, periods: int) -> pd.Series:
+        if not group_levels:
+            return s.shift(periods)
+        return s.groupby(level=group_levels, sort=False).shift(periods)
+
     # -------------------------------------------------------------------------
     # First, changing the time interval for the transition period
     # (e.g., year 2010 in old R11 model transits from 5 year to 10 year)
@@ -790,15 +1211,8 @@ def interpolate_2d(  # noqa: C901
         if next_step_bigger_than_previous(horizon_new, horizon_new.index(x))
     ]
 
-    # Generating duration_period_sum matrix for masking
-    df_dur = pd.DataFrame(
-        index=horizon_new[:-1], columns=[str(year) for year in horizon_new[1:]]
-    )
-    for i in df_dur.index.astype(str):
-        for j in [x for x in df_dur.columns if x > i]:
-            df_dur.loc[i, j] = int(j) - int(i)
-
     # Adding data for new transition year
+    transition = None
     if yr_diff_new and tec_list and year_diff not in yr_diff_new:
         yrs = [x for x in horizon if x <= yr_diff_new[0]]
         year_next = min([x for x in df2_int_column_list if x > yr_diff_new[0]])
@@ -832,10 +1246,9 @@ def interpolate_2d(  # noqa: C901
             d[d.isnull() & d_n.notnull()] = d_n  # type: ignore [index]
             df2.loc[df2.index.isin(d.index), :] = d
 
-        cond1 = df_dur.index <= yr_diff_new[0]
-        cond2 = df_dur.columns.astype(int) >= year_next
+        # Durations across the transition year are shorter by one period
         subt = yr_diff_new[0] - horizon_new[horizon_new.index(yr_diff_new[0]) - 1]
-        df_dur.loc[cond1, cond2] = df_dur.loc[cond1, cond2] - subt
+        transition = (yr_diff_new[0], year_next, subt)
     # -------------------------------------------------------------------------
     # Second, adding year_act of new years if year_vtg is in existing years
     for yr in yrs_new:
@@ -847,16 +1260,16 @@ def interpolate_2d(  # noqa: C901
             year_pp = max([x for x in df2_int_column_list if x < year_pre])
 
             df2[yr] = intpol(df2[year_pre], df2[year_pp], year_pre, year_pp, yr)
-            df2[yr][np.isinf(df2[year_pre].shift(+1))] = df2[year_pre].shift(+1)
+            df2.loc[np.isinf(shift(df2[year_pre], +1)), yr] = shift(df2[year_pre], +1)
             df2[yr] = df2[yr].fillna(df2[year_pre])
 
             k = horizon_new.index(yr)
             if yr - horizon_new[k - 1] >= horizon_new[k - 1] - horizon_new[k - 2]:
-                df2[yr].loc[
-                    (pd.isna(df2[year_pre].shift(+1)))
-                    & (~pd.isna(df2[year_pp].shift(+1)))
-                ] = np.nan
-            cond = (df2[yr] < 0) & (df2[year_pre].shift(+1) >= 0)
+                cond = pd.isna(shift(df2[year_pre], +1)) & ~pd.isna(
+                    shift(df2[year_pp], +1)
+                )
+                df2.loc[cond, yr] = np.nan
+            cond = (df2[yr] < 0) & (shift(df2[year_pre], +1) >= 0)
             if not df2[yr].loc[cond].empty and extrapol_neg:
                 df2.loc[cond, yr] = df2.loc[cond, year_pre] * extrapol_neg
 
@@ -874,7 +1287,7 @@ def interpolate_2d(  # noqa: C901
                 cond = (pd.isna(df2_t[yr])) & (~pd.isna(df2_t[year_pre]))
                 df2_t.loc[cond, yr] = intpol(
                     df2_t[year_pre],
-                    df2_t[year_next].shift(-1),
+                    shift(df2_t[year_next], -1),
                     year_pre,
                     year_next,
                     yr,
@@ -884,7 +1297,7 @@ def interpolate_2d(  # noqa: C901
                 if [x for x in df2_int_column_list if x < year_pre]:
                     year_pp = max([x for x in df2_int_column_list if x < year_pre])
                     cond3 = (pd.isna(df2_t[yr])) & (~pd.isna(df2_t[year_pre]))
-                    cond4 = pd.isna(df2_t[year_pre].shift(-1))
+                    cond4 = pd.isna(shift(df2_t[year_pre], -1))
 
                     df2_t.loc[cond3 & cond4, yr] = intpol(
                         df2_t[year_pre], df2_t[year_pp], year_pre, year_pp, yr
@@ -919,7 +1332,7 @@ def interpolate_2d(  # noqa: C901
 
             if extrapol_neg:
                 df_yr[(df_yr < 0) & (df_pre >= 0)] = df_pre * extrapol_neg  # type: ignore [index]
-            df_yr.loc[:, df_yr.columns < str(yr)] = np.nan
+            df_yr.loc[:, df_yr.columns.to_numpy() < yr] = np.nan
 
         # c) Otherwise, do intrapolation
         elif yr > min(df2_int_column_list) and yr < max(horizon):
@@ -948,30 +1361,8 @@ def interpolate_2d(  # noqa: C901
                 df_yr[yr] = df_yr[yr].fillna(df_yr[[year_pre, year_next]].mean(axis=1))
             df_yr[np.isinf(df_pre)] = df_pre
 
-            # Creating a mask to remove extra values
-            df_count = pd.DataFrame(
-                {
-                    "c_pre": df_pre.count(axis=1),
-                    "c_next": idx_check(df_next, df_pre).count(axis=1),
-                },
-                index=df_yr.index,
-            )
-
-            for i in df_yr.index:
-                # Mainly for cases of two new consecutive new years
-                if ~np.isnan(df_count["c_next"][i]):
-                    df_yr[year_pre] = np.nan
-                    # For the rest
-                    if df_count["c_pre"][i] < df_count["c_next"][i] + 2:
-                        mask_df(df_yr, i, df_count["c_pre"][i], np.nan)
-
-                # For technologies phasing out before the end of horizon
-                elif np.isnan(df_count["c_next"][i]):
-                    df_yr.loc[i, :] = df_pre.loc[i, :].shift(+1)
-                    if tec_list:
-                        mask_df(df_yr, i, df_count["c_pre"][i] + 1, np.nan)
-                    else:
-                        mask_df(df_yr, i, df_count["c_pre"][i], np.nan)
+            # Removing extra values
+            df_yr = _mask_vintage(df_yr, df_pre, df_next, year_pre, bool(tec_list))
 
         else:
             continue
@@ -980,39 +1371,8 @@ def interpolate_2d(  # noqa: C901
         df2 = df2.reindex(sorted(df2.columns), axis=1).sort_index()
     # -------------------------------------------------------------------------
     # Forth: final masking based on technical lifetime
-    if tec_list and not df_dur.empty:
-        df3 = (
-            df2.loc[df2.index.get_level_values("technology").isin(tec_list), :]
-            .copy()
-            .dropna(how="all")
-        )
-        idx_list = list(set(df3.index.get_level_values(year_ref)))
-        for y in sorted([x for x in idx_list if x in df_dur.index]):
-            df3.loc[
-                df3.index.get_level_values(year_ref).isin([y]),
-                df3.columns.isin(df_dur.columns),
-            ] = df_dur.loc[y, df_dur.columns.isin(df3.columns)].values
-        node_column = [x for x in idx if any(y in x for y in ["node", "node_loc"])][0]
-        df3 = (
-            df3.reset_index()
-            .set_index([node_column, "technology", year_ref])
-            .sort_index(level=1)
-        )
-        par_t = par_tec.set_index(["node_loc", "technology", year_ref]).sort_index(
-            level=1
-        )
-
-        for i in [x for x in par_t.index if x in df3.index]:
-            df3.loc[i, "lifetime"] = par_t.loc[i, "value"].copy()
-
-        df3 = df3.reset_index().set_index(idx).dropna(subset=["lifetime"]).sort_index()
-        for i in df3.index:
-            df2.loc[i, df3.loc[i, :] >= int(df3.loc[i, "lifetime"])] = np.nan
-
-        # Removing extra values from non-lifetime technologies
-        for i in [x for x in df2.index if x not in df3.index]:
-            condition = df2.loc[[i]].index.get_level_values(year_ref)[0]
-            df2.loc[i, df2.columns > condition] = np.nan
+    if tec_list and len(horizon_new) > 1:
+        df2 = _mask_lifetime(df2, idx, year_ref, tec_list, par_tec, transition)
 
     df_par = pd.melt(
         df2.reset_index(),
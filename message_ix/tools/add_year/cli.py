@@ -20,6 +20,11 @@ negative values may be produced.
 If --bound_extend is True (the default), data from previous timestep is copied
 if only one data point is available for extrapolation.
 
+If --chunk_rows is given, large parameters are processed node by node, in
+partitions of whole technologies with at most about this many rows. Use
+--estimate to show the rows to be added and estimated peak memory for each
+parameter, without creating the new scenario.
+
 """
 
 from functools import partial
@@ -120,6 +125,24 @@ def split_value(ctx, param, value, type=str):
     default=True,
     show_default=True,
 )
+@click.option(
+    "--workers",
+    help="number of processes for adding years to parameters",
+    type=int,
+    default=1,
+    show_default=True,
+)
+@click.option(
+    "--chunk_rows",
+    help="process large parameters in partitions of this many rows",
+    type=int,
+    default=None,
+)
+@click.option(
+    "--estimate",
+    help="Only show rows to be added & estimated peak memory, and exit.",
+    is_flag=True,
+)
 @click.option("--dry-run", help="Only parse arguments & exit.", is_flag=True)
 @click.pass_obj
 def main(
@@ -138,6 +161,9 @@ def main(
     unit_check,
     extrapol_neg,
     bound_extend,
+    workers,
+    chunk_rows,
+    estimate,
     dry_run,
 ):
     # The reference scenario is loaded according to the options given to
@@ -215,12 +241,35 @@ def main(
             extrapol_neg,
             "bound_extend:",
             bound_extend,
+            "workers:",
+            workers,
+            "chunk_rows:",
+            chunk_rows,
         )
         return
 
     # Retrieve the Platform that sc_ref is stored on
     mp = sc_ref.platform
 
+    if estimate:
+        # Estimate the work to be done, without creating the new scenario. With
+        # dry_run=True, sc_new is not used.
+        result = add_year(
+            sc_ref=sc_ref,
+            sc_new=sc_ref,
+            years_new=years_new,
+            firstyear_new=firstyear_new,
+            macro=macro,
+            parameter=parameter,
+            region=region,
+            chunk_rows=chunk_rows,
+            dry_run=True,
+        )
+        result["peak_memory"] = (result["peak_memory"] / 2**20).round(1)
+        print(result.rename(columns={"peak_memory": "peak_memory_MiB"}).to_string())
+        mp.close_db()
+        return
+
     # Load or create the new scenario to which to add years
     sc_new = message_ix.Scenario(mp, **new_kw)
 
@@ -245,6 +294,8 @@ def main(
         unit_check=unit_check,
         extrapol_neg=extrapol_neg,
         bound_extend=bound_extend,
+        workers=workers,
+        chunk_rows=chunk_rows,
     )
 
     end = timer()
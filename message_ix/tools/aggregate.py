@@ -0,0 +1,692 @@
+"""Aggregate the periods, time slices, or nodes of a scenario to reduce the LP size.
+
+The functions in this module create a new :class:`.Scenario` in which elements of one
+index set are merged. All sets and parameters of the original scenario are mapped to
+the merged elements and aggregated in a vectorized way, then written to the new
+scenario in a single commit.
+"""
+
+import logging
+from collections.abc import Collection, Iterable, Mapping
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from message_ix.core import Scenario
+
+log = logging.getLogger(__name__)
+
+#: Parameters giving the weight of each element of an index set, used to compute
+#: weighted averages of other parameters.
+WEIGHT = {"year": "duration_period", "time": "duration_time"}
+
+#: Index sets with elements that may also be elements of the index set that is the
+#: key. Elements of these are mapped if they appear in the mapping, and kept
+#: otherwise.
+ALIAS = {"year": "type_year"}
+
+#: Parameters that are summed, rather than averaged, when elements of each index set
+#: are aggregated.
+SUM = {
+    "year": {"duration_period"},
+    # Activity in a time slice is the total over the duration of the slice
+    "time": {
+        "bound_activity_lo",
+        "bound_activity_up",
+        "demand",
+        "duration_time",
+        "fixed_activity",
+        "historical_activity",
+        "initial_activity_lo",
+        "initial_activity_up",
+        "ref_activity",
+    },
+    # Quantities that are totals for a node. Also SUM_ALL["node"].
+    "node": {
+        "bound_activity_lo",
+        "bound_new_capacity_lo",
+        "bound_total_capacity_lo",
+        "commodity_stock",
+        "cost_MESSAGE",
+        "demand",
+        "demand_MESSAGE",
+        "fixed_activity",
+        "fixed_capacity",
+        "fixed_extraction",
+        "fixed_new_capacity",
+        "fixed_stock",
+        "gdp_calibrate",
+        "historical_activity",
+        "historical_emission",
+        "historical_extraction",
+        "historical_gdp",
+        "historical_new_capacity",
+        "initial_activity_lo",
+        "initial_activity_up",
+        "initial_new_capacity_lo",
+        "initial_new_capacity_up",
+        "ref_activity",
+        "ref_extraction",
+        "ref_new_capacity",
+        "relation_lower",
+        "renewable_potential",
+        "resource_volume",
+    },
+}
+
+#: Parameters that are upper bounds, and are summed only if there are values for all
+#: of the aggregated elements. Otherwise, the aggregate is unbounded.
+SUM_ALL = {
+    "node": {
+        "bound_activity_up",
+        "bound_emission",
+        "bound_extraction_up",
+        "bound_new_capacity_up",
+        "bound_total_capacity_up",
+        "relation_upper",
+    }
+}
+
+#: Sets with the hierarchy of elements of an index set, and the dimensions for
+#: children and parents.
+HIERARCHY = {
+    "time": {
+        "map_temporal_hierarchy": ("time", "time_parent"),
+        "map_time": ("time", "time_parent"),
+    }
+}
+
+
+def _map(
+    df: pd.DataFrame, idx_sets: list[str], dims: list[str], mapping: pd.Series, key: str
+) -> tuple[pd.DataFrame, list[str]]:
+    """Map the dimensions of `df` indexed by `key` or its alias using `mapping`.
+
+    Rows with elements of `key` that are not in `mapping` are dropped. Returns the
+    mapped data frame and the names of the mapped dimensions.
+    """
+    mapped = []
+    keep = np.ones(len(df), dtype=bool)
+    for idx_set, dim in zip(idx_sets, dims):
+        if idx_set == key:
+            new = df[dim].astype(str).map(mapping)
+            keep &= new.notna().to_numpy()
+            mapped.append(dim)
+        elif idx_set == ALIAS.get(key):
+            new = df[dim].astype(str)
+            new = new.map(mapping).fillna(new)
+        else:
+            continue
+        df = df.assign(**{dim: new})
+    return df[keep], mapped
+
+
+def _aggregate(
+    df: pd.DataFrame,
+    dims: list[str],
+    weight: Mapping[str, pd.Series],
+    how: str,
+    sizes: pd.Series,
+) -> pd.DataFrame:
+    """Aggregate the "value" column of `df` over duplicate `dims`.
+
+    If `how` is "sum", values are summed. If "sum_all", values are summed, but only
+    kept if there are values for all of the original elements, according to `sizes`.
+    Otherwise, the average is weighted by the product of the weights of the original
+    elements in each dimension in `weight`.
+    """
+    if not dims:
+        return df
+    df = df.assign(_w=1.0)
+    for dim, w in weight.items():
+        df["_w"] *= df.pop(f"_{dim}").map(w).fillna(1.0).to_numpy()
+    grouped = df.assign(_v=df["value"] * df["_w"]).groupby(dims, sort=False)
+    if how.startswith("sum"):
+        value = grouped["value"].sum()
+    else:
+        value = grouped["_v"].sum() / grouped["_w"].sum()
+    result = pd.concat([value.rename("value"), grouped["unit"].first()], axis=1)
+
+    if how == "sum_all":
+        expected = np.ones(len(result))
+        for dim in weight:
+            level = result.index.get_level_values(dim)
+            expected *= sizes.reindex(level, fill_value=1).to_numpy()
+        result = result[grouped.size().to_numpy() == expected]
+
+    return result.reset_index()
+
+
+def _drop_parents(
+    df: pd.DataFrame, dims: list[str], mapped: list[str], parents: Collection[str]
+) -> pd.DataFrame:
+    """Drop rows of `df` for `parents`, if there are also rows for their children."""
+    is_parent = np.zeros(len(df), dtype=bool)
+    for dim in mapped:
+        is_parent |= (
+            df[f"_{dim}"].isin(parents) & (df[f"_{dim}"] == df[dim])
+        ).to_numpy()
+    has_child = (
+        pd.Series(~is_parent, index=df.index)
+        .groupby([df[d] for d in dims])
+        .transform("any")
+    )
+    return df[~(is_parent & has_child.to_numpy())]
+
+
+def _new_scenario(
+    base: "Scenario", model: str | None, scenario: str, annotation: str
+) -> "Scenario":
+    from message_ix.core import Scenario
+
+    return Scenario(
+        base.platform,
+        model or base.model,
+        scenario,
+        version="new",
+        annotation=annotation,
+        scheme=base.scheme,
+    )
+
+
+def _init(base: "Scenario", new: "Scenario", ix_type: str, name: str) -> None:
+    """Initialize item `name` in `new` like in `base`, if it does not exist."""
+    if not getattr(new, f"has_{ix_type}")(name):
+        getattr(new, f"init_{ix_type}")(
+            name, idx_sets=base.idx_sets(name), idx_names=base.idx_names(name)
+        )
+
+
+def _transform(
+    base: "Scenario",
+    new: "Scenario",
+    key: str,
+    mapping: pd.Series,
+    how: Mapping[str, str] = {},
+    exclude: Collection[str] = (),
+    parents: Collection[str] = (),
+    weight: pd.Series | None = None,
+    drop: pd.DataFrame | None = None,
+) -> None:
+    """Copy sets and parameters from `base` to `new`, aggregating `key`.
+
+    Parameters
+    ----------
+    mapping : pandas.Series
+        Index: elements of index set `key` in `base`, as :class:`str`; values: the
+        corresponding elements in `new`. Elements not in the index are dropped.
+    how : dict
+        Parameter name → "sum", "sum_all", or "mean"; see :func:`_aggregate`.
+        Parameters not in `how` are averaged.
+    exclude :
+        Parameters and sets that are not copied.
+    parents :
+        Elements into which their children in a hierarchy are merged. Values of a
+        parameter for these elements are dropped if there are also values for any of
+        their children, to avoid counting the same quantity twice.
+    weight : pandas.Series, optional
+        Weights of the original elements for averages. Default: the values of the
+        parameter in :data:`WEIGHT`, if any; otherwise equal weights.
+    drop : pandas.DataFrame, optional
+        (node_loc, technology) for which parameter values are dropped.
+    """
+    if weight is None:
+        weight = pd.Series(dtype=float)
+        if (w_name := WEIGHT.get(key)) and base.has_par(w_name):
+            w = base.par(w_name)
+            weight = pd.Series(w["value"].to_numpy(), index=w[key].astype(str))
+
+    _transform_sets(base, new, key, mapping, exclude)
+    _transform_pars(base, new, key, mapping, how, exclude, parents, weight, drop)
+
+
+def _transform_sets(
+    base: "Scenario",
+    new: "Scenario",
+    key: str,
+    mapping: pd.Series,
+    exclude: Collection[str],
+) -> None:
+    # Index sets first, then other sets
+    sets = {n: base.set(n) for n in base.set_list() if n not in exclude}
+    names = sorted(sets, key=lambda n: not isinstance(sets[n], pd.Series))
+    for name in names:
+        _init(base, new, "set", name)
+        data = sets[name]
+
+        if isinstance(data, pd.Series):
+            elements = data.astype(str)
+            if name == key:
+                elements = pd.Series(mapping.unique())
+            elif name == ALIAS.get(key):
+                elements = elements.map(mapping).fillna(elements).drop_duplicates()
+            existing = set(map(str, new.set(name)))
+            if missing := [e for e in elements if e not in existing]:
+                new.add_set(name, missing)
+            continue
+        elif data.empty:
+            continue
+
+        data, _ = _map(data, base.idx_sets(name), list(data.columns), mapping, key)
+        data = data.astype(str).drop_duplicates()
+        existing = new.set(name).astype(str)
+        if len(existing):
+            index = pd.MultiIndex.from_frame(existing[data.columns])
+            data = data[~pd.MultiIndex.from_frame(data).isin(index)]
+        if len(data):
+            new.add_set(name, data)
+
+
+def _transform_pars(
+    base: "Scenario",
+    new: "Scenario",
+    key: str,
+    mapping: pd.Series,
+    how: Mapping[str, str],
+    exclude: Collection[str],
+    parents: Collection[str],
+    weight: pd.Series,
+    drop: pd.DataFrame | None,
+) -> None:
+    sizes = mapping.value_counts()
+    drop_index = None if drop is None else pd.MultiIndex.from_frame(drop.astype(str))
+
+    for name in base.par_list():
+        if name in exclude:
+            continue
+        _init(base, new, "par", name)
+        data = base.par(name)
+        if data.empty:
+            continue
+
+        dims = base.idx_names(name)
+        node = next((d for d in ("node_loc", "node") if d in dims), None)
+        if drop_index is not None and node and "technology" in dims:
+            idx = pd.MultiIndex.from_frame(data[[node, "technology"]].astype(str))
+            data = data[~idx.isin(drop_index)]
+
+        # Store the original elements, for weights
+        data = data.assign(**{f"_{d}": data[d].astype(str) for d in dims})
+        data, mapped = _map(data, base.idx_sets(name), dims, mapping, key)
+        if parents and mapped:
+            data = _drop_parents(data, dims, mapped, parents)
+        data = _aggregate(
+            data.drop(columns=[f"_{d}" for d in dims if d not in mapped]),
+            dims,
+            {d: weight for d in mapped},
+            how.get(name, "mean"),
+            sizes,
+        )
+        if len(data):
+            new.add_par(name, data)
+
+
+def coarsen_horizon(
+    scenario: "Scenario",
+    target_years: Iterable[int],
+    *,
+    model: str | None = None,
+    name: str | None = None,
+) -> "Scenario":
+    """Merge periods of `scenario` to create a new scenario with fewer periods.
+
+    This is the inverse of :func:`.add_year`. Each period in the model horizon is
+    merged into the first of the `target_years` that is the same or later. Periods
+    before and including the first model year are kept, whether or not they appear
+    in `target_years`. Periods after the last of `target_years` are dropped.
+
+    For instance, with periods 2020 (the first model year), 2025, 2030, …, 2060,
+    :py:`coarsen_horizon(s, [2030, 2040, 2060])` gives periods 2020, 2030, 2040, and
+    2060, and data for 2025 and 2030 are merged into 2030.
+
+    Data are aggregated as follows:
+
+    - ``duration_period`` is summed, so that each new period covers the same years as
+      the original periods merged into it.
+    - All other parameters with dimensions indexed by ``year`` are averaged over the
+      original periods for which they have values, weighted by ``duration_period``.
+      This applies to both rates (costs, efficiencies, growth rates) and to bounds,
+      because MESSAGE represents activity, capacity, emissions, etc. as annual
+      quantities. For parameters with both ``year_vtg`` and ``year_act``, both are
+      mapped, and the weight is the product of the durations, so that vintages are
+      re-mapped consistently with periods of activity.
+    - Elements of ``type_year`` that are periods, for instance in
+      ``bound_emission``, are mapped in the same way; other elements, such as
+      "cumulative", are kept.
+    - Sets are mapped in the same way, and duplicate elements are dropped.
+
+    The solution of `scenario`, if any, is not copied.
+
+    Parameters
+    ----------
+    target_years :
+        Periods of the new scenario. These must be elements of the ``year`` set.
+    model : str, optional
+        Model name of the new scenario. Default: the model name of `scenario`.
+    name : str, optional
+        Scenario name of the new scenario. Default: the scenario name of `scenario`
+        with " coarsened" appended.
+
+    Returns
+    -------
+    .Scenario
+        The new scenario, committed and with no solution.
+
+    Raises
+    ------
+    ValueError
+        if any of `target_years` are not in the ``year`` set of `scenario`.
+    """
+    years = sorted(map(int, scenario.set("year")))
+    if invalid := sorted(set(map(int, target_years)) - set(years)):
+        raise ValueError(f"Target year(s) {invalid} not in set 'year'")
+
+    fmy = scenario.firstmodelyear
+    targets = np.array(
+        sorted(set(map(int, target_years)) | {y for y in years if y <= fmy})
+    )
+
+    # Map each period to the first target year that is the same or later
+    i = np.searchsorted(targets, years)
+    valid = i < len(targets)
+    mapping = pd.Series(
+        targets[i[valid]].astype(str), index=np.array(years)[valid].astype(str)
+    )
+    log.info(f"Coarsen {len(years)} to {len(targets)} periods")
+
+    new = _new_scenario(
+        scenario,
+        model,
+        name or f"{scenario.scenario} coarsened",
+        f"coarsen_horizon() of {scenario.url} to {targets.tolist()}",
+    )
+    _transform(scenario, new, "year", mapping, how=dict.fromkeys(SUM["year"], "sum"))
+    new.commit(f"Coarsen horizon of {scenario.url}")
+
+    return new
+
+
+def _hierarchy(
+    base: "Scenario", new: "Scenario", key: str, mapping: pd.Series
+) -> pd.DataFrame:
+    """Copy the sets in :data:`HIERARCHY` for `key` from `base` to `new`.
+
+    Rows in which a child is merged into its parent are dropped. Returns the new
+    values of ``map_temporal_hierarchy``.
+    """
+    result = pd.DataFrame()
+    for name, (child, parent) in HIERARCHY[key].items():
+        if not base.has_set(name):
+            continue
+        data = base.set(name).astype(str)
+        mapped = data.assign(
+            **{d: data[d].map(mapping).fillna(data[d]) for d in (child, parent)}
+        )
+        merged = (mapped[child] == mapped[parent]) & (data[child] != data[parent])
+        mapped = mapped[~merged].drop_duplicates()
+        _init(base, new, "set", name)
+        if len(mapped):
+            new.add_set(name, mapped)
+        if name == "map_temporal_hierarchy":
+            result = mapped
+    return result
+
+
+def aggregate_time(
+    scenario: "Scenario",
+    mapping: Mapping[str, str] | None = None,
+    *,
+    level: str | None = None,
+    model: str | None = None,
+    name: str | None = None,
+) -> "Scenario":
+    """Merge sub-annual time slices of `scenario` to create a new scenario.
+
+    Either `mapping` or `level` must be given. For instance, for a scenario with 24
+    hourly time slices in each of 4 seasons, like those created by
+    :func:`.make_subannual`:
+
+    - :py:`aggregate_time(s, level="season")` merges all hours of each season into
+      the season, giving 4 time slices.
+    - :py:`aggregate_time(s, {"winter-h01": "winter-night", "winter-h02":
+      "winter-night", …})` merges hours into new time slices with the given names.
+      Time slices that are not keys of `mapping` are unchanged.
+
+    Data are aggregated as follows:
+
+    - ``duration_time``, ``demand``, and the parameters in :py:`SUM["time"]`, which
+      give activity over the duration of a time slice, are summed.
+    - All other parameters with dimensions indexed by ``time``—including
+      ``capacity_factor``, and the time_origin and time_dest dimensions of ``input``
+      and ``output``—are averaged, weighted by ``duration_time``.
+    - ``map_temporal_hierarchy`` and ``map_time`` are mapped, and rows relating a
+      time slice to the slice it is merged into are dropped. The derived parameter
+      ``duration_time_rel`` is thus consistent with the merged slices.
+    - ``time_order`` is mapped and re-numbered from 1 within each temporal level.
+
+    Parameters
+    ----------
+    mapping : dict, optional
+        Mapping from original to new time slices.
+    level : str, optional
+        Element of ``lvl_temporal``. All time slices at lower levels in the
+        ``map_temporal_hierarchy`` are merged into their ancestor at this level.
+    model : str, optional
+        Model name of the new scenario. Default: the model name of `scenario`.
+    name : str, optional
+        Scenario name of the new scenario. Default: the scenario name of `scenario`
+        with " aggregated" appended.
+
+    Returns
+    -------
+    .Scenario
+        The new scenario, committed and with no solution.
+
+    Raises
+    ------
+    ValueError
+        if neither or both of `mapping` and `level` are given, or keys of `mapping`
+        are not in the ``time`` set.
+    """
+    if (mapping is None) == (level is None):
+        raise ValueError("Give exactly one of mapping= or level=")
+
+    time = pd.Index(scenario.set("time").astype(str))
+    if level is not None:
+        mapping = _ancestors(scenario, level)
+    assert mapping is not None
+    if invalid := sorted(set(mapping) - set(time)):
+        raise ValueError(f"Time slice(s) {invalid} not in set 'time'")
+
+    # Complete mapping, including unchanged time slices
+    full = pd.Series(time, index=time)
+    full.update(pd.Series(mapping, dtype=str))
+    log.info(f"Aggregate {len(time)} to {full.nunique()} time slices")
+
+    new = _new_scenario(
+        scenario,
+        model,
+        name or f"{scenario.scenario} aggregated",
+        f"aggregate_time() of {scenario.url}",
+    )
+    exclude = list(HIERARCHY["time"]) + ["time_order"]
+    _transform(
+        scenario,
+        new,
+        "time",
+        full,
+        how=dict.fromkeys(SUM["time"], "sum"),
+        exclude=exclude,
+        parents=_parents(scenario, mapping),
+    )
+    hierarchy = _hierarchy(scenario, new, "time", full)
+
+    if scenario.has_par("time_order"):
+        # Map, keep only time slices at each level, and renumber
+        data = scenario.par("time_order")
+        data = data.assign(time=data["time"].astype(str).map(full))
+        levels = hierarchy[["lvl_temporal", "time"]] if len(hierarchy) else data
+        data = (
+            data.merge(levels.drop_duplicates())
+            .groupby(["lvl_temporal", "time"], as_index=False)
+            .agg(value=("value", "min"), unit=("unit", "first"))
+        )
+        data["value"] = data.groupby("lvl_temporal")["value"].rank(method="dense")
+        _init(scenario, new, "par", "time_order")
+        if len(data):
+            new.add_par("time_order", data)
+
+    new.commit(f"Aggregate time slices of {scenario.url}")
+
+    return new
+
+
+def _parents(scenario: "Scenario", mapping: Mapping[str, str]) -> set[str]:
+    """Return values of `mapping` that are ancestors of the corresponding keys."""
+    h = scenario.set("map_temporal_hierarchy").astype(str)
+    h = h[h["time"] != h["time_parent"]]
+    parent = dict(zip(h["time"], h["time_parent"]))
+
+    result = set()
+    for child, target in mapping.items():
+        ancestor = child
+        while ancestor in parent and ancestor != target:
+            ancestor = parent[ancestor]
+        if ancestor == target != child:
+            result.add(target)
+    return result
+
+
+def _ancestors(scenario: "Scenario", level: str) -> dict[str, str]:
+    """Map time slices below `level` to their ancestors at `level`."""
+    h = scenario.set("map_temporal_hierarchy").astype(str)
+    lvl = dict(zip(h["time"], h["lvl_temporal"]))
+    if level not in lvl.values():
+        raise ValueError(f"No time slices at level {level!r}")
+
+    h = h[h["time"] != h["time_parent"]]
+    parent = dict(zip(h["time"], h["time_parent"]))
+    result = {}
+    for t in parent:
+        ancestor = t
+        while ancestor in parent and lvl.get(ancestor) != level:
+            ancestor = parent[ancestor]
+        if ancestor != t and lvl.get(ancestor) == level:
+            result[t] = ancestor
+    return result
+
+
+def aggregate_nodes(
+    scenario: "Scenario",
+    mapping: Mapping[str, str],
+    *,
+    weights: Mapping[str, float] | None = None,
+    model: str | None = None,
+    name: str | None = None,
+) -> "Scenario":
+    """Merge nodes of `scenario` to create a new scenario.
+
+    For instance, :py:`aggregate_nodes(s, {"R12_NAM": "NAM+PAO", "R12_PAO":
+    "NAM+PAO"})` merges two regions into a new node with the given name. Nodes that
+    are not keys of `mapping` are unchanged. All nodes merged into the same node must
+    have the same level and parent in ``map_spatial_hierarchy``.
+
+    Data are aggregated as follows:
+
+    - Parameters in :py:`SUM["node"]`, such as ``demand``, ``historical_activity``,
+      lower bounds, and ``resource_volume``, are summed.
+    - Upper bounds in :py:`SUM_ALL["node"]` are summed if there are values for all of
+      the merged nodes. Otherwise the merged node is unbounded.
+    - All other parameters—including costs, efficiencies, and the node_origin and
+      node_dest dimensions of ``input`` and ``output``—are averaged, weighted by
+      `weights`.
+    - Technologies that only trade between nodes that are merged—that is, with all
+      values of ``input`` (``output``) with a node_origin (node_dest) different from
+      node_loc, but merged into the same node—are dropped. Trade via a separate
+      global node is unchanged.
+
+    Parameters
+    ----------
+    mapping : dict
+        Mapping from original to new nodes.
+    weights : dict, optional
+        Weight of each original node, for instance population or GDP, used for
+        averages. Default: equal weights.
+    model : str, optional
+        Model name of the new scenario. Default: the model name of `scenario`.
+    name : str, optional
+        Scenario name of the new scenario. Default: the scenario name of `scenario`
+        with " aggregated" appended.
+
+    Returns
+    -------
+    .Scenario
+        The new scenario, committed and with no solution.
+
+    Raises
+    ------
+    ValueError
+        if keys of `mapping` are not in the ``node`` set, or nodes merged into the
+        same node have different levels or parents.
+    """
+    node = pd.Index(scenario.set("node").astype(str))
+    if invalid := sorted(set(mapping) - set(node)):
+        raise ValueError(f"Node(s) {invalid} not in set 'node'")
+
+    # Complete mapping, including unchanged nodes
+    full = pd.Series(node, index=node)
+    full.update(pd.Series(mapping, dtype=str))
+
+    # Check that merged nodes are peers in the spatial hierarchy
+    h = scenario.set("map_spatial_hierarchy").astype(str)
+    h = h.assign(_new=h["node"].map(full))
+    for new_node, group in h.groupby("_new"):
+        if len(group[["lvl_spatial", "node_parent"]].drop_duplicates()) > 1:
+            raise ValueError(
+                f"Nodes {sorted(group['node'])} merged into {new_node!r} have different"
+                " levels or parents in map_spatial_hierarchy"
+            )
+    log.info(f"Aggregate {len(node)} to {full.nunique()} nodes")
+
+    weight = pd.Series(weights or {}, dtype=float)
+    weight.index = weight.index.astype(str)
+
+    new = _new_scenario(
+        scenario,
+        model,
+        name or f"{scenario.scenario} aggregated",
+        f"aggregate_nodes() of {scenario.url}",
+    )
+    _transform(
+        scenario,
+        new,
+        "node",
+        full,
+        how={
+            **dict.fromkeys(SUM["node"], "sum"),
+            **dict.fromkeys(SUM_ALL["node"], "sum_all"),
+        },
+        weight=weight,
+        drop=_trade(scenario, full),
+    )
+    new.commit(f"Aggregate nodes of {scenario.url}")
+
+    return new
+
+
+def _trade(scenario: "Scenario", mapping: pd.Series) -> pd.DataFrame:
+    """Return (node_loc, technology) that only trade within merged nodes."""
+    dfs = []
+    for name, dim in (("input", "node_origin"), ("output", "node_dest")):
+        df = scenario.par(name).astype({"node_loc": str, dim: str})
+        df = df[df["node_loc"] != df[dim]]
+        dfs.append(
+            df.assign(internal=df["node_loc"].map(mapping) == df[dim].map(mapping))[
+                ["node_loc", "technology", "internal"]
+            ]
+        )
+    df = pd.concat(dfs).astype({"technology": str})
+    internal = df.groupby(["node_loc", "technology"])["internal"].all()
+    return internal[internal].index.to_frame(index=False)
@@ -3,10 +3,13 @@
 # Written by Marek Makowski, ECE Program of IIASA, in March 2023.
 
 import math
-from collections import Counter
+from typing import Any
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
+
+from .result import LPdiagDiff, LPdiagResult
 
 
 class LPdiag:
@@ -51,6 +54,25 @@ class LPdiag:
         )  # sequence_no of the goal function (objective) row: equal = -1, if undefined
         # representation of the LP matrix:
         self.mat = pd.DataFrame(columns=["row", "col", "val"])  # LP matrix
+        # the same matrix in compressed sparse row/col formats
+        self.csr = sparse.csr_array((0, 0))
+        self.csc = sparse.csc_array((0, 0))
+        # per-row/col statistics of the coefficients, see _magnitude_stats()
+        self.row_stats = pd.DataFrame()
+        self.col_stats = pd.DataFrame()
+        # arrays of names, types and bounds, indexed by row/col seq_id; infinite bounds
+        # are represented by -/+ np.inf. Set by set_bounds() after reading the MPS.
+        self.row_names = np.array([], dtype=object)
+        self.row_types = np.array([], dtype=object)
+        self.row_lo = np.array([])
+        self.row_up = np.array([])
+        self.col_names = np.array([], dtype=object)
+        self.col_lo = np.array([])
+        self.col_up = np.array([])
+        # share of non-zeros above which a row/col is reported as dense
+        self.dense_frac = 0.1
+        # key: MPS row/col name, e.g. "e123" or "x456", item: GAMS name; see read_dict()
+        self.names_map = {}
         # cols attributes:
         # self.cols = pd.DataFrame(columns=['seq_id', 'name', 'lo_bnd', 'up_bnd'])
         # rows attributes:
@@ -186,6 +208,8 @@ class LPdiag:
         # (the first N row assumed to be the objective):
         assert self.gf_seq != -1, "objective (goal function) row is undefined."
 
+        n_rows, n_cols = len(self.row_name), len(self.col_name)
+
         # create a df with the matrix coefficients
         self.mat = pd.DataFrame(
             {"row": self.mat_row, "col": self.mat_col, "val": self.mat_val}
@@ -198,32 +222,105 @@ class LPdiag:
         )  # add col with int(log10(coeffs))
         # print(f'matrix after initialization:\n {self.mat}')
 
+        # compressed sparse representations of the matrix; CSR for row-wise and CSC for
+        # column-wise access and reductions
+        coo = sparse.coo_array(
+            (self.mat["val"].to_numpy(), (self.mat["row"], self.mat["col"])),
+            shape=(n_rows, n_cols),
+        )
+        self.csr = coo.tocsr()
+        self.csc = coo.tocsc()
+        # the temporary lists are no longer needed
+        self.mat_row, self.mat_col, self.mat_val = [], [], []
+
+        # row and col attributes (names, types, bounds) as arrays
+        self.set_bounds()
+
+        # per-row and per-col statistics of the coefficients
+        self.row_stats = _magnitude_stats(self.csr)
+        self.col_stats = _magnitude_stats(self.csc)
+
         # Finish the MPS processing with the summary of its attributes
-        dens = f"{float(len(self.mat)) / (len(self.row_name) * len(self.col_name)):.2e}"
+        dens = f"{float(len(self.mat)) / (n_rows * n_cols):.2e}"
         print(
             f"\nFinished processing {self.n_lines} lines of the MPS file: {self.fname}."
         )
         print(
-            f"LP has: {len(self.row_name)} rows, {len(self.col_name)} cols,"
-            f" {len(self.mat)} non-zeros, matrix density = {dens}."
+            f"LP has: {n_rows} rows, {n_cols} cols, {len(self.mat)} non-zeros, matrix"
+            f" density = {dens}."
         )
         print(
             f"Numbers of redefined: RHS = {self.n_rhs}, ranges = {self.n_ranges},"
             f" bounds = {self.n_bounds}."
         )
 
-        # todo: add info on dense rows and cols
+        # info on dense rows and cols
+        n_dense_rows = len(self.dense(by_row=True))
+        n_dense_cols = len(self.dense(by_row=False))
+        print(
+            f"Dense (more than {self.dense_frac:.0%} non-zeros) rows: {n_dense_rows},"
+            f" cols: {n_dense_cols}."
+        )
 
         # info on the GF row, RHS, ranges, bounds
-        df = self.mat.loc[self.mat["row"] == self.gf_seq][
-            "val"
-        ]  # df with values of the GF coefficients.
+        df = pd.Series(self.get_entity_values(self.gf_seq, True), name="val")
         print(
-            f'\nThe GF (objective) row named "{self.seq_row.get(self.gf_seq)[0]}" has'
+            f'\nThe GF (objective) row named "{self.row_names[self.gf_seq]}" has'
             f" {len(df)} elements."
         )
         print(f"Distribution of the GF (objective) values:\n{df.describe()}")
 
+    def set_bounds(self):
+        """Store names, types and bounds of rows and cols as arrays.
+
+        The dictionaries :attr:`seq_row` and :attr:`seq_col`, filled while reading the
+        MPS file, are converted to arrays indexed by the row/col sequence number. The
+        :attr:`infty` marker is represented by :data:`numpy.inf` with the sign implied
+        by the position of the bound.
+        """
+        for kind, seq in ("row", self.seq_row), ("col", self.seq_col):
+            columns = ["name", "lo", "up", "type"][: 4 if kind == "row" else 3]
+            attr = pd.DataFrame.from_dict(
+                seq, orient="index", columns=columns
+            ).sort_index()
+            setattr(self, f"{kind}_names", attr["name"].to_numpy())
+            for bnd, inf in ("lo", -np.inf), ("up", np.inf):
+                values = attr[bnd].where(attr[bnd] != self.infty, inf)
+                setattr(self, f"{kind}_{bnd}", values.astype(float).to_numpy())
+            if kind == "row":
+                self.row_types = attr["type"].to_numpy()
+
+    def dense(self, by_row: bool = True) -> pd.Index:
+        """Return the seq_ids of dense rows or cols.
+
+        A row (col) is dense if the share of its non-zero coefficients among all cols
+        (rows) exceeds :attr:`dense_frac`.
+
+        Parameters
+        ----------
+        by_row : bool
+            True/False for returning the dense rows/cols.
+        """
+        stats, n = (
+            (self.row_stats, self.csr.shape[1])
+            if by_row
+            else (self.col_stats, self.csr.shape[0])
+        )
+        return stats.index[stats["nnz"] > self.dense_frac * n]
+
+    def get_entity_values(self, seq_id: int, by_row: bool = True) -> np.ndarray:
+        """Return the values of the coefficients in either a row or a column.
+
+        Parameters
+        ----------
+        seq_id : int
+            Sequence number of either row or col.
+        by_row : bool
+            True/False for returning the values of the row/col.
+        """
+        m = self.csr if by_row else self.csc
+        return m.data[m.indptr[seq_id] : m.indptr[seq_id + 1]]
+
     def add_row(self, words: list[str], n_line: int):
         """Process current line of the ROWS section.
 
@@ -697,10 +794,7 @@ class LPdiag:
         max_logv = self.mat["log"].max()
 
         # count numbers of coeffs for each order of magnitude of their value
-        distribution_magnitude_counter = Counter(self.mat["log"])
-        distribution_magnitudes = dict(
-            sorted(distribution_magnitude_counter.items())
-        )  # counter (sorted by occurances) --> dict sorted by magnitudes
+        distribution_magnitudes = self.magnitudes()
         print(
             "\nDistribution of int(log10(abs(values))) sorted by magnitudes of values:"
         )
@@ -708,8 +802,8 @@ class LPdiag:
             f"range = [{min_logv}, {max_logv}] (magnitudes with zero-occurrences"
             " skipped)."
         )
-        for magn in distribution_magnitudes:
-            print(f"{magn:3d}: {distribution_magnitudes[magn]:7d}")
+        for magn, count in distribution_magnitudes.items():
+            print(f"{magn:3d}: {count:7d}")
 
         if lo_tail > up_tail:
             print(f"Overlapping distribution tails ({lo_tail}, {up_tail}) reset to 0.")
@@ -730,7 +824,7 @@ class LPdiag:
             for val in [*range(min_logv, lo_tail + 1)]:
                 print(
                     f"Number of log10(values) == {val}:"
-                    f" {self.mat.loc[self.mat['log'] == val]['log'].count()}"
+                    f" {distribution_magnitudes.get(val, 0)}"
                 )
         # up-tail of the distribution
         if max_logv < up_tail:
@@ -747,9 +841,18 @@ class LPdiag:
             for val in [*range(up_tail, max_logv + 1)]:
                 print(
                     f"Number of log10(values) == {val}:"
-                    f" {self.mat.loc[self.mat['log'] == val]['log'].count()}"
+                    f" {distribution_magnitudes.get(val, 0)}"
                 )
 
+    def magnitudes(self) -> pd.Series:
+        """Return numbers of coefficients for each order of magnitude of their values.
+
+        The returned series is indexed by int(log10(abs(coeff))), sorted by magnitudes;
+        magnitudes with zero occurrences are omitted.
+        """
+        magn, count = np.unique(self.mat["log"].to_numpy(), return_counts=True)
+        return pd.Series(count, index=magn, name="count").rename_axis("log")
+
     def locate_outliers(self, small: bool = True, thresh: int = -7, max_rec: int = 500):
         """Locations of outliers, i.e., elements having small/large coefficient values.
 
@@ -780,67 +883,44 @@ class LPdiag:
                 f"\nRow-wise locations of {df['log'].count()} outliers (coeff. with"
                 f" values of log10(values) >= {thresh})."
             )
-        df1 = df.sort_values(
-            "row"
-        )  # sort the df with outliers ascending seq_id of rows
-        df1.reset_index()
-        col_out = []  # col_seq of outliers' cols
-        for n_rows, (_, row) in enumerate(df1.iterrows()):
-            assert n_rows < max_rec, (
-                "To process all requested coeffs modify the safety limit assertion."
-            )
-            row_seq, row_name = self.get_entity_info(
-                row, True
-            )  # row seq_id and name of the current coeff.
-            col_seq, col_name = self.get_entity_info(
-                row, False
-            )  # col seq_id and name of the current coeff.
+        assert len(df) <= max_rec, (
+            "To process all requested coeffs modify the safety limit assertion."
+        )
+        # sort the df with outliers ascending seq_id of rows
+        df1 = df.sort_values("row", kind="stable")
+        # magnitude ranges of the outliers in each row, computed once for all rows
+        out_rows = df1.groupby("row")["log"].agg(["count", "min", "max"])
+        col_out = set()  # col_seq of outliers' cols
+        for row_seq, col_seq, val, log in df1[["row", "col", "val", "log"]].itertuples(
+            index=False
+        ):
+            row_name = self.row_names[row_seq]
             if col_seq not in col_out:
-                col_out.append(col_seq)
+                col_out.add(col_seq)
             else:
                 print(f"{col_seq = } already in another outlier row.")
+            print(f"Coeff. ({row_seq}, {col_seq}): val = {val:.4e}, log(val) = {log:n}")
+            out = out_rows.loc[row_seq]
+            all_ = self.row_stats.loc[row_seq, ["nnz", "min_log", "max_log"]]
+            row_range = self.get_entity_range(row_seq, True)
             print(
-                f"Coeff. ({row_seq}, {col_seq}): val = {row['val']:.4e}, log(val) ="
-                f" {row['log']:n}"
-            )
-            df_row_out = df1.loc[df1["row"] == row_seq]  # df with only outlier elements
-            df_row_all = self.mat.loc[
-                self.mat["row"] == row_seq
-            ]  # df with all elements
-            # print(f'matrix elements in the same row:\n{df_row}')
-            print(
-                f"\tRow {row_name} {self.get_entity_range(row_seq, True)} has"
-                f" {df_row_out['log'].count()} outlier-coeff. of magnitudes in"
-                f" [{df_row_out['log'].min()}, {df_row_out['log'].max()}]"
+                f"\tRow {row_name} {row_range} has {out['count']} outlier-coeff. of"
+                f" magnitudes in [{out['min']}, {out['max']}]"
             )
             print(
-                f"\tRow {row_name} {self.get_entity_range(row_seq, True)} has"
-                f" {df_row_all['log'].count()} (all)-coeff. of magnitudes in"
-                f" [{df_row_all['log'].min()}, {df_row_all['log'].max()}]"
+                f"\tRow {row_name} {row_range} has {all_['nnz']} (all)-coeff. of"
+                f" magnitudes in [{all_['min_log']}, {all_['max_log']}]"
             )
-            # a column may include more than 1 outlier;
-            # therefore columns with outliers reported below:
-            # df with outliers in the same col:
-            # df_col = df1.loc[df1['col'] == col_seq]
-            # print(
-            #     f"\tCol {col_name} {self.get_entity_range(col_seq, False)} has "
-            #     f"{df_col["log"].count()} outlier coeff. of magnitudes in "
-            #     f"[{df_col["log"].min()}, {df_col["log"].max()}]"
-            # )
         print(
             "\nColumn-wise locations of outlier coefficients in"
             f" {len(col_out)} columns:"
         )
-        col_out.sort()
-        for col_seq in col_out:
-            col_name = self.seq_col.get(col_seq)[0]
-            df_col = self.mat.loc[
-                self.mat["col"] == col_seq
-            ]  # df with elements in the same col
+        for col_seq in sorted(col_out):
+            all_ = self.col_stats.loc[col_seq, ["nnz", "min_log", "max_log"]]
             print(
-                f"\tCol {col_name} {self.get_entity_range(col_seq, False)} has"
-                f" {df_col['log'].count()} coeff. of magnitudes in"
-                f" [{df_col['log'].min()}, {df_col['log'].max()}]"
+                f"\tCol {self.col_names[col_seq]}"
+                f" {self.get_entity_range(col_seq, False)} has {all_['nnz']} coeff. of"
+                f" magnitudes in [{all_['min_log']}, {all_['max_log']}]"
             )
 
     def get_entity_info(
@@ -861,13 +941,11 @@ class LPdiag:
         """
 
         if by_row:
-            # if seq_row {} not stored, then:
-            # names = [k for k, idx in self.row_name.items() if idx == ent_seq]
             ent_seq = int(mat_row["row"])
-            name = self.seq_row.get(ent_seq)[0]
+            name = self.row_names[ent_seq]
         else:
             ent_seq = int(mat_row["col"])
-            name = self.seq_col.get(ent_seq)[0]
+            name = self.col_names[ent_seq]
         return ent_seq, name
 
     def get_entity_range(self, seq_id: int, by_row: bool = True) -> str:
@@ -886,30 +964,728 @@ class LPdiag:
         """
 
         if by_row:
-            attr = self.seq_row.get(seq_id)  # [row_name, lo_bnd, up_bnd, row_type]
-            pass
+            bounds = self.row_lo[seq_id], self.row_up[seq_id]
         else:
-            attr = self.seq_col.get(seq_id)  # [col_name, lo_bnd, up_bnd]
-            pass
+            bounds = self.col_lo[seq_id], self.col_up[seq_id]
         s = []  # strings representing lo/up-bounds
-        for pos in [0, 1]:
-            val = attr[pos + 1]  # 0-th element is the name
-            if val == self.infty:  # used for both infinites (positive and negative)
+        for val in bounds:
+            if np.isinf(val):  # used for both infinites (positive and negative)
                 s.append(self.infty)
+            elif abs(val) < 1e-10:
+                s.append("0")  # same string for int and float zeros
             else:
-                if isinstance(val, int):
-                    val = float(val)
-                if abs(val) < 1e-10:
-                    s.append("0")  # same string for int and float zeros
-                else:
-                    val = int(math.log10(abs(val)))
-                    s.append(f"{val}")  # small integer value, no formatting needed
+                s.append(f"{int(math.log10(abs(val)))}")  # small integer value
         ret = "[" + s[0] + ", " + s[1] + "]"
         return ret  # the range is formatted as: '[lo_bnd, up_bnd]'
 
+    def entity_names(self, by_row: bool = True) -> pd.DataFrame:
+        """Return names of rows or cols split into family and index elements.
+
+        Names written by GAMS have the form ``FAMILY(idx1,idx2,…)``, for instance
+        ``COMMODITY_BALANCE_GT(World,coal,secondary,700,year)``. The ``family`` of such
+        a name is the part before the parenthesis, and ``index`` is the tuple of the
+        comma- (or period-) separated elements. For other names, like ``R0001``, the
+        family is the name with any trailing digits stripped, and the index is empty.
+
+        If a dictionary was read with :meth:`read_dict`, the MPS names are first
+        replaced by the corresponding GAMS names.
+
+        Parameters
+        ----------
+        by_row : bool
+            True/False for the names of rows/cols.
+
+        Returns
+        -------
+        pandas.DataFrame
+            indexed by seq_id, with columns ``name``, ``family`` and ``index``.
+        """
+        names = pd.Series(self.row_names if by_row else self.col_names, dtype=str)
+        if self.names_map:
+            names = names.map(self.names_map).fillna(names)
+        parts = names.str.extract(r"^(?P<family>[^(]+)\((?P<index>.*)\)$")
+        plain = parts["family"].isna()
+        parts.loc[plain, "family"] = names[plain].str.replace(r"\d+$", "", regex=True)
+        parts["index"] = (
+            parts["index"]
+            .fillna("")
+            .str.replace("'", "")
+            .map(lambda i: tuple(i.split("," if "," in i else ".")) if i else ())
+        )
+        return parts.assign(name=names)[["name", "family", "index"]]
+
+    def read_dict(self, fname):
+        """Read a dictionary mapping MPS row/col names to GAMS names.
+
+        MPS files written by the GAMS CONVERT tool (or by solvers with generic names)
+        name the rows and cols ``e1``, ``e2``, …, and ``x1``, ``x2``, …. The
+        corresponding dictionary file (for instance, written by CONVERT with the
+        option ``dict=dict.txt``) has lines like::
+
+          e123  COMMODITY_BALANCE_GT(World,coal,secondary,700,year)
+          x456  ACT(World,coal_ppl,690,700,standard,year)
+
+        Any line with two or more words, of which the first is a row or col name in the
+        MPS file, is used; other lines (headers, comments) are skipped. After this
+        call, :meth:`entity_names` and methods using it report the GAMS names.
+        """
+        self.names_map = {}
+        with open(fname, "r") as reader:
+            for line in reader:
+                words = line.split(maxsplit=1)
+                if len(words) == 2 and (
+                    words[0] in self.row_name or words[0] in self.col_name
+                ):
+                    self.names_map[words[0]] = words[1].strip()
+        print(f"\t{len(self.names_map)} names read from dictionary {fname}.")
+
+    def entity_dims(self, by_row: bool = True) -> pd.DataFrame:
+        """Return names of rows or cols with index elements labelled by dimension.
+
+        The families of rows (cols) are matched to equations (variables) in
+        :attr:`.MESSAGE_MACRO.items`. For matched families, each element of the index
+        is stored in a column named after the corresponding dimension, for instance
+        ``node``, ``technology``, or ``year_act``; for other families and dimensions,
+        these columns contain NaN.
+
+        Returns
+        -------
+        pandas.DataFrame
+            indexed by seq_id, with the columns of :meth:`entity_names` and one column
+            for every dimension of any matched item.
+        """
+        from ixmp.backend import ItemType
+
+        from message_ix.message_macro import MESSAGE_MACRO
+
+        names = self.entity_names(by_row)
+        item_type = ItemType.EQU if by_row else ItemType.VAR
+        columns: dict[str, list[pd.Series]] = {}
+        for family, group in names.groupby("family", sort=False)["index"]:
+            item = MESSAGE_MACRO.items.get(str(family))
+            if item is None or item.type != item_type:
+                continue
+            dims = item.dims or item.coords
+            group = group[group.map(len) == len(dims)]
+            if not len(dims) or group.empty:
+                continue
+            values = pd.DataFrame(group.tolist(), index=group.index, columns=dims)
+            for dim in dims:
+                columns.setdefault(dim, []).append(values[dim])
+        dim_values = pd.DataFrame(
+            {dim: pd.concat(v) for dim, v in columns.items()}, index=names.index
+        )
+        return pd.concat([names, dim_values.astype(object)], axis=1)
+
+    def family_stats(
+        self,
+        by_row: bool = True,
+        dims: tuple[str, ...] = (),
+        lo_tail: int = -7,
+        up_tail: int = 6,
+    ) -> pd.DataFrame:
+        """Return coefficient statistics grouped by family of rows or cols.
+
+        Parameters
+        ----------
+        by_row : bool
+            True/False for statistics of rows/cols.
+        dims : tuple of str
+            Dimensions (see :meth:`entity_dims`) to group by in addition to the family,
+            for instance ``("technology",)``.
+        lo_tail, up_tail: int
+            Magnitude orders of the low/upper tails, as for :meth:`print_statistics`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with one row per group, and columns:
+
+            - ``count``: number of rows/cols.
+            - ``nnz``: number of non-zero coefficients.
+            - ``min_log``, ``max_log``: range of int(log10(abs(coeff))).
+            - ``n_lo``, ``n_up``: numbers of coefficients in the low/upper tail.
+            - ``lo_min``, ``lo_max``, ``up_min``, ``up_max``: ranges of the finite
+              lower/upper bounds of the rows/cols.
+        """
+        names = self.entity_dims(by_row) if dims else self.entity_names(by_row)
+        stats = self.row_stats if by_row else self.col_stats
+        lo, up = (self.row_lo, self.row_up) if by_row else (self.col_lo, self.col_up)
+
+        # numbers of outlier coefficients in each row/col
+        seq = self.mat["row" if by_row else "col"]
+        n_tail = {
+            name: np.bincount(seq[mask].to_numpy(), minlength=len(names))
+            for name, mask in (
+                ("n_lo", self.mat["log"] <= lo_tail),
+                ("n_up", self.mat["log"] >= up_tail),
+            )
+        }
+
+        df = names.assign(
+            **stats[["nnz", "min_log", "max_log"]],
+            **n_tail,
+            lo=np.where(np.isinf(lo), np.nan, lo),
+            up=np.where(np.isinf(up), np.nan, up),
+        )
+        # exclude empty rows/cols from the ranges of magnitudes
+        empty = df["nnz"] == 0
+        df.loc[empty, ["min_log", "max_log"]] = np.nan
+        return df.groupby(["family", *dims], dropna=False).agg(
+            count=("name", "count"),
+            nnz=("nnz", "sum"),
+            min_log=("min_log", "min"),
+            max_log=("max_log", "max"),
+            n_lo=("n_lo", "sum"),
+            n_up=("n_up", "sum"),
+            lo_min=("lo", "min"),
+            lo_max=("lo", "max"),
+            up_min=("up", "min"),
+            up_max=("up", "max"),
+        )
+
+    def outliers(self, small: bool = True, thresh: int = -7) -> pd.DataFrame:
+        """Return the outlier coefficients with the families of their rows and cols.
+
+        Parameters
+        ----------
+        small : bool
+            True/False for threshold of either small or large coefficients.
+        thresh : int
+            Magnitude of the threshold, as for :meth:`locate_outliers`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with columns ``row``, ``col``, ``val``, ``log`` (as in :attr:`mat`), and
+            ``row_name``, ``row_family``, ``col_name``, ``col_family``.
+        """
+        mask = self.mat["log"] <= thresh if small else self.mat["log"] >= thresh
+        df = self.mat.loc[mask, ["row", "col", "val", "log"]]
+        for kind in "row", "col":
+            names = self.entity_names(kind == "row")
+            seq = df[kind].to_numpy()
+            df = df.assign(
+                **{
+                    f"{kind}_name": names["name"].to_numpy()[seq],
+                    f"{kind}_family": names["family"].to_numpy()[seq],
+                }
+            )
+        return df.reset_index(drop=True)
+
+    def scale_factors(
+        self, method: str = "geometric", n_pass: int = 10
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Compute row and col scale factors for the matrix coefficients.
+
+        Scaled coefficients are :math:`r_i a_{ij} c_j`, where :math:`r` and :math:`c`
+        are the returned row and col factors.
+
+        Parameters
+        ----------
+        method : str
+            Either "geometric", for the geometric-mean scaling: alternating passes
+            over rows and cols dividing each by
+            :math:`\\sqrt{\\min |a_{ij}| \\cdot \\max |a_{ij}|}`, or
+            "equilibration": rows, then cols divided by their largest :math:`|a_{ij}|`,
+            such that the largest coefficient in each row and col is 1.
+        n_pass : int
+            Maximum number of passes for the geometric-mean scaling. The passes stop
+            earlier once the ratio of largest to smallest scaled coefficient no longer
+            improves by at least 10%.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The row and col factors, indexed by seq_id. Empty rows/cols have factor 1.
+        """
+        if method not in ("geometric", "equilibration"):
+            raise ValueError(f"Unknown scaling method {method!r}.")
+
+        n_rows, n_cols = self.csr.shape
+        r, c = np.ones(n_rows), np.ones(n_cols)
+        # row and col seq_ids of the coefficients in CSR order
+        row = np.repeat(np.arange(n_rows), np.diff(self.csr.indptr))
+        col = self.csr.indices
+        abs_val = np.abs(self.csr.data)
+
+        def _scaled() -> sparse.csr_array:
+            return sparse.csr_array(
+                (abs_val * r[row] * c[col], col, self.csr.indptr), shape=self.csr.shape
+            )
+
+        def _factors(m, by_row) -> np.ndarray:
+            stats = _magnitude_stats(m if by_row else m.tocsc())
+            # Geometric or largest magnitude per row/col
+            mag = stats["max_abs"]
+            if method == "geometric":
+                mag = (stats["min_abs"] * mag).pow(0.5)
+            return (1.0 / mag).fillna(1.0).to_numpy()
+
+        ratio = np.inf
+        for _ in range(n_pass if method == "geometric" else 1):
+            r *= _factors(_scaled(), True)
+            c *= _factors(_scaled(), False)
+            scaled = _scaled().data
+            if not scaled.size:
+                break
+            new_ratio = scaled.max() / scaled.min()
+            if new_ratio > 0.9 * ratio:
+                break
+            ratio = new_ratio
+
+        return r, c
+
+    def scaling_by_family(
+        self, factors: np.ndarray, by_row: bool = True, idx: tuple[int, ...] = ()
+    ) -> pd.DataFrame:
+        """Aggregate scale factors by families of rows or cols.
+
+        Parameters
+        ----------
+        factors : numpy.ndarray
+            Row or col scale factors, for instance from :meth:`scale_factors`.
+        by_row : bool
+            True/False if `factors` are for rows/cols.
+        idx : tuple of int
+            Positions of index elements (see :meth:`entity_names`) to group by in
+            addition to the family. For instance, ``(1,)`` groups the rows of
+            ``COMMODITY_BALANCE_GT(node,commodity,…)`` by commodity.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with one row per group and columns ``count``, ``min``, ``mean``, ``max``
+            of :math:`log_{10}` of the factors; and ``suggested``, the mean rounded to
+            an order of magnitude, i.e. the power of 10 that might be applied to the
+            units of the corresponding equation or variable.
+        """
+        names = self.entity_names(by_row)
+        by = ["family"]
+        for i in idx:
+            by.append(f"idx{i}")
+            names[by[-1]] = names["index"].map(lambda t: t[i] if i < len(t) else "")
+        result = (
+            names.assign(log=np.log10(factors))
+            .groupby(by)["log"]
+            .agg(["count", "min", "mean", "max"])
+        )
+        return result.assign(suggested=result["mean"].round().astype(int))
+
+    def print_scaling(
+        self, method: str = "geometric", max_rec: int = 20, idx: tuple[int, ...] = ()
+    ):
+        """Report the effect of scaling, and scale factors by families of entities.
+
+        The ranges of values of the matrix coefficients before and after scaling with
+        factors from :meth:`scale_factors` are reported, followed by the factors
+        aggregated by :meth:`scaling_by_family` for rows and cols.
+
+        Parameters
+        ----------
+        method : str
+            Scaling method, passed to :meth:`scale_factors`.
+        max_rec : int
+            Maximum number of families reported for rows and for cols; those with the
+            largest absolute suggested (mean) scale factor are reported first.
+        idx : tuple of int
+            Passed to :meth:`scaling_by_family`.
+        """
+        r, c = self.scale_factors(method)
+        abs_val = np.abs(self.csr.data)
+        row = np.repeat(np.arange(self.csr.shape[0]), np.diff(self.csr.indptr))
+        scaled = abs_val * r[row] * c[self.csr.indices]
+
+        print(f"\nScaling of the matrix coefficients ({method} method):")
+        for label, v in ("before", abs_val), ("after", scaled):
+            v = v[v > 0]
+            if not len(v):
+                print(f"\t{label} scaling: no nonzero coefficients.")
+                continue
+            lo, hi = v.min(), v.max()
+            print(
+                f"\t{label} scaling: abs(values) in [{lo:.4e}, {hi:.4e}], ratio of"
+                f" max/min = {hi / lo:.2e} ({math.log10(hi / lo):.1f} orders of"
+                " magnitude)."
+            )
+        for by_row, factors in (True, r), (False, c):
+            df = self.scaling_by_family(factors, by_row, idx)
+            df = df.iloc[np.argsort(-df["mean"].abs().to_numpy(), kind="stable")]
+            kind = "row" if by_row else "col"
+            print(
+                f"\nlog10 of {kind} scale factors by family ({len(df)} families,"
+                f" at most {max_rec} shown):\n{df.head(max_rec)}"
+            )
+
+    def duplicates(
+        self, by_row: bool = True, proportional: bool = True, bits: int = 40
+    ) -> pd.DataFrame:
+        """Return groups of identical or proportional rows or cols.
+
+        Two rows (cols) are duplicates if they have non-zero coefficients in the same
+        cols (rows), and the coefficients are either identical or, with `proportional`,
+        proportional. Such entities bloat the LP and slow presolve; they often result
+        from duplicated relations, or technologies with identical parameters.
+
+        Each row (col) is normalized—its coefficients are divided by the first
+        non-zero, and rounded to `bits` bits of mantissa—and then hashed, using the
+        compressed sparse data. Only entities with equal hashes are then compared
+        exactly, so that the time needed grows linearly with the number of non-zeros.
+        Empty rows/cols are not reported.
+
+        Parameters
+        ----------
+        by_row : bool
+            True/False for duplicates among rows/cols.
+        proportional : bool
+            If :any:`False`, only report entities with identical coefficients.
+        bits : int
+            Precision for comparison of the normalized coefficients.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with one row per duplicated entity, and columns ``group`` (the same
+            integer for all entities in a group of duplicates), ``seq_id``, ``name``,
+            ``family``, ``nnz``, ``factor`` (ratio of the coefficients to those of the
+            first entity in the group), ``lo`` and ``up`` (bounds of the entity).
+        """
+        m = self.csr if by_row else self.csc
+        m.sort_indices()
+        nnz = np.diff(m.indptr)
+        nonempty = np.flatnonzero(nnz)
+        start = m.indptr[nonempty]
+        seq = np.repeat(np.arange(len(nnz)), nnz)
+
+        # normalize by the first non-zero of each entity, then round
+        first = np.ones(len(nnz))
+        if proportional:
+            first[nonempty] = m.data[start]
+        mant, exp = np.frexp(m.data / first[seq])
+        values = np.ldexp(np.round(mant * 2.0**bits) / 2.0**bits, exp)
+
+        # two order-independent 64-bit hashes of the (index, value) pairs
+        with np.errstate(over="ignore"):
+            h1 = _mix(_mix(m.indices.astype(np.uint64)) ^ values.view(np.uint64))
+            h2 = _mix(h1 ^ np.uint64(0x9E3779B97F4A7C15))
+        if len(start):
+            h1, h2 = np.add.reduceat(h1, start), np.add.reduceat(h2, start)
+
+        lo, up = (self.row_lo, self.row_up) if by_row else (self.col_lo, self.col_up)
+        df = pd.DataFrame(
+            dict(
+                seq_id=nonempty, nnz=nnz[nonempty], h1=h1, h2=h2, first=first[nonempty]
+            )
+        )
+        key = ["nnz", "h1", "h2"]
+        df = df[df.duplicated(key, keep=False)].copy()
+
+        # Entities with equal hashes are candidates; compare these exactly, so that
+        # hash collisions are not reported
+        s = m.indptr[df["seq_id"].to_numpy()]
+        df["exact"] = [
+            m.indices[a:b].tobytes() + values[a:b].tobytes()
+            for a, b in zip(s, s + df["nnz"].to_numpy())
+        ]
+        key.append("exact")
+        df = df[df.duplicated(key, keep=False)].copy()
+        df["group"] = df.groupby(key, sort=False).ngroup()
+        df = df.sort_values(["group", "seq_id"])
+        df["factor"] = df["first"] / df.groupby("group")["first"].transform("first")
+
+        names = self.entity_names(by_row)
+        seq_id = df["seq_id"].to_numpy()
+        return df.assign(
+            name=names["name"].to_numpy()[seq_id],
+            family=names["family"].to_numpy()[seq_id],
+            lo=lo[seq_id],
+            up=up[seq_id],
+        )[["group", "seq_id", "name", "family", "nnz", "factor", "lo", "up"]]
+
+    def print_duplicates(
+        self, by_row: bool = True, proportional: bool = True, max_rec: int = 20
+    ):
+        """Report duplicated rows or cols, by family.
+
+        Parameters
+        ----------
+        by_row, proportional :
+            Passed to :meth:`duplicates`.
+        max_rec : int
+            Maximum number of groups of duplicates listed.
+        """
+        df = self.duplicates(by_row, proportional)
+        kind = "rows" if by_row else "cols"
+        what = "identical or proportional" if proportional else "identical"
+        print(
+            f"\n{df['group'].nunique()} groups of {what} {kind}, with {len(df)} {kind}"
+            " in total."
+        )
+        if df.empty:
+            return
+        by_family = df.groupby("family").agg(
+            **{kind: ("seq_id", "count"), "groups": ("group", "nunique")}
+        )
+        print(f"Duplicated {kind} by family:\n{by_family}")
+        print(f"\nFirst (at most {max_rec}) groups:")
+        for i, (group, members) in enumerate(df.groupby("group")):
+            if i >= max_rec:
+                break
+            print(
+                f"\tGroup {group}: "
+                + ", ".join(
+                    f"{name} (factor {factor:.4g})"
+                    for name, factor in zip(members["name"], members["factor"])
+                )
+            )
+
+    def result(self, lo_tail: int = -7, up_tail: int = 6) -> LPdiagResult:
+        """Return the diagnostics as structured tables.
+
+        Unlike :meth:`print_statistics` and :meth:`locate_outliers`, nothing is
+        printed; the returned object can be written to files with
+        :meth:`.LPdiagResult.to_json` or :meth:`.LPdiagResult.to_parquet`.
+
+        Parameters
+        ----------
+        lo_tail, up_tail: int
+            Magnitude orders of the low/upper tails, as for :meth:`print_statistics`.
+            Coefficients in these tails are included in :attr:`.LPdiagResult.outliers`.
+        """
+        n_rows, n_cols = self.csr.shape
+        info = dict(
+            name=self.pname if isinstance(self.pname, str) else " ".join(self.pname),
+            file=str(self.fname),
+            n_lines=self.n_lines,
+            n_rows=n_rows,
+            n_cols=n_cols,
+            nnz=len(self.mat),
+            density=len(self.mat) / (n_rows * n_cols),
+            n_rhs=self.n_rhs,
+            n_ranges=self.n_ranges,
+            n_bounds=self.n_bounds,
+            objective=self.row_names[self.gf_seq],
+            n_dense_rows=len(self.dense(by_row=True)),
+            n_dense_cols=len(self.dense(by_row=False)),
+        )
+        outliers = pd.concat(
+            [
+                self.outliers(small=True, thresh=lo_tail).assign(tail="lo"),
+                self.outliers(small=False, thresh=up_tail).assign(tail="up"),
+            ],
+            ignore_index=True,
+        )
+        rows = self.entity_names(True).assign(
+            type=self.row_types, lo=self.row_lo, up=self.row_up, **self.row_stats
+        )
+        cols = self.entity_names(False).assign(
+            lo=self.col_lo, up=self.col_up, **self.col_stats
+        )
+        objective = (
+            pd.Series(self.get_entity_values(self.gf_seq, True), name="val")
+            .describe()
+            .rename_axis("stat")
+            .reset_index()
+        )
+        return LPdiagResult(
+            info=info,
+            magnitudes=self.magnitudes().reset_index(),
+            outliers=outliers,
+            rows=rows.rename_axis("seq_id").reset_index(),
+            cols=cols.rename_axis("seq_id").reset_index(),
+            objective=objective,
+        )
+
+    def compare(self, other: "LPdiag") -> LPdiagDiff:
+        """Compare the structure and data of this LP with `other`.
+
+        Rows and cols of the two LPs are aligned by name (the GAMS names, if
+        :meth:`read_dict` was used). The coefficients of both matrices are aligned
+        by a hash join on integer keys of their (row, col) positions, so no pairwise
+        comparison of entities or coefficients is needed.
+
+        Returns
+        -------
+        LPdiagDiff
+            Added and removed rows and cols; added, removed, and changed coefficients;
+            and changed bounds, where this LP is "a" and `other` is "b".
+        """
+        entities, bounds, names_u, map_b = [], [], {}, {}
+        for kind in "row", "col":
+            by_row = kind == "row"
+            names_a = self.entity_names(by_row)
+            names_b = other.entity_names(by_row)
+
+            # position of each entity of `other` among those of this LP; -1 if absent
+            pos = pd.Index(names_a["name"]).get_indexer(names_b["name"])
+            added = pos == -1
+            removed = np.ones(len(names_a), dtype=bool)
+            removed[pos[~added]] = False
+            # map from seq_id in `other` to seq_id in the union of both LPs
+            map_b[kind] = pos.copy()
+            map_b[kind][added] = len(names_a) + np.arange(added.sum())
+            names_u[kind] = np.concatenate(
+                [names_a["name"].to_numpy(), names_b["name"].to_numpy()[added]]
+            )
+
+            entities.extend(
+                [
+                    names_b.loc[added, ["name", "family"]].assign(
+                        kind=kind, status="added"
+                    ),
+                    names_a.loc[removed, ["name", "family"]].assign(
+                        kind=kind, status="removed"
+                    ),
+                ]
+            )
+
+            # bounds (and types of rows) of the entities in both LPs
+            common = ~added
+            attrs = dict(lo=f"{kind}_lo", up=f"{kind}_up")
+            if by_row:
+                attrs.update(type="row_types")
+            df = pd.DataFrame({"kind": kind, "name": names_b["name"][common]})
+            changed = np.zeros(common.sum(), dtype=bool)
+            for name, attr in attrs.items():
+                a = getattr(self, attr)[pos[common]]
+                b = getattr(other, attr)[common]
+                changed |= a != b
+                df = df.assign(**{f"{name}_a": a, f"{name}_b": b})
+            bounds.append(df[changed])
+
+        # keys of the coefficients: positions in a matrix of the union of rows and cols
+        n_cols = len(names_u["col"])
+        coeffs = []
+        for lp, suffix in (self, "a"), (other, "b"):
+            row = np.repeat(np.arange(lp.csr.shape[0]), np.diff(lp.csr.indptr))
+            col = lp.csr.indices
+            if suffix == "b":
+                row, col = map_b["row"][row], map_b["col"][col]
+            coeffs.append(
+                pd.DataFrame(
+                    {
+                        "key": row.astype(np.int64) * n_cols + col,
+                        f"val_{suffix}": lp.csr.data,
+                    }
+                )
+            )
+        coef = coeffs[0].merge(coeffs[1], on="key", how="outer")
+        status = np.select(
+            [
+                coef["val_a"].isna(),
+                coef["val_b"].isna(),
+                coef["val_a"] != coef["val_b"],
+            ],
+            ["added", "removed", "changed"],
+            "",
+        )
+        coef = coef.assign(status=status)[status != ""]
+        key = coef.pop("key").to_numpy()
+        with np.errstate(divide="ignore"):
+            log_delta = np.log10(coef["val_b"].abs()) - np.log10(coef["val_a"].abs())
+        coef = coef.assign(
+            row_name=names_u["row"][key // n_cols],
+            col_name=names_u["col"][key % n_cols],
+            log_delta=log_delta,
+        )[["row_name", "col_name", "val_a", "val_b", "status", "log_delta"]]
+
+        entities_df = pd.concat(entities, ignore_index=True)[
+            ["kind", "name", "family", "status"]
+        ]
+        bounds_df = pd.concat(bounds, ignore_index=True)
+        info: dict[str, Any] = {"file_a": str(self.fname), "file_b": str(other.fname)}
+        for kind in "row", "col":
+            for change in "added", "removed":
+                info[f"n_{kind}s_{change}"] = int(
+                    (
+                        (entities_df["kind"] == kind)
+                        & (entities_df["status"] == change)
+                    ).sum()
+                )
+            info[f"n_{kind}s_bounds_changed"] = int((bounds_df["kind"] == kind).sum())
+        for change in "added", "removed", "changed":
+            info[f"n_coeffs_{change}"] = int((coef["status"] == change).sum())
+
+        return LPdiagDiff(
+            info=info,
+            entities=entities_df,
+            coefficients=coef.reset_index(drop=True),
+            bounds=bounds_df,
+        )
+
+    def print_compare(self, other: "LPdiag", max_rec: int = 20):
+        """Report the differences between this LP and `other`.
+
+        Parameters
+        ----------
+        other : LPdiag
+            LP to compare with, passed to :meth:`compare`.
+        max_rec : int
+            Maximum number of records listed for each kind of difference; the
+            coefficients with the largest changes of magnitude are listed first.
+        """
+        diff = self.compare(other)
+        print(f"\nComparison of {self.fname} (a) with {other.fname} (b):")
+        for k, v in diff.info.items():
+            if k.startswith("n_"):
+                print(f"\t{k[2:].replace('_', ' ')}: {v}")
+        coef = diff.coefficients
+        order = np.argsort(
+            -coef["log_delta"].abs().fillna(np.inf).to_numpy(), kind="stable"
+        )
+        with pd.option_context("display.width", 120, "display.max_columns", None):
+            for title, df in (
+                ("Added and removed rows and cols", diff.entities),
+                ("Changed bounds of rows and cols", diff.bounds),
+                ("Added, removed, and changed coefficients", coef.iloc[order]),
+            ):
+                if len(df):
+                    print(f"\n{title} (at most {max_rec} shown):\n{df.head(max_rec)}")
+
     def plot_hist(self):
         """Plot histograms.
 
         .. note:: Not implemented.
         """
         raise NotImplementedError
+
+
+def _magnitude_stats(m: sparse.csr_array | sparse.csc_array) -> pd.DataFrame:
+    """Return statistics of the coefficients in each row (CSR) or col (CSC) of `m`.
+
+    The statistics are computed with one reduction over the compressed data, and
+    include the number of non-zeros (``nnz``), the minimum and maximum of abs(coeff)
+    (``min_abs``, ``max_abs``) and the corresponding int(log10(abs(coeff)))
+    (``min_log``, ``max_log``). For empty rows/cols, the latter are NaN and 0.
+    """
+    m.sort_indices()
+    nnz = np.diff(m.indptr)
+    nonempty = nnz > 0
+    abs_val = np.abs(m.data)
+    min_abs = np.full(len(nnz), np.nan)
+    max_abs = np.full(len(nnz), np.nan)
+    if abs_val.size:
+        start = m.indptr[:-1][nonempty]
+        min_abs[nonempty] = np.minimum.reduceat(abs_val, start)
+        max_abs[nonempty] = np.maximum.reduceat(abs_val, start)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_log, max_log = (
+            np.nan_to_num(np.log10(v), nan=0, posinf=0, neginf=0).astype(int)
+            for v in (min_abs, max_abs)
+        )
+    return pd.DataFrame(
+        dict(
+            nnz=nnz,
+            min_abs=min_abs,
+            max_abs=max_abs,
+            min_log=min_log,
+            max_log=max_log,
+        )
+    )
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Mix the bits of unsigned 64-bit integers `x` (the finalizer of SplitMix64)."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
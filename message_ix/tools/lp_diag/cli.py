@@ -51,14 +51,43 @@ import click
     help="Magnitude order of the upper tail (default: 5).",
 )
 @click.option("--outp", "fn_outp", metavar="PATH", help="Path for file output.")
-def main(w_dir: Path, prob_id: Path, fn_outp: Path | None, lo_tail, up_tail) -> None:
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["text", "json", "parquet"]),
+    default="text",
+    help="Output format (default: text). For parquet, --outp is a directory.",
+)
+@click.option(
+    "--diff",
+    "diff",
+    type=click.Path(path_type=Path),
+    nargs=2,
+    default=None,
+    metavar="A.mps B.mps",
+    help="Compare two MPS files instead of analysing --mps.",
+)
+def main(
+    w_dir: Path,
+    prob_id: Path,
+    fn_outp: Path | None,
+    lo_tail,
+    up_tail,
+    fmt: str,
+    diff: tuple[Path, Path] | None,
+) -> None:
     """Diagnostics of basic properties of LP problems stored in the MPS format.
 
+    With --format json or parquet, the diagnostics are written as structured tables
+    to --outp (or, for json, to stdout), and the progress messages to stderr.
+
     \b
     Examples:
       message-ix lp-diag
       message-ix lp-diag --help
       message-ix lp-diag --mps test_mps/aez --outp foo.txt
+      message-ix lp-diag --mps test_mps/aez --format json --outp foo.json
+      message-ix lp-diag --diff before.mps after.mps
     """
     # This function is a driver of the LP diagnostics provided by LPdiag class. It
     # defines the working space, then controls the flow by executing the desired methods
@@ -67,18 +96,93 @@ def main(w_dir: Path, prob_id: Path, fn_outp: Path | None, lo_tail, up_tail) ->
     # Only import if the command is to be run
     from . import LPdiag
 
+    if fmt == "parquet" and not fn_outp:
+        raise click.UsageError("--format parquet requires --outp")
+
     # Start time
     tstart = dt.now()
 
-    # Change the working directory, if specified
+    default_stdout = sys.stdout
     work_dir = Path.cwd()
-    print(f"work_dir: '{work_dir}'")
+    f_out = None
+    try:
+        if fmt != "text":
+            # Keep stdout for the structured output; progress messages go to stderr
+            sys.stdout = sys.stderr
+
+        # Change the working directory, if specified
+        print(f"work_dir: '{work_dir}'")
+
+        if len(str(w_dir)) > 1:
+            print(f"Changing work-directory to: {w_dir}.")
+            # NB click.Path(exists=True) ensures this directory, if given, exists
+            os.chdir(w_dir)
+
+        # Resolve relative paths or bare file names relative to the working directory
+        # and check the existence and accessibility of the MPS file(s)
+        mps_paths = [_check_mps(p) for p in (diff or (prob_id,))]
+
+        if fn_outp and fmt == "text":
+            print(f"Stdout redirected to: {fn_outp}")
+            f_out = open(fn_outp, "w")
+            sys.stdout = f_out
+
+        # Read MPS file(s) and store the matrix in a data frame
+        lps = []
+        for mps_path in mps_paths:
+            lps.append(LPdiag())
+            lps[-1].read_mps(mps_path)
+
+        if diff:
+            # Compare the two files
+            if fmt == "text":
+                lps[0].print_compare(lps[1])
+            else:
+                _write(lps[0].compare(lps[1]), fmt, fn_outp, default_stdout)
+        elif fmt == "text":
+            lp = lps[0]
+            # Print statistics of matrix coefficients including distribution tails
+            lp.print_statistics(lo_tail=lo_tail, up_tail=up_tail)
+
+            # Locations of small-value outliers
+            lp.locate_outliers(small=True, thresh=lo_tail, max_rec=100)
+            # Locations of large-value outliers
+            # NB(PNK) This thresh was hard-coded as 6, versus print_statistics(…,
+            #         up_tail=5) above. Assuming these represent sane defaults reached
+            #         through testing, keep the difference of +1.
+            lp.locate_outliers(small=False, thresh=up_tail + 1, max_rec=500)
+        else:
+            # Same thresholds as for locate_outliers() above
+            result = lps[0].result(lo_tail=lo_tail, up_tail=up_tail + 1)
+            _write(result, fmt, fn_outp, default_stdout)
+
+        if f_out:
+            # Close the redirected output
+            f_out.close()
+            sys.stdout = default_stdout
+            print(
+                f"\nRedirected stdout stored in {fn_outp}. Now writing to the console."
+            )
+
+        # Change directory back to work_dir
+        if len(str(w_dir)) > 1:
+            os.chdir(work_dir)
+
+        tend = dt.now()
+        time_diff = tend - tstart
+        print("\nStarted at: ", str(tstart))
+        print("Finished at:", str(tend))
+        print(f"Wall-clock execution time: {time_diff.seconds} sec.")
+    finally:
+        # Restore stdout and the working directory, also if an exception occurs
+        if f_out:
+            f_out.close()
+        sys.stdout = default_stdout
+        os.chdir(work_dir)
 
-    if len(str(w_dir)) > 1:
-        print(f"Changing work-directory to: {w_dir}.")
-        # NB click.Path(exists=True) ensures this directory, if given, exists
-        os.chdir(w_dir)
 
+def _check_mps(prob_id: Path) -> Path:
+    """Return the path to the MPS file `prob_id`; check that it can be read."""
     if not prob_id.is_absolute():
         # Resolve a relative path or bare file name relative to the working directory
         mps_path = Path.cwd().joinpath(prob_id)
@@ -94,41 +198,15 @@ def main(w_dir: Path, prob_id: Path, fn_outp: Path | None, lo_tail, up_tail) ->
     elif not os.access(mps_path, os.R_OK):
         raise click.ClickException(f"MPS file {prob_id} is not readable.")
 
-    default_stdout = sys.stdout
-    if fn_outp:
-        print(f"Stdout redirected to: {fn_outp}")
-        f_out = open(fn_outp, "w")
-        sys.stdout = f_out
-    else:
-        f_out = None
-
-    # Read MPS file and store the matrix in a data frame
-    lp = LPdiag()
-    lp.read_mps(mps_path)
-
-    # Print statistics of matrix coefficients including distribution tails
-    lp.print_statistics(lo_tail=lo_tail, up_tail=up_tail)
-
-    # Locations of small-value outliers
-    lp.locate_outliers(small=True, thresh=lo_tail, max_rec=100)
-    # Locations of large-value outliers
-    # NB(PNK) This thresh was hard-coded as 6, versus print_statistics(…, up_tail=5)
-    #         above. Assuming these represent sane defaults reached through testing,
-    #         keep the difference of +1.
-    lp.locate_outliers(small=False, thresh=up_tail + 1, max_rec=500)
-
-    if f_out:
-        # Close the redirected output
-        f_out.close()
-        sys.stdout = default_stdout
-        print(f"\nRedirected stdout stored in {fn_outp}. Now writing to the console.")
+    return mps_path
 
-    # Change directory back to work_dir
-    if len(str(w_dir)) > 1:
-        os.chdir(work_dir)
 
-    tend = dt.now()
-    time_diff = tend - tstart
-    print("\nStarted at: ", str(tstart))
-    print("Finished at:", str(tend))
-    print(f"Wall-clock execution time: {time_diff.seconds} sec.")
+def _write(result, fmt: str, fn_outp: Path | None, stdout) -> None:
+    """Write `result` (:class:`.LPdiagResult` or :class:`.LPdiagDiff`) in `fmt`."""
+    if fmt == "parquet":
+        result.to_parquet(fn_outp)
+    elif fn_outp:
+        result.to_json(fn_outp)
+    else:
+        stdout.write(result.to_json() + "\n")
+    print(f"Diagnostics written in {fmt} format to: {fn_outp or 'stdout'}")
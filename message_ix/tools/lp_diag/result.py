@@ -0,0 +1,125 @@
+"""Structured results of :mod:`.lp_diag`."""
+
+import json
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, overload
+
+import pandas as pd
+
+
+class _Tables:
+    """Common methods for dataclasses with :attr:`info` and tables."""
+
+    info: dict[str, Any]
+
+    @property
+    def tables(self) -> dict[str, pd.DataFrame]:
+        """All tables, keyed by name."""
+        names = [f.name for f in fields(self)]  # type: ignore [arg-type]
+        return {name: getattr(self, name) for name in names if name != "info"}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable :class:`dict` of :attr:`info` and all tables.
+
+        Each table is represented as a list of records. Infinite bounds and missing
+        values are represented by :any:`None`.
+        """
+        result: dict[str, Any] = {"info": self.info}
+        for name, df in self.tables.items():
+            result[name] = json.loads(df.to_json(orient="records"))
+        return result
+
+    @overload
+    def to_json(self, path: None = None, **kwargs) -> str: ...
+
+    @overload
+    def to_json(self, path: Path | str, **kwargs) -> None: ...
+
+    def to_json(self, path=None, **kwargs):
+        """Write the result as JSON.
+
+        Parameters
+        ----------
+        path : os.PathLike, optional
+            If given, write to this file. Otherwise, return the JSON string.
+        kwargs
+            Passed to :func:`json.dumps`.
+        """
+        text = json.dumps(self.to_dict(), **kwargs)
+        if path is None:
+            return text
+        Path(path).write_text(text)
+        return None
+
+    def to_parquet(self, path: Path | str) -> None:
+        """Write the result as Parquet files in the directory `path`.
+
+        Each table is written to a file like :file:`{name}.parquet`; :attr:`info` is
+        written to :file:`info.json`. This requires :mod:`pyarrow` or
+        :mod:`fastparquet`.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        path.joinpath("info.json").write_text(json.dumps(self.info))
+        for name, df in self.tables.items():
+            # Parquet requires str column names and uniformly-typed columns
+            df.rename(columns=str).astype(
+                {c: str for c in df.columns if df[c].dtype == object}
+            ).to_parquet(path.joinpath(f"{name}.parquet"))
+
+
+@dataclass
+class LPdiagResult(_Tables):
+    """Machine-readable diagnostics of an LP, as returned by :meth:`.LPdiag.result`.
+
+    Each table is a :class:`pandas.DataFrame`; :attr:`info` contains scalar
+    attributes of the LP.
+    """
+
+    #: Problem name, file name, numbers of rows, cols, non-zeros, RHS, ranges, bounds,
+    #: and the matrix density.
+    info: dict[str, Any] = field(default_factory=dict)
+
+    #: Numbers of coefficients for each order of magnitude, int(log10(abs(coeff))).
+    magnitudes: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Coefficients in the low and upper tails, with a column "tail" with values "lo"
+    #: or "up", and the names and families of their rows and cols.
+    outliers: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Name, family, type, bounds and statistics of the coefficients of each row.
+    rows: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Name, family, bounds and statistics of the coefficients of each col.
+    cols: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Distribution (count, mean, std, min, quartiles, max) of the objective
+    #: coefficients.
+    objective: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+@dataclass
+class LPdiagDiff(_Tables):
+    """Structural differences between two LPs, as returned by :meth:`.LPdiag.compare`.
+
+    In all tables, suffixes ``_a`` and ``_b`` denote values in the first and second
+    LP, respectively.
+    """
+
+    #: File names, and numbers of added, removed, and changed entities.
+    info: dict[str, Any] = field(default_factory=dict)
+
+    #: Added and removed rows and cols: columns "kind" ("row" or "col"), "name",
+    #: "family", and "status" ("added" or "removed").
+    entities: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Added, removed, and changed coefficients: columns "row_name", "col_name",
+    #: "val_a", "val_b", "status", and "log_delta", the difference of log10(abs(val))
+    #: between the LPs (NaN for added or removed coefficients).
+    coefficients: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    #: Rows and cols present in both LPs, of which the type (rows only), lower or upper
+    #: bound (for rows: the RHS and ranges) differ: columns "kind", "name", "type_a",
+    #: "type_b", "lo_a", "lo_b", "up_a", "up_b".
+    bounds: pd.DataFrame = field(default_factory=pd.DataFrame)
@@ -0,0 +1,252 @@
+"""Remove technologies that cannot contribute to the solution of a scenario.
+
+Large scenarios may contain technologies whose inputs can never be produced, or whose
+outputs are never demanded. MESSAGE still generates variables (``ACT``, ``CAP``, …)
+and equations for these technologies. :func:`prune` removes the data for such
+technologies, which reduces the size of the LP without changing its optimum.
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from message_ix.util.flow import FlowGraph
+
+if TYPE_CHECKING:
+    import ixmp
+
+log = logging.getLogger(__name__)
+
+#: Columns of the data frame returned by :func:`find_unreachable`.
+COLUMNS = ["node_loc", "technology", "reason"]
+
+#: Parameters for which any value for a technology means it must not be pruned: they
+#: may force a technology to be active, or make activity useful regardless of demand.
+ANCHOR_PARS = (
+    "bound_activity_lo",
+    "bound_new_capacity_lo",
+    "bound_total_capacity_lo",
+    "historical_activity",
+    "historical_new_capacity",
+    "min_utilization_factor",
+    "relation_activity",
+    "relation_new_capacity",
+    "relation_total_capacity",
+    "share_mode_lo",
+    "share_mode_up",
+)
+
+#: Parameters for which negative values mean a technology must not be pruned.
+ANCHOR_NEGATIVE = ("emission_factor", "fix_cost", "inv_cost", "var_cost")
+
+
+def _par(scenario: "ixmp.Scenario", name: str) -> pd.DataFrame:
+    return scenario.par(name) if scenario.has_par(name) else pd.DataFrame()
+
+
+def _tec(df: pd.DataFrame) -> pd.DataFrame:
+    """Return unique (node_loc, technology) in `df`, as :class:`str`."""
+    node = next(
+        c for c in ("node_loc", "node", "node_rel", "node_share") if c in df.columns
+    )
+    return (
+        df[[node, "technology"]]
+        .astype(str)
+        .set_axis(COLUMNS[:2], axis=1)
+        .drop_duplicates()
+    )
+
+
+def _anchors(scenario: "ixmp.Scenario") -> pd.DataFrame:
+    """Return (node_loc, technology) that must not be pruned."""
+    dfs = []
+    for name in ANCHOR_PARS + ANCHOR_NEGATIVE:
+        df = _par(scenario, name)
+        if name in ANCHOR_NEGATIVE and len(df):
+            df = df[df["value"] < 0]
+        if len(df):
+            dfs.append(_tec(df))
+
+    # Parent technologies of add-on technologies, and add-on technologies themselves.
+    # Storage technologies and reservoirs. These are anchored at every node.
+    tecs: set[str] = set()
+    for name, columns in (
+        ("map_tec_addon", ["technology"]),
+        ("cat_addon", ["technology_addon"]),
+        ("map_tec_storage", ["technology", "storage_tec"]),
+    ):
+        if scenario.has_set(name):
+            df = pd.DataFrame(scenario.set(name))
+            for column in columns:
+                tecs.update(df[column])
+
+    result = pd.concat([pd.DataFrame(columns=COLUMNS[:2])] + dfs)
+    return pd.concat(
+        [result, pd.DataFrame({"node_loc": "*", "technology": sorted(map(str, tecs))})]
+    ).drop_duplicates()
+
+
+def find_unreachable(
+    scenario: "ixmp.Scenario", graph: FlowGraph | None = None
+) -> pd.DataFrame:
+    """Return technologies in `scenario` that cannot contribute to the solution.
+
+    The analysis uses a :class:`.FlowGraph` of the values of ``input`` and ``output``
+    (and ``input_cap``, ``output_cap``, etc.). A technology is **unreachable** if
+    either:
+
+    1. "no supply": it cannot be reached from any source of flows. Sources are flows
+       at levels in the sets ``level_resource``, ``level_renewable``, or
+       ``level_stocks``; flows in ``land_output`` or with negative ``demand``; and
+       technologies without input.
+    2. "no demand": no demand can be reached from it. Demands are flows with positive
+       values of ``demand`` or in ``land_input``.
+
+    The analysis is conservative:
+
+    - Values for all periods, modes, and time slices are combined.
+    - A technology with several inputs is reachable if *any* of them is reachable.
+    - Technologies with values for any of :data:`ANCHOR_PARS`, with negative values for
+      any of :data:`ANCHOR_NEGATIVE`, or that are add-on or storage technologies, are
+      never unreachable. These are also treated as both sources and demands.
+
+    Parameters
+    ----------
+    graph : .FlowGraph, optional
+        Graph of flows in `scenario`. If not given, :meth:`.FlowGraph.from_scenario` is
+        used.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns :data:`COLUMNS`.
+    """
+    graph = FlowGraph.from_scenario(scenario) if graph is None else graph
+    if len(graph.technologies) == 0:
+        return pd.DataFrame(columns=COLUMNS)
+
+    anchors = _anchors(scenario)
+    tecs = graph.technologies
+    i_tec = np.arange(len(graph.flows), graph.N)
+
+    # Identify anchor technologies
+    is_anchor = tecs.isin(pd.MultiIndex.from_frame(anchors)) | tecs.get_level_values(
+        "technology"
+    ).isin(anchors.query("node_loc == '*'")["technology"])
+
+    # Sources
+    levels: set[str] = set()
+    for name in ("level_resource", "level_renewable", "level_stocks"):
+        if scenario.has_set(name):
+            levels.update(map(str, scenario.set(name)))
+    dem = _par(scenario, "demand")
+    demand = {
+        "lo": dem[dem["value"] < 0] if len(dem) else dem,
+        "up": dem[dem["value"] > 0] if len(dem) else dem,
+    }
+    land = {name: _par(scenario, name) for name in ("land_input", "land_output")}
+
+    def _flows(df: pd.DataFrame) -> np.ndarray:
+        return graph.flow_index(df) if len(df) else np.array([], dtype=int)
+
+    has_input = np.zeros(graph.N, dtype=bool)
+    has_input[graph.matrix.indices] = True
+    sources = np.concatenate(
+        [
+            graph.flow_index(level=sorted(levels)),
+            _flows(land["land_output"]),
+            _flows(demand["lo"]),
+            i_tec[~has_input[i_tec]],
+            i_tec[is_anchor],
+        ]
+    )
+    demands = np.concatenate(
+        [_flows(demand["up"]), _flows(land["land_input"]), i_tec[is_anchor]]
+    )
+
+    supplied = graph.reachable(sources)[i_tec]
+    demanded = graph.reachable(demands, reverse=True)[i_tec]
+
+    result = tecs.to_frame(index=False).assign(
+        reason=np.where(supplied, "no demand", "no supply")
+    )
+    return result[~((supplied & demanded) | is_anchor)].reset_index(drop=True)
+
+
+def prune(
+    scenario: "ixmp.Scenario", unreachable: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Remove data for unreachable technologies from `scenario`.
+
+    All values of parameters and sets with both "technology" and "node_loc" (or
+    "node") dimensions, for the (node_loc, technology) in `unreachable`, are removed in
+    a single :meth:`.transact` block. Because this modifies `scenario`, it should
+    usually be applied to a :meth:`~.Scenario.clone`:
+
+    .. code-block:: python
+
+       s = base.clone(scenario="pruned", keep_solution=False)
+       pruned = prune(s)
+       s.solve()
+
+    Parameters
+    ----------
+    unreachable : pandas.DataFrame, optional
+        Output of :func:`find_unreachable`. If not given, :func:`find_unreachable` is
+        called.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `unreachable`, i.e. the technologies that were pruned.
+
+    Raises
+    ------
+    ValueError
+        if `scenario` has a solution.
+    """
+    from message_ix.message import MESSAGE
+
+    if scenario.has_solution():
+        raise ValueError(f"{scenario.url} has a solution; use remove_solution() first")
+
+    unreachable = find_unreachable(scenario) if unreachable is None else unreachable
+    if unreachable.empty:
+        log.info("No unreachable technologies")
+        return unreachable
+
+    keys = pd.MultiIndex.from_frame(unreachable[COLUMNS[:2]].astype(str))
+
+    with scenario.transact(f"Prune {len(unreachable)} unreachable technologies"):
+        for name, info in MESSAGE.items.items():
+            dims = list(info.dims or info.coords)
+            node = next((d for d in ("node_loc", "node") if d in dims), None)
+            if (
+                info.ix_type not in ("par", "set")
+                or "technology" not in dims
+                or node is None
+                or not getattr(scenario, f"has_{info.ix_type}")(name)
+            ):
+                continue
+
+            df = getattr(scenario, info.ix_type)(name)
+            if df.empty:
+                continue
+            df = df[
+                pd.MultiIndex.from_frame(df[[node, "technology"]].astype(str)).isin(
+                    keys
+                )
+            ]
+            if len(df):
+                log.info(f"Remove {len(df)} element(s) of {name!r}")
+                getattr(scenario, f"remove_{info.ix_type}")(
+                    name, df.drop(columns=["value", "unit"], errors="ignore")
+                )
+
+    log.info(
+        f"Pruned {len(unreachable)} (node_loc, technology): "
+        + unreachable.groupby("reason").size().to_string()
+    )
+    return unreachable
@@ -6,6 +6,8 @@ from pyam.str import get_variable_components
 if TYPE_CHECKING:
     import pyam
 
+    from message_ix.util.flow import FlowGraph
+
 log = logging.getLogger(__name__)
 
 
@@ -33,7 +35,10 @@ def get_start_and_end_index(variable: str) -> tuple[list[int], list[int]]:
 
 
 def map_for_sankey(
-    iam_df: "pyam.IamDataFrame", node: str, exclude: list[str] = []
+    iam_df: "pyam.IamDataFrame",
+    node: str,
+    exclude: list[str] = [],
+    graph: "FlowGraph | None" = None,
 ) -> dict[str, tuple[str, str]]:
     """Maps input to output flows to enable Sankey diagram.
 
@@ -45,16 +50,24 @@ def map_for_sankey(
         The node (MESSAGEix) or region (pyam) to plot.
     exclude : list[str], optional
         Flows to omit from the diagram. By default, nothing is excluded.
+    graph : .FlowGraph, optional
+        Graph of flows in the scenario from which `iam_df` was reported. If given, the
+        sources and targets of variables are taken from
+        :meth:`.FlowGraph.sankey_mapping`. Otherwise, or for variables not in `graph`,
+        they are parsed from the variable names.
 
     Returns
     -------
     dict
         mapping from variable names to 2-tuples of their (inputs, output) flows.
     """
-    result = {
-        var: get_source_and_target(var)
+    known = graph.sankey_mapping(node) if graph else {}
+    flows = {
+        var: known.get(var) or get_source_and_target(var)
         for var in iam_df.filter(region=node + "*").variable
-        if not exclude_flow(get_source_and_target(var), exclude)
+    }
+    result = {
+        var: flow for var, flow in flows.items() if not exclude_flow(flow, exclude)
     }
 
     if not result:
@@ -64,3 +77,10 @@ def map_for_sankey(
         )
 
     return result
+
+
+def _map_for_sankey(
+    iam_df: "pyam.IamDataFrame", graph: "FlowGraph", *, node: str, exclude: list[str]
+) -> dict[str, tuple[str, str]]:
+    """:func:`map_for_sankey` with `graph` as a positional argument, for genno."""
+    return map_for_sankey(iam_df, node, exclude, graph)
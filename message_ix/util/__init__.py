@@ -12,6 +12,7 @@ from pandas.api.types import is_scalar
 
 from message_ix.macro import MACRO
 from message_ix.message import MESSAGE
+from message_ix.message_macro import MESSAGE_MACRO
 
 if TYPE_CHECKING:
     from message_ix.core import Scenario
@@ -300,19 +301,186 @@ def expand_dims(scenario: "Scenario", name, **data):
     4. Adds the expanded data.
 
     The modifications (steps 3 and 4) are wrapped using :meth:`.transact`.
+
+    See also
+    --------
+    check_schema
+    fix_schema
     """
     # NB could be improved by allowing `data` to include callables; these would be
     #    pd.DataFrame.apply(…)'d to each row in order to compute values for the new
     #    dimension(s).
+    with scenario.transact(f"expand_dims({name}, …)"):
+        _expand_dims(scenario, name, **data)
+
+
+def _expand_dims(scenario: "Scenario", name: str, **data) -> None:
+    """Expand dimensions of parameter or set `name`; see :func:`expand_dims`.
+
+    The caller must check out `scenario`.
+    """
+    info = MESSAGE_MACRO.items[name]
 
     # Create the expanded data
-    new_data = make_df(name, **scenario.par(name), **data)
+    new_data = make_df(name, **getattr(scenario, info.ix_type)(name), **data)
     assert not new_data.isna().any(axis=None), "Expanded data are incomplete"
 
-    with scenario.transact(f"expand_dims({name}, …)"):
-        # Remove the parameter entirely, and re-initialize
-        scenario.remove_par(name)
-        MESSAGE.initialize_items(scenario, {name: MESSAGE.items[name].to_dict()})
+    # Remove the item entirely, and re-initialize
+    getattr(scenario, f"remove_{info.ix_type}")(name)
+    MESSAGE_MACRO.initialize_items(scenario, {name: info.to_dict()})
+
+    # Add the expanded data
+    if len(new_data):
+        getattr(scenario, f"add_{info.ix_type}")(name, new_data)
+
+
+#: Columns of the data frame returned by :func:`check_schema`.
+SCHEMA_COLUMNS = [
+    "item",
+    "type",
+    "status",
+    "idx_sets",
+    "idx_names",
+    "coords",
+    "dims",
+    "added",
+    "removed",
+    "N",
+]
+
+
+def check_schema(scenario: "Scenario") -> pd.DataFrame:
+    """Check the structure of all MESSAGE and MACRO items in `scenario`.
+
+    Unlike :meth:`.MESSAGE.initialize`, which checks and updates only some items, this
+    compares the index sets and names of *every* item that exists in `scenario` to the
+    :attr:`~.Item.coords` and :attr:`~.Item.dims` given by :attr:`.MESSAGE.items` and
+    :attr:`.MACRO.items`. Only structural information is retrieved, except for the
+    number of elements of non-conforming items. Thus the check is fast enough to audit
+    many stored scenarios, for instance when upgrading a platform to a new version of
+    :mod:`message_ix`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with one row per non-conforming item, empty if all items conform. The columns
+        are:
+
+        - "item", "type": the item name and its :attr:`~.Item.ix_type`.
+        - "status": either "missing" (a :attr:`.MESSAGE.items` entry that does not
+          exist in `scenario`) or "dims" (the index sets and/or names differ).
+        - "idx_sets", "idx_names": tuples of existing index sets and names.
+        - "coords", "dims": tuples of expected index sets and names.
+        - "added", "removed": tuples of dimensions in "dims" but not in "idx_names",
+          and vice versa.
+        - "N": number of elements of the item, or -1 if it is missing.
+
+    See also
+    --------
+    fix_schema
+    """
+    from ixmp.backend.jdbc import JDBCBackend
+
+    # Same as in MESSAGE.initialize()
+    skip = (
+        {"balance_equality"}
+        if isinstance(scenario.platform._backend, JDBCBackend)
+        else set()
+    )
+    rows = []
+
+    for type_ in ItemType.EQU, ItemType.PAR, ItemType.SET, ItemType.VAR:
+        # Existing items of this type
+        existing = set(scenario.list_items(type_))
+
+        for name, info in MESSAGE_MACRO.items.items():
+            if info.type != type_ or name in skip:
+                continue
+            coords, dims = info.coords, info.dims or info.coords
+            if name not in existing:
+                # Missing MACRO items are expected for scenarios without MACRO
+                if name in MESSAGE.items:
+                    rows.append(
+                        [name, info.ix_type, "missing", (), ()]
+                        + [coords, dims, dims, (), -1]
+                    )
+                continue
+
+            idx_sets = tuple(scenario.idx_sets(name))
+            idx_names = tuple(scenario.idx_names(name)) or idx_sets
+            if (idx_sets, idx_names) == (coords, dims):
+                continue
+
+            rows.append(
+                [name, info.ix_type, "dims", idx_sets, idx_names, coords, dims]
+                + [tuple(d for d in dims if d not in idx_names)]
+                + [tuple(d for d in idx_names if d not in dims)]
+                + [len(getattr(scenario, info.ix_type)(name))]
+            )
+
+    return pd.DataFrame(rows, columns=SCHEMA_COLUMNS)
+
+
+def fix_schema(
+    scenario: "Scenario", schema: pd.DataFrame | None = None, **data
+) -> pd.DataFrame:
+    """Fix the structure of non-conforming items in `scenario`.
+
+    All changes are made in a single :meth:`.transact` block. Parameters and sets in
+    `schema` are handled as follows:
+
+    - "missing": the item is initialized.
+    - "dims" with no elements: the item is removed and re-initialized.
+    - "dims" with elements: if dimensions are only added, and values for each of them
+      are given in `data`, the item is expanded as by :func:`expand_dims`. Otherwise,
+      the item is left unchanged.
+
+    Equations and variables are left unchanged; they are re-initialized when the
+    scenario is solved.
+
+    Parameters
+    ----------
+    schema : pandas.DataFrame, optional
+        Output of :func:`check_schema`. If not given, :func:`check_schema` is called.
+    data :
+        Values for added dimensions, for instance :py:`mode="production"`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Output of :func:`check_schema` after the fixes, i.e. items that could not be
+        fixed.
+
+    Raises
+    ------
+    ValueError
+        if `scenario` has a solution.
+    """
+    if scenario.has_solution():
+        raise ValueError(f"{scenario.url} has a solution; use remove_solution() first")
+
+    schema = check_schema(scenario) if schema is None else schema
+
+    def _fixable(row: dict) -> bool:
+        return row["type"] in ("par", "set") and (
+            row["N"] <= 0 or (not row["removed"] and set(row["added"]) <= set(data))
+        )
+
+    # Select parameters and sets that can be fixed
+    fixable = [row for row in schema.to_dict("records") if _fixable(row)]
+    if not fixable:
+        return schema
+
+    with scenario.transact(f"fix_schema() for {len(fixable)} item(s)"):
+        for row in fixable:
+            name = row["item"]
+            if row["N"] > 0:
+                _expand_dims(scenario, name, **{d: data[d] for d in row["added"]})
+                continue
+            elif row["N"] == 0:
+                getattr(scenario, f"remove_{row['type']}")(name)
+            MESSAGE_MACRO.initialize_items(
+                scenario, {name: MESSAGE_MACRO.items[name].to_dict()}
+            )
 
-        # Add the expanded data
-        scenario.add_par(name, new_data)
+    return check_schema(scenario)
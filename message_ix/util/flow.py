@@ -0,0 +1,358 @@
+"""Index of commodity flows through technologies."""
+
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import breadth_first_order
+
+if TYPE_CHECKING:
+    import ixmp
+
+log = logging.getLogger(__name__)
+
+#: Parameters giving flows into (input) or out of (output) technologies, and the
+#: dimension with the node of the flow.
+FLOW = {
+    "input": {
+        "input": "node_origin",
+        "input_cap": "node_origin",
+        "input_cap_new": "node_origin",
+        "input_cap_ret": "node_origin",
+    },
+    "output": {
+        "output": "node_dest",
+        "output_cap": "node_dest",
+        "output_cap_new": "node_dest",
+        "output_cap_ret": "node_dest",
+    },
+}
+
+#: Columns of :attr:`FlowGraph.edges`.
+EDGE_COLUMNS = [
+    "item",
+    "node",
+    "commodity",
+    "level",
+    "node_loc",
+    "technology",
+    "mode",
+    "direction",
+]
+
+#: Dimensions identifying flow and technology vertices.
+FLOW_DIMS = ["node", "commodity", "level"]
+TEC_DIMS = ["node_loc", "technology"]
+
+
+class FlowGraph:
+    """Directed graph of commodity flows through technologies.
+
+    The graph has two kinds of vertices: **flows**, identified by (node, commodity,
+    level), and **technologies**, identified by (node_loc, technology). An edge leads
+    from a flow to a technology that has it as input, or from a technology to a flow
+    that it outputs. Values for all periods and time slices are combined; zero values
+    are ignored, and negative values reverse the direction of an edge.
+
+    Vertices are numbered with all flows first, then all technologies. The adjacency
+    matrix is stored in compressed sparse row (CSR) form, so that queries are
+    vectorized over any number of vertices.
+
+    Parameters
+    ----------
+    edges : pandas.DataFrame
+        with columns :data:`EDGE_COLUMNS`.
+
+    See also
+    --------
+    from_scenario
+    """
+
+    #: Edges, with columns :data:`EDGE_COLUMNS`. Column "direction" is "input" for an
+    #: edge from a flow to a technology, otherwise "output".
+    edges: pd.DataFrame
+
+    #: Flow vertices: (node, commodity, level).
+    flows: pd.MultiIndex
+
+    #: Technology vertices: (node_loc, technology).
+    technologies: pd.MultiIndex
+
+    #: Adjacency matrix, with shape (:attr:`N`, :attr:`N`).
+    matrix: csr_array
+
+    def __init__(self, edges: pd.DataFrame) -> None:
+        self.edges = edges.reset_index(drop=True)
+        self.flows = pd.MultiIndex.from_frame(edges[FLOW_DIMS]).unique()
+        self.technologies = pd.MultiIndex.from_frame(edges[TEC_DIMS]).unique()
+
+        i_flow = self.flows.get_indexer(pd.MultiIndex.from_frame(edges[FLOW_DIMS]))
+        i_tec = len(self.flows) + self.technologies.get_indexer(
+            pd.MultiIndex.from_frame(edges[TEC_DIMS])
+        )
+        is_input = (edges["direction"] == "input").to_numpy()
+
+        # Source and destination vertex of each edge
+        self._src = np.where(is_input, i_flow, i_tec)
+        self._dst = np.where(is_input, i_tec, i_flow)
+
+        self.matrix = self._matrix(self._src, self._dst)
+        self._reverse = self._matrix(self._dst, self._src)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FlowGraph: {len(self.flows)} flows, {len(self.technologies)} "
+            f"technologies, {len(self.edges)} edges>"
+        )
+
+    @property
+    def N(self) -> int:
+        """Total number of vertices."""
+        return len(self.flows) + len(self.technologies)
+
+    def _matrix(self, src: np.ndarray, dst: np.ndarray) -> csr_array:
+        result = csr_array(
+            (np.ones(len(src), dtype=bool), (src, dst)), shape=(self.N, self.N)
+        )
+        result.sum_duplicates()
+        return result
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, pd.DataFrame]) -> "FlowGraph":
+        """Construct from data for any of the parameters in :data:`FLOW`.
+
+        Parameters
+        ----------
+        data :
+            Mapping from parameter names to data frames, for instance as returned by
+            :meth:`.Scenario.par`. Other keys are ignored.
+        """
+        dfs = [pd.DataFrame(columns=EDGE_COLUMNS)]
+        for direction, names in FLOW.items():
+            other = "output" if direction == "input" else "input"
+            for name, node in names.items():
+                df = data.get(name)
+                if df is None or df.empty:
+                    continue
+                df = df[df["value"] != 0]
+                dfs.append(
+                    df.rename(columns={node: "node"})
+                    .assign(
+                        item=name,
+                        mode=df["mode"] if "mode" in df.columns else "",
+                        direction=np.where(df["value"] > 0, direction, other),
+                    )[EDGE_COLUMNS]
+                    .astype(str)
+                    .drop_duplicates()
+                )
+
+        return cls(pd.concat(dfs, ignore_index=True).drop_duplicates())
+
+    @classmethod
+    def from_scenario(cls, scenario: "ixmp.Scenario") -> "FlowGraph":
+        """Construct from the data in `scenario`.
+
+        The graph is not updated when the data in `scenario` change; construct a new
+        one after each :meth:`~ixmp.TimeSeries.commit`.
+        """
+        return cls.from_data(
+            {
+                name: scenario.par(name)
+                for names in FLOW.values()
+                for name in names
+                if scenario.has_par(name)
+            }
+        )
+
+    def flow_index(
+        self, flows: pd.DataFrame | None = None, **filters: str | list[str]
+    ) -> np.ndarray:
+        """Return the indices of flow vertices.
+
+        Parameters
+        ----------
+        flows : pandas.DataFrame, optional
+            with columns "node", "commodity", and "level". Rows that are not flows in
+            the graph are ignored.
+        filters :
+            Keyword arguments "node", "commodity", and/or "level", each one value or a
+            list of values. Only used if `flows` is not given.
+        """
+        if flows is not None:
+            idx = self.flows.get_indexer(
+                pd.MultiIndex.from_frame(flows[FLOW_DIMS].astype(str))
+            )
+            return np.unique(idx[idx >= 0])
+        return np.flatnonzero(self._mask(self.flows, FLOW_DIMS, filters))
+
+    def technology_index(
+        self, technologies: pd.DataFrame | None = None, **filters: str | list[str]
+    ) -> np.ndarray:
+        """Return the indices of technology vertices.
+
+        Like :meth:`flow_index`, with columns or keyword arguments "node_loc" and
+        "technology".
+        """
+        if technologies is not None:
+            idx = self.technologies.get_indexer(
+                pd.MultiIndex.from_frame(technologies[TEC_DIMS].astype(str))
+            )
+            return len(self.flows) + np.unique(idx[idx >= 0])
+        return len(self.flows) + np.flatnonzero(
+            self._mask(self.technologies, TEC_DIMS, filters)
+        )
+
+    @staticmethod
+    def _mask(index: pd.MultiIndex, dims: list[str], filters: dict) -> np.ndarray:
+        if extra := set(filters) - set(dims):
+            raise ValueError(f"Invalid filter(s) {extra}; expected any of {dims}")
+        mask = np.ones(len(index), dtype=bool)
+        for dim, value in filters.items():
+            values = [value] if isinstance(value, str) else list(value)
+            mask &= index.get_level_values(dim).isin(values)
+        return mask
+
+    def vertices(self, index: np.ndarray) -> pd.DataFrame:
+        """Return a data frame describing the vertices with the given `index`.
+
+        The columns are "node", "commodity", and "level" (for flows), and "node_loc"
+        and "technology" (for technologies).
+        """
+        index = np.asarray(index, dtype=int)
+        is_flow = index < len(self.flows)
+        return pd.concat(
+            [
+                self.flows[index[is_flow]].to_frame(index=False),
+                self.technologies[index[~is_flow] - len(self.flows)].to_frame(
+                    index=False
+                ),
+            ],
+            ignore_index=True,
+        )
+
+    def _neighbours(self, matrix: csr_array, **filters) -> pd.DataFrame:
+        i_flow = self.flow_index(**filters)
+        coo = matrix[i_flow].tocoo()
+        return pd.concat(
+            [
+                self.flows[i_flow[coo.row]].to_frame(index=False),
+                self.technologies[coo.col - len(self.flows)].to_frame(index=False),
+            ],
+            axis=1,
+        )
+
+    def downstream(self, **filters: str | list[str]) -> pd.DataFrame:
+        """Return technologies that have the given flows as input.
+
+        Parameters
+        ----------
+        filters :
+            Keyword arguments "node", "commodity", and/or "level". For instance,
+            :py:`downstream(commodity="electricity", level="secondary")`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            with columns "node", "commodity", "level", "node_loc", and "technology":
+            one row for each matching flow and technology.
+        """
+        return self._neighbours(self.matrix, **filters)
+
+    def upstream(self, **filters: str | list[str]) -> pd.DataFrame:
+        """Return technologies that output the given flows.
+
+        Like :meth:`downstream`.
+        """
+        return self._neighbours(self._reverse, **filters)
+
+    def reachable(self, start: np.ndarray, reverse: bool = False) -> np.ndarray:
+        """Return a boolean mask of the vertices reachable from `start`.
+
+        Parameters
+        ----------
+        start : numpy.ndarray
+            Indices of vertices, for instance from :meth:`flow_index`. These are
+            included in the result.
+        reverse : bool, optional
+            If :any:`True`, follow edges in reverse, i.e. return the vertices from
+            which any of `start` can be reached.
+        """
+        # Add a vertex with edges to all of `start`, and search from this vertex
+        N = self.N
+        start = np.asarray(start, dtype=int)
+        src, dst = (self._dst, self._src) if reverse else (self._src, self._dst)
+        graph = csr_array(
+            (
+                np.ones(len(src) + len(start), dtype=bool),
+                (np.append(src, np.full(len(start), N)), np.append(dst, start)),
+            ),
+            shape=(N + 1, N + 1),
+        )
+        result = np.zeros(N + 1, dtype=bool)
+        result[breadth_first_order(graph, N, return_predecessors=False)] = True
+        return result[:N]
+
+    def paths(self, source: np.ndarray, target: np.ndarray) -> "FlowGraph":
+        """Return the subgraph of all paths from any `source` to any `target` vertex.
+
+        For instance, to find all technologies and flows that connect resources to
+        demands:
+
+        .. code-block:: python
+
+           g = FlowGraph.from_scenario(scenario)
+           sub = g.paths(
+               g.flow_index(level=list(scenario.set("level_resource"))),
+               g.flow_index(scenario.par("demand")),
+           )
+           sub.technologies
+
+        Parameters
+        ----------
+        source, target : numpy.ndarray
+            Indices of vertices.
+        """
+        mask = self.reachable(source) & self.reachable(target, reverse=True)
+        return self._subgraph(mask[self._src] & mask[self._dst])
+
+    def subgraph(self, node: str | list[str]) -> "FlowGraph":
+        """Return the subgraph of technologies at `node`, with all their flows.
+
+        The result includes flows at other nodes—for instance, imports and
+        exports—that are input or output of technologies at `node`.
+        """
+        nodes = [node] if isinstance(node, str) else list(node)
+        return self._subgraph(self.edges["node_loc"].isin(nodes).to_numpy())
+
+    def _subgraph(self, mask: np.ndarray) -> "FlowGraph":
+        return type(self)(self.edges[mask])
+
+    def sankey_mapping(self, node: str) -> dict[str, tuple[str, str]]:
+        """Return a mapping of IAMC variable names to (source, target) for `node`.
+
+        Variable names are like those of the ``in::pyam`` and ``out::pyam`` keys of
+        :class:`.Reporter`, for instance "in|secondary|electricity|grid|standard".
+        Sources and targets are "level|commodity" for flows and "technology|mode" for
+        technologies. Only edges from ``input`` and ``output`` of technologies at
+        `node` are included.
+
+        See also
+        --------
+        .map_for_sankey
+        """
+        df = self.edges[
+            self.edges["item"].isin(["input", "output"])
+            & (self.edges["node_loc"] == node)
+        ]
+        # Use the name of the parameter, not the direction, for consistency with
+        # Reporter keys
+        flow = df["level"] + "|" + df["commodity"]
+        tec = df["technology"] + "|" + df["mode"]
+        is_input = df["item"] == "input"
+        variable = np.where(is_input, "in|", "out|") + flow + "|" + tec
+        source = np.where(is_input, flow, tec)
+        target = np.where(is_input, tec, flow)
+        return dict(zip(variable, zip(source, target)))
@@ -0,0 +1,338 @@
+"""Estimate the size of the MESSAGE LP for a scenario, without GAMS."""
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from .gams_io import _compose_map_tec_time, _compose_records
+from .scenario_data import HELPER_INDEXSETS, HELPER_TABLES
+
+if TYPE_CHECKING:
+    from message_ix.core import Scenario
+
+#: Columns of the data frame returned by :func:`estimate_size`.
+COLUMNS = ["type", "name", "count", "nnz"]
+
+#: Short column names used internally.
+_RENAME = {
+    "node_loc": "n",
+    "node": "n",
+    "node_rel": "n",
+    "technology": "t",
+    "year_vtg": "yv",
+    "year_act": "y",
+    "year": "y",
+    "year_all": "y",
+    "year_rel": "y",
+    "mode": "m",
+    "time": "h",
+    "commodity": "c",
+    "level": "l",
+    "grade": "g",
+    "emission": "e",
+    "relation": "r",
+}
+
+
+#: Sets containing the targets of :class:`.HelperFilterInfo`.
+_FILTER_SET = {
+    "renewables": "level_renewable",
+    "resource": "level_resource",
+    "stocks": "level_stocks",
+}
+
+
+class _Cache:
+    """Wrap a :class:`.Scenario` so that each item is retrieved at most once.
+
+    Instances can be passed to the functions in :mod:`.gams_io` in place of the
+    scenario.
+    """
+
+    def __init__(self, scenario: "Scenario") -> None:
+        self.scenario = scenario
+        self._data: dict[tuple[str, str], pd.DataFrame] = {}
+
+    def _get(self, ix_type: str, name: str) -> pd.DataFrame:
+        key = (ix_type, name)
+        if key not in self._data:
+            self._data[key] = getattr(self.scenario, ix_type)(name)
+        return self._data[key]
+
+    def par(self, name: str) -> pd.DataFrame:
+        return self._get("par", name)
+
+    def set(self, name: str) -> pd.DataFrame:
+        return self._get("set", name)
+
+    def idx_names(self, name: str) -> list[str]:
+        return self.scenario.idx_names(name)
+
+
+def _helper(cache: _Cache, name: str) -> pd.DataFrame:
+    """Compose the auxiliary set `name`, as for GDX, with short column names."""
+    info = {i.name: i for i in HELPER_INDEXSETS + HELPER_TABLES}[name]
+    filters = info.filters
+    if filters:
+        # Same as the targets in add_auxiliary_items_to_container_data_list(), but
+        # without modifying `info`
+        elements = _elements(cache.set(_FILTER_SET[filters.target_name]))
+        filters = replace(filters, target=sorted(map(str, elements)))
+
+    if name == "map_tec_time":
+        df = _compose_map_tec_time(cache, info.sources)  # type: ignore [arg-type]
+    else:
+        df = _compose_records(
+            cache,  # type: ignore [arg-type]
+            info.sources,
+            filters,
+            getattr(info, "renames", None),
+        )
+    return _short(df)
+
+
+def _short(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename `df` to short column names, and convert years to :class:`int`."""
+    df = df.rename(columns=_RENAME)
+    return df.astype({c: int for c in ("y", "yv") if c in df.columns})
+
+
+def _elements(data: pd.DataFrame | pd.Series) -> set[str]:
+    """Elements of a 1-dimensional set."""
+    return set(data.iloc[:, 0] if isinstance(data, pd.DataFrame) else data)
+
+
+def _n(df: pd.DataFrame, other: pd.DataFrame, on: list[str]) -> int:
+    """Number of rows in the inner join of `df` and `other` on `on`."""
+    return len(df[on].merge(other[on].drop_duplicates(), on=on))
+
+
+def _lifetime(cache: _Cache, map_tec: pd.DataFrame, years: pd.Series) -> pd.DataFrame:
+    """Compose ``map_tec_lifetime`` (n, t, yv, y), as in :file:`data_load.gms`."""
+    # Cumulative duration at the start of each period, for duration_period_sum()
+    dp = _short(cache.par("duration_period")).set_index("y")["value"]
+    start = dp.reindex(sorted(years)).fillna(0).cumsum().shift(fill_value=0)
+
+    lifetime = _short(cache.par("technical_lifetime"))[["n", "t", "yv", "value"]]
+    hist = _short(cache.par("historical_new_capacity"))[["n", "t", "yv"]]
+
+    # Candidate vintages: periods in which the technology is active or with historical
+    # capacity
+    vtg = pd.concat([map_tec.rename(columns={"y": "yv"}), hist]).drop_duplicates()
+    df = vtg.merge(map_tec, on=["n", "t"]).query("yv <= y")
+    df = df.merge(lifetime, on=["n", "t", "yv"], how="left")
+    duration = df["y"].map(start) - df["yv"].map(start)
+    alive = (df["yv"] == df["y"]) | (duration < df["value"].fillna(0))
+    return df[alive][["n", "t", "yv", "y"]]
+
+
+def _tables(scenario: "Scenario") -> dict[str, pd.DataFrame]:
+    """Compose the mapping sets needed by :func:`estimate_size`."""
+    cache = _Cache(scenario)
+    years = pd.Series(scenario.set("year")).astype(int)
+    horizon = set(years[years >= scenario.firstmodelyear])
+
+    t: dict[str, pd.DataFrame] = {}
+    for name in (
+        "map_tec",
+        "map_tec_mode",
+        "map_tec_time",
+        "map_commodity",
+        "map_stocks",
+        "map_relation",
+        "inv_tec",
+    ):
+        t[name] = _helper(cache, name)
+    for info in HELPER_TABLES:
+        if info.name.startswith("is_"):
+            # Flags for new capacity are indexed by year_vtg
+            df = _helper(cache, info.name)
+            t[info.name] = df if "y" in df else df.rename(columns={"yv": "y"})
+
+    t["map_tec_lifetime"] = _lifetime(cache, t["map_tec"], years)
+    t["map_tec_act"] = t["map_tec_time"].merge(t["map_tec_mode"], on=["n", "t", "y"])
+
+    # map_resource: input at resource levels × grades of resource_volume
+    resource = _elements(cache.set("level_resource"))
+    inp = _short(cache.par("input"))
+    t["map_resource"] = (
+        inp[inp["l"].isin(resource)][["n", "c", "y"]]
+        .drop_duplicates()
+        .merge(_short(cache.par("resource_volume"))[["n", "c", "g"]], on=["n", "c"])
+    )
+
+    # Other parameters
+    for name in (
+        "input",
+        "output",
+        "var_cost",
+        "fix_cost",
+        "inv_cost",
+        "emission_factor",
+    ):
+        t[name] = _short(cache.par(name))
+    t["relation_activity"] = _short(
+        cache.par("relation_activity").rename(
+            columns={"node_rel": "nr", "year_rel": "yr"}
+        )
+    )
+
+    # Categories of technologies, including the default "all"
+    cat_tec = _short(cache.set("cat_tec"))
+    technologies = pd.Series(cache.set("technology"), name="t")
+    t["cat_tec"] = pd.concat(
+        [cat_tec, technologies.to_frame().assign(type_tec="all")]
+    ).drop_duplicates()
+
+    t["nodes"] = pd.DataFrame({"n": sorted(_elements(cache.set("node")))})
+    t["level_other"] = pd.DataFrame(
+        {
+            "l": sorted(
+                _elements(cache.set("level"))
+                - resource
+                - _elements(cache.set("level_renewable"))
+            )
+        }
+    )
+    t["balance_equality"] = _short(cache.set("balance_equality"))
+
+    # Restrict to the model horizon
+    for name, df in t.items():
+        if "y" in df.columns:
+            t[name] = df[df["y"].isin(horizon)]
+    t["horizon"] = pd.DataFrame({"y": sorted(horizon)})
+
+    return t
+
+
+def _sizes(t: dict[str, pd.DataFrame]) -> list[tuple[str, str, int, float]]:
+    """Return (type, name, count, nnz) for the main variables and equations."""
+    NA = float("nan")
+    nty, ntyh = ["n", "t", "y"], ["n", "t", "y", "h"]
+    vtg = ["n", "t", "yv", "y", "m", "h"]
+
+    # Variables, i.e. columns
+    act = t["map_tec_act"].merge(t["map_tec_lifetime"], on=nty)
+    inv = t["inv_tec"][["t"]].drop_duplicates()
+    cap = t["map_tec_lifetime"].merge(inv, on="t")
+    cap_new = t["map_tec"].merge(inv, on="t")
+    balance = t["map_commodity"].merge(t["level_other"], on="l")
+    resource = t["map_resource"]
+    ef = t["emission_factor"].merge(t["cat_tec"], on="t")
+    emiss = ef[["n", "e", "type_tec", "y"]].drop_duplicates()
+    nodal = t["nodes"].merge(t["horizon"], how="cross")
+
+    result: list[tuple[str, str, int, float]] = [
+        ("var", "ACT", len(act), NA),
+        ("var", "CAP_NEW", len(cap_new), NA),
+        ("var", "CAP", len(cap), NA),
+        ("var", "EXT", len(resource), NA),
+        ("var", "COMMODITY_BALANCE", len(balance), NA),
+        ("var", "STOCK", len(t["map_stocks"]), NA),
+        ("var", "EMISS", len(emiss), NA),
+        ("var", "REL", len(t["map_relation"]), NA),
+        ("var", "COST_NODAL", len(nodal), NA),
+    ]
+
+    def equ(name: str, count: int, nnz: int) -> None:
+        result.append(("equ", name, count, nnz))
+
+    # Equations, i.e. rows, and their non-zero coefficients
+    equ("OBJECTIVE", 1, len(nodal))
+    equ(
+        "COST_ACCOUNTING_NODAL",
+        len(nodal),
+        len(nodal)
+        + _n(t["var_cost"], act, vtg)
+        + _n(t["inv_cost"].rename(columns={"yv": "y"}), cap_new, nty)
+        + _n(t["fix_cost"], cap, ["n", "t", "yv", "y"]),
+    )
+    equ(
+        "EXTRACTION_EQUIVALENCE",
+        len(resource[["n", "c", "y"]].drop_duplicates()),
+        len(resource) + _n(t["input"].merge(resource[["c", "y"]]), act, vtg),
+    )
+    equ("RESOURCE_CONSTRAINT", len(resource), 2 * len(resource))
+    equ(
+        "COMMODITY_BALANCE_AUX",
+        len(balance),
+        len(balance) + _n(t["input"], act, vtg) + _n(t["output"], act, vtg),
+    )
+    n_lt = _n(balance, t["balance_equality"], ["c", "l"])
+    equ("COMMODITY_BALANCE_GT", len(balance) - n_lt, len(balance) - n_lt)
+    equ("COMMODITY_BALANCE_LT", n_lt, n_lt)
+    equ("STOCKS_BALANCE", len(t["map_stocks"]), 2 * len(t["map_stocks"]))
+
+    n = _n(cap, t["map_tec_time"], nty)
+    equ("CAPACITY_CONSTRAINT", n, n + len(act.merge(inv, on="t")))
+    equ("CAPACITY_MAINTENANCE", len(cap), 2 * len(cap))
+    equ("ACTIVITY_BOUND_LO", len(t["map_tec_act"]), len(act))
+
+    bound = t["is_bound_activity_up"].query("m != 'all'")
+    equ(
+        "ACTIVITY_BOUND_UP",
+        _n(bound, t["map_tec_act"], ntyh + ["m"]),
+        _n(act, bound, ntyh + ["m"]),
+    )
+
+    for d in ("UP", "LO"):
+        flag = t[f"is_bound_new_capacity_{d.lower()}"]
+        equ(f"NEW_CAPACITY_BOUND_{d}", len(flag), len(flag))
+
+        flag = t[f"is_bound_total_capacity_{d.lower()}"]
+        equ(f"TOTAL_CAPACITY_BOUND_{d}", len(flag), _n(cap, flag, nty))
+
+        flag = t[f"is_dynamic_new_capacity_{d.lower()}"]
+        equ(f"NEW_CAPACITY_CONSTRAINT_{d}", len(flag), 2 * len(flag))
+
+        # Activity in the current and previous periods
+        flag = t[f"is_dynamic_activity_{d.lower()}"]
+        equ(
+            f"ACTIVITY_CONSTRAINT_{d}",
+            _n(flag, t["map_tec_time"], ntyh),
+            2 * _n(act, flag, ntyh),
+        )
+
+    equ("EMISSION_EQUIVALENCE", len(emiss), len(emiss) + _n(ef, act, vtg[:-1]))
+    equ("EMISSION_CONSTRAINT", len(t["is_bound_emission"]), len(t["is_bound_emission"]))
+
+    rel = t["map_relation"]
+    equ(
+        "RELATION_EQUIVALENCE",
+        len(rel),
+        len(rel) + _n(t["relation_activity"], act, ["n", "t", "y", "m"]),
+    )
+    for d, name in (("UP", "upper"), ("LO", "lower")):
+        flag = t[f"is_relation_{name}"]
+        equ(f"RELATION_CONSTRAINT_{d}", len(flag), len(flag))
+
+    return result
+
+
+def estimate_size(scenario: "Scenario") -> pd.DataFrame:
+    """Estimate the size of the MESSAGE LP for `scenario`, without GAMS.
+
+    The mapping sets that :mod:`.gams_io` writes to GDX, and those that
+    :file:`data_load.gms` derives from them (for instance ``map_tec_act`` and
+    ``map_tec_lifetime``), are composed from the scenario data. The numbers of
+    variables, constraints, and non-zero coefficients are then estimated by joining
+    these sets, following the conditions in :file:`model_core.gms`.
+
+    Only the variable and equation families that usually dominate the size of the LP
+    are included; for instance, storage, land-use, and share constraints are not. The
+    estimates are approximate: GAMS omits rows and columns that are empty for other
+    reasons, and some non-zeros (for instance, of slack variables) are not counted.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with one row per family and columns:
+
+        - "type": "var" or "equ".
+        - "name": name of the variable or equation family.
+        - "count": estimated number of variables or equations.
+        - "nnz": estimated number of non-zero coefficients of the equations; NaN for
+          variables.
+    """
+    return pd.DataFrame(_sizes(_tables(scenario)), columns=COLUMNS)
@@ -0,0 +1,356 @@
+"""Pre-solve validation of MESSAGE scenario data.
+
+:func:`validate` runs a library of checks on the data in a :class:`.Scenario`. Each
+check operates on entire parameters or sets at once, rather than on individual
+elements, so that validation of large scenarios takes seconds, instead of the minutes
+needed to load data into GAMS before the same problems become apparent.
+"""
+
+import logging
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import pandas as pd
+from ixmp.backend import ItemType
+
+if TYPE_CHECKING:
+    import ixmp
+
+    from message_ix.common import Item
+    from message_ix.util.flow import FlowGraph
+
+log = logging.getLogger(__name__)
+
+#: Severity of an :class:`Issue`.
+Severity = Literal["error", "warning"]
+
+#: Order of severities, from least to most severe.
+SEVERITY: tuple[Severity, ...] = ("warning", "error")
+
+
+@dataclass
+class Issue:
+    """A problem found in scenario data by one check."""
+
+    #: Name of the check.
+    check: str
+
+    #: :py:`"error"` if the scenario cannot be solved or gives incorrect results;
+    #: :py:`"warning"` if the data are likely, but not certainly, incorrect.
+    severity: Severity
+
+    #: Name of the affected item.
+    item: str
+
+    #: Description of the problem.
+    message: str
+
+    #: Elements of :attr:`item` that are affected.
+    data: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+    def __str__(self) -> str:
+        return f"{self.severity}: [{self.check}] {self.item}: {self.message}"
+
+
+@dataclass
+class ValidationReport:
+    """Result of :func:`validate`."""
+
+    #: All issues found.
+    issues: list[Issue] = field(default_factory=list)
+
+    #: Names of the checks that were run.
+    checks: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """:any:`True` if there are no issues with severity :py:`"error"`."""
+        return not any(i.severity == "error" for i in self.issues)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return a summary of :attr:`issues`, with one row per issue.
+
+        The columns are "check", "severity", "item", "count" (the number of affected
+        elements), and "message".
+        """
+        return pd.DataFrame(
+            [
+                [i.check, i.severity, i.item, len(i.data), i.message]
+                for i in self.issues
+            ],
+            columns=["check", "severity", "item", "count", "message"],
+        )
+
+    def __str__(self) -> str:
+        lines = [
+            f"{len(self.issues)} issue(s) found by {len(self.checks)} check(s)"
+        ] + [f"- {i}" for i in self.issues]
+        return "\n".join(lines)
+
+
+class _Data:
+    """Cache of scenario data, so that each item is retrieved at most once."""
+
+    def __init__(self, scenario: "ixmp.Scenario", items: dict[str, "Item"]) -> None:
+        self.scenario = scenario
+        self.items = items
+        self._cache: dict[str, pd.DataFrame] = {}
+        self._graph: "FlowGraph | None" = None
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        """Return the data of `name` as a data frame; empty if `name` does not exist."""
+        if name not in self._cache:
+            # Items not in `items` are treated as index sets
+            info = self.items.get(name)
+            ix_type = info.ix_type if info else "set"
+            dims = list((info.dims or info.coords) if info else ()) or [name]
+            if getattr(self.scenario, f"has_{ix_type}")(name):
+                data = getattr(self.scenario, ix_type)(name)
+            else:
+                data = pd.DataFrame(columns=dims)
+            if isinstance(data, pd.Series):
+                data = data.to_frame(name=dims[0])
+            self._cache[name] = data
+        return self._cache[name]
+
+    @property
+    def graph(self) -> "FlowGraph":
+        """:class:`.FlowGraph` of the data."""
+        from message_ix.util.flow import FLOW, FlowGraph
+
+        if self._graph is None:
+            self._graph = FlowGraph.from_data(
+                {name: self[name] for names in FLOW.values() for name in names}
+            )
+        return self._graph
+
+    def elements(self, name: str) -> pd.Index:
+        """Return the elements of index set `name` as :class:`str`."""
+        return pd.Index(self[name].iloc[:, 0].astype(str).unique())
+
+
+#: Registry of checks: name → (severity, function).
+CHECKS: dict[str, tuple[Severity, Callable[[_Data], Iterator[Issue]]]] = {}
+
+
+def _check(severity: Severity):
+    """Decorator to register a check in :data:`CHECKS`."""
+
+    def decorator(func):
+        name = func.__name__.lstrip("_")
+        CHECKS[name] = (severity, func)
+        return func
+
+    return decorator
+
+
+def _summary(values: pd.Series, n: int = 5) -> str:
+    """Return a short :class:`str` listing up to `n` distinct `values`."""
+    unique = sorted(values.astype(str).unique())
+    return ", ".join(map(repr, unique[:n])) + (", …" if len(unique) > n else "")
+
+
+def _isin(df: pd.DataFrame, other: pd.DataFrame, on: list[str]) -> np.ndarray:
+    """Mask of rows of `df` for which the values in columns `on` appear in `other`."""
+    key = pd.MultiIndex.from_frame(df[on].astype(str))
+    return key.isin(pd.MultiIndex.from_frame(other[on].astype(str)))
+
+
+@_check("error")
+def _dangling_reference(data: _Data) -> Iterator[Issue]:
+    """Elements of parameters or sets that are not members of the index sets."""
+    elements: dict[str, pd.Index] = {}
+
+    for name, info in data.items.items():
+        if not (info.type & (ItemType.PAR | ItemType.SET)) or info.coords in (
+            (),
+            (name,),
+        ):
+            continue
+
+        df = data[name]
+        if df.empty:
+            continue
+
+        for coord, dim in zip(info.coords, info.dims or info.coords):
+            if coord not in elements:
+                elements[coord] = data.elements(coord)
+            missing = df[~df[dim].astype(str).isin(elements[coord])]
+            if len(missing):
+                yield Issue(
+                    "dangling_reference",
+                    "error",
+                    name,
+                    f"{len(missing)} element(s) with {dim} not in set {coord!r}: "
+                    + _summary(missing[dim]),
+                    missing,
+                )
+
+
+@_check("warning")
+def _year_order(data: _Data) -> Iterator[Issue]:
+    """Elements of parameters with a year of activity before the year of vintage."""
+    for name, info in data.items.items():
+        if info.type != ItemType.PAR or not {"year_vtg", "year_act"} <= set(info.dims):
+            continue
+
+        df = data[name]
+        if df.empty:
+            continue
+
+        invalid = df[df["year_act"].astype(int) < df["year_vtg"].astype(int)]
+        if len(invalid):
+            yield Issue(
+                "year_order",
+                "warning",
+                name,
+                f"{len(invalid)} element(s) with year_act < year_vtg are ignored",
+                invalid,
+            )
+
+
+@_check("warning")
+def _horizon(data: _Data) -> Iterator[Issue]:
+    """Elements of ``historical_*`` parameters for periods in the model horizon.
+
+    These parameters only apply to periods before the first model year; values for the
+    first model year or later are ignored. Years that are not in the set ``year`` at
+    all are reported by the ``dangling_reference`` check.
+    """
+    cat_year = data["cat_year"]
+    first = cat_year.loc[cat_year["type_year"].astype(str) == "firstmodelyear", "year"]
+    if first.empty:
+        return
+    fmy = int(first.iloc[0])
+
+    for name, info in data.items.items():
+        if info.type != ItemType.PAR or not name.startswith("historical_"):
+            continue
+        dims = [d for d in (info.dims or info.coords) if d.startswith("year")]
+        df = data[name]
+        if not dims or df.empty:
+            continue
+
+        invalid = df[df[dims[0]].astype(int) >= fmy]
+        if len(invalid):
+            yield Issue(
+                "horizon",
+                "warning",
+                name,
+                f"{len(invalid)} element(s) with {dims[0]} ≥ first model year {fmy} "
+                "are ignored",
+                invalid,
+            )
+
+
+@_check("warning")
+def _technical_lifetime(data: _Data) -> Iterator[Issue]:
+    """Technologies with input or output and investment costs, but no lifetime.
+
+    Technologies without ``technical_lifetime`` have no capacity in MESSAGE. This is
+    intended for technologies without ``inv_cost``, but likely an error otherwise.
+    """
+    on = ["node_loc", "technology", "year_vtg"]
+    inv_cost = data["inv_cost"]
+    lifetime = data["technical_lifetime"]
+    if inv_cost.empty:
+        return
+
+    for name in ("input", "output"):
+        df = data[name]
+        if df.empty:
+            continue
+
+        keys = df[on].drop_duplicates()
+        keys = keys[_isin(keys, inv_cost, on[:2])]
+        missing = keys[~_isin(keys, lifetime, on)]
+        if len(missing):
+            yield Issue(
+                "technical_lifetime",
+                "warning",
+                name,
+                f"{len(missing)} (node_loc, technology, year_vtg) with inv_cost but no "
+                f"technical_lifetime: {_summary(missing['technology'])}",
+                missing,
+            )
+
+
+@_check("error")
+def _resource_volume(data: _Data) -> Iterator[Issue]:
+    """Input of resource commodities with no resource volume for any grade."""
+    df = data["input"]
+    levels = data.elements("level_resource")
+    if df.empty or not len(levels):
+        return
+
+    on = ["node_loc", "commodity"]
+    volume = data["resource_volume"].rename(columns={"node": "node_loc"})
+    keys = df.loc[df["level"].astype(str).isin(levels), on].drop_duplicates()
+    missing = keys[~_isin(keys, volume, on)]
+    if len(missing):
+        yield Issue(
+            "resource_volume",
+            "error",
+            "input",
+            f"{len(missing)} (node_loc, commodity) of resource level(s) without "
+            f"resource_volume for any grade: {_summary(missing['commodity'])}",
+            missing,
+        )
+
+
+@_check("warning")
+def _unreachable(data: _Data) -> Iterator[Issue]:
+    """Technologies that cannot be supplied, or from which no demand can be reached.
+
+    See :func:`.find_unreachable`.
+    """
+    from message_ix.tools.prune import find_unreachable
+
+    df = find_unreachable(data.scenario, graph=data.graph)
+    for reason, group in df.groupby("reason"):
+        yield Issue(
+            "unreachable",
+            "warning",
+            "technology",
+            f"{len(group)} (node_loc, technology) with {reason}: "
+            + _summary(group["technology"]),
+            group.reset_index(drop=True),
+        )
+
+
+def validate(
+    scenario: "ixmp.Scenario", level: Severity = "warning"
+) -> ValidationReport:
+    """Validate the data in `scenario` prior to solving.
+
+    Parameters
+    ----------
+    scenario : .Scenario
+        Scenario to validate.
+    level : str, optional
+        Minimum severity of checks to run: :py:`"warning"` (the default) to run all
+        checks; :py:`"error"` to run only those that find errors.
+
+    Returns
+    -------
+    ValidationReport
+    """
+    from message_ix.message_macro import MESSAGE_MACRO
+
+    if level not in SEVERITY:
+        raise ValueError(f"level={level!r}; expected one of {SEVERITY}")
+
+    data = _Data(scenario, dict(MESSAGE_MACRO.items))
+    result = ValidationReport()
+    for name, (severity, func) in CHECKS.items():
+        if SEVERITY.index(severity) < SEVERITY.index(level):
+            continue
+        result.checks.append(name)
+        result.issues.extend(func(data))
+
+    for issue in result.issues:
+        log.debug(str(issue))
+
+    return result